@@ -0,0 +1,35 @@
+# --8<-- [start:example]
+from detectmatelibrary.parsers.drain import DrainParser
+from detectmatelibrary import schemas
+
+
+cfg = {
+    "parsers": {
+        "DrainParser": {
+            "method_type": "drain_parser",
+            "params": {
+                "depth": 4,
+                "similarity_threshold": 0.4,
+            }
+        }
+    }
+}
+
+parser = DrainParser(name="DrainParser", config=cfg)
+
+logs = [
+    "session opened for user root by uid 0",
+    "session opened for user alice by uid 1000",
+]
+for i, log in enumerate(logs):
+    parsed = parser.process(schemas.LogSchema({"logID": str(i), "log": log}))
+
+print(parsed.EventID)    # 0, both logs are in the same cluster
+print(parsed.template)   # session opened for user <*> by uid <*>
+print(parsed.variables)  # ['alice', '1000']
+
+# the learned templates keep their EventIDs after a restart
+state = parser.export_state()
+restored = DrainParser(name="DrainParser", config=cfg)
+restored.import_state(state)
+# --8<-- [end:example]
@@ -11,6 +11,7 @@ class DummyParserConfig(CoreParserConfig):
 
 class DummyParser(CoreParser):
     """A dummy parser for testing purposes."""
+    stateless = True
 
     def __init__(
         self,
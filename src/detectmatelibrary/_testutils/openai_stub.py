@@ -0,0 +1,101 @@
+"""Local stand-in for the chat completions endpoint of an OpenAI compatible
+API, to run the LLM parsers in tests and benchmarks without network."""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+import threading
+import json
+import time
+import re
+
+
+_LOG_RE = re.compile(r"^Log\[\d+\]: `(.*)`$", re.MULTILINE)
+_VARIABLE_RE = re.compile(r"\S*\d\S*")
+
+
+def stub_template(log: str) -> str:
+    """The answer of the stand-in: the log with every token holding a digit
+    as a variable."""
+    return _VARIABLE_RE.sub("{{variable}}", log)
+
+
+class OpenAIStub:
+    """Serve chat completions on a free local port, answering with the
+    template of the first log of the prompt after ``latency`` seconds.
+
+    Usage:
+        with OpenAIStub() as stub:
+            config = LogBatcherParserConfig(api_key="stub", base_url=stub.base_url)
+    """
+    def __init__(self, latency: float = 0.) -> None:
+        self.latency = latency
+        self.prompts: list[list[str]] = []
+        self.in_flight = self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    @property
+    def requests(self) -> int:
+        return len(self.prompts)
+
+    def start(self) -> "OpenAIStub":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self) -> "OpenAIStub":
+        return self.start()
+
+    def __exit__(self, *_: Any) -> None:
+        self.stop()
+
+    def _answer(self, body: dict[str, Any]) -> dict[str, Any]:
+        logs = _LOG_RE.findall(body["messages"][-1]["content"])
+        with self._lock:
+            self.prompts.append(logs)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.latency)
+        with self._lock:
+            self.in_flight -= 1
+        return {
+            "id": f"chatcmpl-{len(self.prompts)}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", ""),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": f"`{stub_template(logs[0] if logs else '')}`"},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                data = json.dumps(stub._answer(body)).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *_: Any) -> None:
+                pass
+
+        return Handler
@@ -53,6 +53,9 @@ class State:
             return True
         return False
 
+    def is_pending(self) -> bool:
+        return (self.ready_to_finish or self.data_used > 0) and not self.finished
+
 
 # Overall state of the core component ##################################################
 
@@ -104,6 +107,14 @@ class FitLogic:
     def finish_training(self) -> bool:
         return self.train_state.is_finish()
 
+    def is_settled(self) -> bool:
+        """Check if every following run returns NOTHING without finishing
+        the configuration or the training."""
+        return not (
+            self.config_state.keep_doing() or self.config_state.is_pending()
+            or self.train_state.keep_doing() or self.train_state.is_pending()
+        )
+
     def __check_state(self) -> FitLogicState:
         if self.config_state.keep_doing():
             self.config_state.data_used += 1
@@ -1,20 +1,95 @@
-from detectmatelibrary.schemas import BaseSchema
+from detectmatelibrary.schemas import BaseSchema, FieldNotFound
+import detectmatelibrary.schemas._op as op
 
+from typing import Any, Literal, Tuple
+from types import MappingProxyType
 
-from typing import Tuple
+
+CopyInputL = Literal["always", "on_write"]
+
+
+class CopyOnWriteSchema:
+    """Read-only view of an input schema that copies it on the first write.
+
+    Until the first assignment, repeated and map fields are returned as a
+    tuple and a read-only mapping, so they can not be changed in place.
+    """
+    __slots__ = ("_schema", "_copied")
+    _schema: BaseSchema
+    _copied: bool
+
+    def __init__(self, schema: BaseSchema) -> None:
+        object.__setattr__(self, "_schema", schema)
+        object.__setattr__(self, "_copied", False)
+
+    def _writable(self) -> BaseSchema:
+        if not self._copied:
+            object.__setattr__(self, "_schema", self._schema.copy())
+            object.__setattr__(self, "_copied", True)
+        return self._schema
+
+    def _read(self, idx: str) -> Any:
+        value = self._schema[idx]
+        if self._copied or not self._schema.is_field_list(idx):
+            return value
+        if op.is_map(self._schema.schema_class, idx):
+            return MappingProxyType(value)
+        return tuple(value)
+
+    def __getattr__(self, name: str) -> Any:
+        if name in self._schema:
+            return self._read(name)
+        return getattr(self._schema, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._writable(), name, value)
+
+    def __getitem__(self, idx: str) -> Any:
+        if idx not in self._schema:
+            raise FieldNotFound(idx, self._schema.var_names)
+        return self._read(idx)
+
+    def __setitem__(self, idx: str, value: Any) -> None:
+        self._writable()[idx] = value
+
+    def __contains__(self, idx: str) -> bool:
+        return idx in self._schema
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CopyOnWriteSchema):
+            other = other._schema
+        return bool(self._schema == other)
+
+    def __str__(self) -> str:
+        return str(self._schema)
+
+
+def unwrap(data: BaseSchema | CopyOnWriteSchema) -> BaseSchema:
+    """The schema behind a CopyOnWriteSchema, only for reads that copy the
+    values out (e.g. into an Arrow table)."""
+    return data._schema if isinstance(data, CopyOnWriteSchema) else data
 
 
 class SchemaPipeline:
     @staticmethod
     def preprocess(
-        input_: BaseSchema, data: BaseSchema | bytes
+        input_schema: type[BaseSchema],
+        data: BaseSchema | bytes,
+        copy_input: CopyInputL = "always",
     ) -> Tuple[bool, BaseSchema]:
+        """Return a private version of the data for the component.
 
+        Deserialized bytes already are private, schemas are copied or, with
+        copy_input "on_write", wrapped in a CopyOnWriteSchema.
+        """
         is_byte = False
         if isinstance(data, bytes):
             is_byte = True
+            input_ = input_schema()
             input_.deserialize(data)
-            data = input_.copy()
+            data = input_
+        elif copy_input == "on_write":
+            data = CopyOnWriteSchema(data)  # type: ignore
         else:
             data = data.copy()
 
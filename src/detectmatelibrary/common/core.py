@@ -1,5 +1,5 @@
 from detectmatelibrary.common._core_op._fit_logic import FitLogicState, StatesL
-from detectmatelibrary.common._core_op._schema_pipeline import SchemaPipeline
+from detectmatelibrary.common._core_op._schema_pipeline import SchemaPipeline, CopyInputL
 from detectmatelibrary.common._core_op._fit_logic import FitLogic
 
 from detectmatelibrary.utils.data_buffer import DataBuffer, ArgsBuffer, BufferMode
@@ -13,6 +13,7 @@ from detectmatelibrary.tools.logging import logger, setup_logging
 
 
 from typing import Any, Dict, List
+import logging
 
 from detectmatelibrary.utils.persistency.component_interfaces import PersistencyOp
 from detectmatelibrary.utils.persistency.component_interfaces import Stoppable
@@ -50,6 +51,7 @@ class CoreConfig(BasicConfig):
     data_use_training: int | None = None
     data_use_configure: int | None = None
     use_config_data_as_training: bool = True
+    copy_input: CopyInputL = "always"
 
 
 class Component:
@@ -71,6 +73,11 @@ class Component:
     ) -> bool:
         return False
 
+    def run_batch(
+        self, input_: List[List[BaseSchema] | BaseSchema], output_: List[BaseSchema]
+    ) -> List[bool]:
+        return [self.run(input_=i, output_=o) for i, o in zip(input_, output_)]
+
     def train(
         self, input_: List[BaseSchema] | BaseSchema,
     ) -> None:
@@ -148,31 +155,49 @@ class CoreComponent(Component):
     def get_window_size(self) -> int:
         return self.data_buffer.get_window_size()
 
-    def process(self, data: BaseSchema | bytes) -> BaseSchema | bytes | None:
-        is_byte, data = SchemaPipeline.preprocess(self.input_schema(), data)
-        logger.debug(f"<<{self.name}>> received:\n{data}")
-
-        if (data_buffered := self.data_buffer.add(data)) is None:  # type: ignore
-            return None
-
+    def _fit(self, data_buffered: List[BaseSchema] | BaseSchema) -> FitLogicState:
         if (fit_state := self.fitlogic.run()) == FitLogicState.DO_CONFIG:
             logger.debug(f"<<{self.name}>> use data for configuration")
             self.configure(input_=data_buffered)
             if self.config.use_config_data_as_training:
-                self.buffer_train + data_buffered
-            return None
+                self.buffer_train += data_buffered
+            return fit_state
         elif self.fitlogic.finish_config():
             logger.debug(f"<<{self.name}>> finalizing configuration")
             self.set_configuration()
             if self.config.use_config_data_as_training:
                 logger.debug(f"<<{self.name}>> Adding data from config to training")
-                [self.train(input_) for input_ in self.buffer_train]
+                for input_ in self.buffer_train:
+                    self.train(input_=input_)
         if fit_state == FitLogicState.DO_TRAIN:
             logger.debug(f"<<{self.name}>> use data for training")
             self.train(input_=data_buffered)
         elif self.fitlogic.finish_training():
             logger.debug(f"<<{self.name}>> finalizing training")
             self.post_train()
+        return fit_state
+
+    def _copy_input(self) -> CopyInputL:
+        """Inputs kept after process, in a batch or window buffer or as
+        configuration data, are always copied."""
+        if self.config.copy_input == "on_write" and (
+            self.data_buffer.mode != BufferMode.NO_BUF or self.fitlogic.config_state.keep_doing()
+        ):
+            return "always"
+        return self.config.copy_input
+
+    def process(self, data: BaseSchema | bytes) -> BaseSchema | bytes | None:
+        is_byte, data = SchemaPipeline.preprocess(
+            self.input_schema, data, copy_input=self._copy_input()
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"<<{self.name}>> received:\n{data}")
+
+        if (data_buffered := self.data_buffer.add(data)) is None:  # type: ignore
+            return None
+
+        if self._fit(data_buffered) == FitLogicState.DO_CONFIG:
+            return None
 
         output_ = self.output_schema()
         logger.debug(f"<<{self.name}>> processing data")
@@ -181,5 +206,55 @@ class CoreComponent(Component):
             logger.debug(f"<<{self.name}>> returns None")
             return None
 
-        logger.debug(f"<<{self.name}>> processed:\n{output_}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"<<{self.name}>> processed:\n{output_}")
         return SchemaPipeline.postprocess(output_, is_byte=is_byte)
+
+    def _run_pending(
+        self,
+        pending: List[List[BaseSchema] | BaseSchema],
+        is_byte: bool,
+        results: List[BaseSchema | bytes],
+    ) -> None:
+        if not pending:
+            return
+
+        outputs = [self.output_schema() for _ in pending]
+        logger.debug(f"<<{self.name}>> processing batch of {len(pending)}")
+        for output_, return_schema in zip(outputs, self.run_batch(input_=pending, output_=outputs)):
+            if return_schema:
+                results.append(SchemaPipeline.postprocess(output_, is_byte=is_byte))
+        pending.clear()
+
+    def process_batch(
+        self, data: List[BaseSchema] | List[bytes]
+    ) -> List[BaseSchema | bytes]:
+        """Process a batch of records and return the outputs that are not
+        None, in input order.
+
+        Equivalent to calling process on every record. Consecutive records
+        in the detection phase are handed over together to run_batch, the
+        batch is split wherever configuration or training takes place.
+        """
+        logger.debug(f"<<{self.name}>> received batch of {len(data)}")
+        results: List[BaseSchema | bytes] = []
+        pending: List[List[BaseSchema] | BaseSchema] = []
+        is_byte = False
+
+        for record in data:
+            is_byte, record = SchemaPipeline.preprocess(
+                self.input_schema, record, copy_input=self._copy_input()
+            )
+            if (data_buffered := self.data_buffer.add(record)) is None:  # type: ignore
+                continue
+
+            if self.fitlogic.is_settled():
+                pending.append(data_buffered)
+                continue
+
+            self._run_pending(pending, is_byte=is_byte, results=results)
+            if self._fit(data_buffered) != FitLogicState.DO_CONFIG:
+                pending.append(data_buffered)
+
+        self._run_pending(pending, is_byte=is_byte, results=results)
+        return results
@@ -1,12 +1,13 @@
 from detectmatelibrary.common._config._formats import EventsConfig, _EventInstance
 from detectmatelibrary.common.core import CoreComponent, CoreConfig
+from detectmatelibrary.common._core_op._schema_pipeline import CopyInputL, unwrap
 
 from detectmatelibrary.utils.data_buffer import ArgsBuffer, BufferMode
 from detectmatelibrary.utils.aux import get_timestamp
 from detectmatelibrary.utils import persistency
 from detectmatelibrary.common.persist import init_persistency
 
-from detectmatelibrary.schemas import ParserSchema, DetectorSchema
+from detectmatelibrary.schemas import ParserSchema, DetectorSchema, to_table, from_table
 
 from typing_extensions import override
 from typing import Dict, List, Optional, Any, cast
@@ -14,16 +15,25 @@ from typing import Dict, List, Optional, Any, cast
 from detectmatelibrary.utils.persistency.component_interfaces import PersistConfig
 from detectmatelibrary.utils.time_format_handler import TimeFormatHandler
 
+import pyarrow as pa
+
 
 _time_handler = TimeFormatHandler()
 
 
+def _epoch(time: str) -> int:
+    # parsers with a time_format already wrote the unix seconds
+    if time.isdecimal() and time.isascii() and len(time) <= 11:
+        return int(time)
+    return _time_handler.parse_seconds(time)
+
+
 def _extract_timestamp(
     input_: List[ParserSchema] | ParserSchema
 ) -> List[int]:
     if not isinstance(input_, list):
         input_ = [input_]
-    return [int(_time_handler.parse_timestamp(i["logFormatVariables"]["Time"])) for i in input_]
+    return [_epoch(i["logFormatVariables"]["Time"]) for i in input_]
 
 
 def _extract_logIDs(
@@ -39,6 +49,7 @@ class CoreDetectorConfig(CoreConfig):
     component_type: str = "detectors"
     method_type: str = "core_detector"
     parser: str = "<PLACEHOLDER>"
+    copy_input: CopyInputL = "on_write"
 
     auto_config: bool = True
     events: EventsConfig | dict[str, Any] = {}
@@ -47,6 +58,11 @@ class CoreDetectorConfig(CoreConfig):
 
 
 class CoreDetector(CoreComponent):
+    # Run batches in the detection phase through detect_batch
+    batch_detection: bool = False
+    # Fields of the parsed logs in the detect_batch table, None for all
+    batch_columns: Optional[List[str]] = None
+
     def __init__(
         self,
         name: str = "CoreDetector",
@@ -71,23 +87,53 @@ class CoreDetector(CoreComponent):
             self.name, cast(CoreDetectorConfig, self.config), event_persistency
         )
 
-    @override
-    def run(
-        self, input_: List[ParserSchema] | ParserSchema, output_: DetectorSchema  # type: ignore
-    ) -> bool:
-
+    def _init_output(self, output_: DetectorSchema) -> None:
         output_["detectorID"] = self.name
         output_["detectorType"] = self.config.method_type
+        output_["receivedTimestamp"] = get_timestamp()
+
+    def _set_alert(self, input_: List[ParserSchema] | ParserSchema, output_: DetectorSchema) -> None:
+        """Fill the fields of an alert. The outputs of records without an
+        alert are dropped, so their log IDs and timestamps are never
+        extracted."""
         output_["logIDs"] = _extract_logIDs(input_)
         output_["extractedTimestamps"] = _extract_timestamp(input_)
-        output_["receivedTimestamp"] = get_timestamp()
+        output_["alertID"] = str(self.id_generator())
+        output_["detectionTimestamp"] = get_timestamp()
 
+    @override
+    def run(
+        self, input_: List[ParserSchema] | ParserSchema, output_: DetectorSchema  # type: ignore
+    ) -> bool:
+
+        self._init_output(output_)
         if (anomaly_detected := self.detect(input_=input_, output_=output_)):
-            output_["alertID"] = str(self.id_generator())
-            output_["detectionTimestamp"] = get_timestamp()
+            self._set_alert(input_, output_)
 
         return anomaly_detected
 
+    @override
+    def run_batch(
+        self,
+        input_: List[List[ParserSchema] | ParserSchema],  # type: ignore
+        output_: List[DetectorSchema],  # type: ignore
+    ) -> List[bool]:
+
+        if not self.batch_detection or any(isinstance(i, list) for i in input_):
+            return super().run_batch(input_=input_, output_=output_)  # type: ignore
+
+        for o in output_:
+            self._init_output(o)
+        anomalies = self.detect_batch(
+            input_=to_table([unwrap(i) for i in input_], columns=self.batch_columns),  # type: ignore
+            output_=output_,
+        )
+        for i, output, anomaly_detected in zip(input_, output_, anomalies):
+            if anomaly_detected:
+                self._set_alert(i, output)
+
+        return anomalies
+
     def detect(
         self,
         input_: List[ParserSchema] | ParserSchema,
@@ -95,6 +141,18 @@ class CoreDetector(CoreComponent):
     ) -> bool:
         return True
 
+    def detect_batch(self, input_: pa.Table, output_: List[DetectorSchema]) -> List[bool]:
+        """Detect over a columnar batch of parsed logs (see
+        ``schemas.to_table``), one output per row.
+
+        Used instead of detect in the detection phase of process_batch
+        when batch_detection is set.
+        """
+        return [
+            self.detect(input_=i, output_=o)  # type: ignore
+            for i, o in zip(from_table(input_, ParserSchema), output_)
+        ]
+
     @override
     def train(
         self, input_: ParserSchema | list[ParserSchema]  # type: ignore
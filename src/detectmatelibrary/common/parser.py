@@ -34,6 +34,10 @@ class CoreParserConfig(CoreConfig):
 
 
 class CoreParser(CoreComponent):
+    # Parsers that neither learn nor depend on earlier logs, whose output is
+    # the same when the logs are split over several processes
+    stateless: bool = False
+
     def __init__(
         self,
         name: str = "CoreParser",
@@ -80,5 +84,17 @@ class CoreParser(CoreComponent):
     ) -> bool | None:
         return True
 
+    def parse_content(self, content: str) -> tuple[str, list[str], int]:
+        """Template, variables and event ID of one log content, for a parser
+        embedded in another one (see JsonParser).
+
+        Runs the content through process. Parsers with a matching core of
+        their own override it to skip the schemas and the fit logic.
+        """
+        output_ = cast(schemas.ParserSchema | None, self.process(schemas.LogSchema({"log": content})))
+        if output_ is None:
+            return "", [], 0
+        return output_["template"], list(output_["variables"]), output_["EventID"]
+
     def train(self, input_: schemas.LogSchema) -> None:  # type: ignore
         pass
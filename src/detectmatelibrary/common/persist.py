@@ -6,11 +6,12 @@ from detectmatelibrary.utils import persistency
 
 if TYPE_CHECKING:
     from detectmatelibrary.common.detector import CoreDetectorConfig
+    from detectmatelibrary.parsers.drain import DrainParserConfig
 
 
 def init_persistency(
     name: str,
-    config: "CoreDetectorConfig",
+    config: "CoreDetectorConfig | DrainParserConfig",
     event_persistency: persistency.EventPersistency,
 ) -> persistency.PersistencySaver | None:
     """Build and start a PersistencySaver for `event_persistency`, or None if
@@ -14,13 +14,17 @@ from detectmatelibrary.utils.persistency.event_data_structures.trackers.stabilit
 from detectmatelibrary.utils.persistency.event_persistency import EventPersistency
 from detectmatelibrary.utils.data_buffer import BufferMode
 from detectmatelibrary.utils.time_format_handler import TimeFormatHandler
-from detectmatelibrary.schemas import ParserSchema, DetectorSchema
+from detectmatelibrary.schemas import ParserSchema, DetectorSchema, from_table
 from detectmatelibrary.constants import GLOBAL_EVENT_ID
 from detectmatelibrary.tools.logging import logger
 
-from typing import Any, Dict, Literal, Optional, cast
+from typing import Any, Dict, List, Literal, Optional, Tuple, cast
 from typing_extensions import override
 
+import pyarrow.compute as pc
+import pyarrow as pa
+import numpy as np
+
 
 def get_global_variables(
         input_: ParserSchema,
@@ -43,6 +47,20 @@ def get_global_variables(
     return result
 
 
+def _list_column(column: pa.ChunkedArray, pos: int) -> Tuple[np.ndarray, pa.Array]:
+    """Rows with an element at `pos` of a list column and their values."""
+    lengths = pc.list_value_length(column).to_numpy(zero_copy_only=False)
+    rows = np.flatnonzero(lengths > pos)
+    return rows, pc.list_element(column.take(rows), pos)
+
+
+def _map_column(column: pa.ChunkedArray, key: str) -> Tuple[np.ndarray, pa.Array]:
+    """Rows with `key` in a map column and their values."""
+    values = pc.map_lookup(column, pa.scalar(key), "first")
+    rows = np.flatnonzero(pc.is_valid(values).to_numpy(zero_copy_only=False))
+    return rows, values.take(rows)
+
+
 class VariableDetectorConfig(CoreDetectorConfig):
     use_stable_vars: bool = True
     use_static_vars: bool = True
@@ -67,10 +85,12 @@ class VariableDetector(CoreDetector):
       - ``_event_data_kwargs`` / ``_auto_conf_kwargs`` (optional): tracker
         construction kwargs.
       - ``_description`` / ``_alert_key`` (optional): output formatting.
+      - ``_candidates`` (optional): vectorised pre-check for detect_batch.
 
     The five lifecycle methods (train/detect/configure/post_train/
     set_configuration) live here and are shared by all subclasses.
     """
+    batch_columns = ["EventID", "variables", "logFormatVariables"]
 
     def __init__(self, name: str, config: VariableDetectorConfig) -> None:
         super().__init__(name=name, buffer_mode=BufferMode.NO_BUF, config=config)
@@ -174,6 +194,13 @@ class VariableDetector(CoreDetector):
         else None."""
         raise NotImplementedError
 
+    def _candidates(
+        self, tracker: SingleStabilityTracker, values: pa.Array
+    ) -> Optional[np.ndarray]:
+        """Vectorised pre-check for detect_batch: mask of the values that may
+        be anomalous for ``tracker``, or None to check all of them."""
+        return None
+
     def _alert_key(self, event_id: Any, key: Any, is_global: bool) -> str:
         return f"Global - {key}" if is_global else f"EventID {event_id} - {key}"
 
@@ -228,6 +255,63 @@ class VariableDetector(CoreDetector):
             return True
         return False
 
+    def detect_batch(
+        self, input_: pa.Table, output_: List[DetectorSchema]
+    ) -> List[bool]:
+        """Mark with ``_candidates`` the rows that may raise an alert, one
+        column per configured variable, and run detect on those rows only."""
+        if not isinstance(self.config.events, EventsConfig):
+            return super().detect_batch(input_=input_, output_=output_)
+
+        candidates = np.zeros(input_.num_rows, dtype=bool)
+        known_events = self.persistency.get_events_data()
+        event_ids = input_.column("EventID").to_numpy()
+
+        for event_id in np.unique(event_ids).tolist():
+            event_config = self.config.events[event_id]
+            if event_id not in known_events or event_config is None:
+                continue
+            rows = np.flatnonzero(event_ids == event_id)
+            table = input_.take(rows)
+            columns = {
+                var.name: _list_column(table.column("variables"), pos)
+                for pos, var in event_config.variables.items() if isinstance(pos, int)
+            }
+            for name in event_config.header_variables:
+                columns[name] = _map_column(table.column("logFormatVariables"), name)
+            self._mark_candidates(candidates, rows, known_events[event_id], columns)
+
+        if self.config.global_instances and GLOBAL_EVENT_ID in known_events:
+            columns = {
+                name: _map_column(input_.column("logFormatVariables"), name)
+                for instance in self.config.global_instances.values()
+                for name in instance.header_variables
+            }
+            rows = np.arange(input_.num_rows)
+            self._mark_candidates(candidates, rows, known_events[GLOBAL_EVENT_ID], columns)
+
+        anomalies = [False] * input_.num_rows
+        idx = np.flatnonzero(candidates)
+        for i, record in zip(idx.tolist(), from_table(input_.take(idx), ParserSchema)):
+            anomalies[i] = self.detect(input_=record, output_=output_[i])  # type: ignore
+        return anomalies
+
+    def _mark_candidates(
+        self,
+        candidates: np.ndarray,
+        rows: np.ndarray,
+        event_tracker: Any,
+        columns: Dict[str, Tuple[np.ndarray, pa.Array]],
+    ) -> None:
+        var_trackers = cast(Dict[str, SingleStabilityTracker], event_tracker.get_data())
+        for key, tracker in var_trackers.items():
+            if key not in columns:
+                continue
+            present, values = columns[key]
+            if (mask := self._candidates(tracker, values)) is not None:
+                present = present[mask]
+            candidates[rows[present]] = True
+
     def _check_event(
         self,
         alerts: Dict[str, str],
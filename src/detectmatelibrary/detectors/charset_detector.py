@@ -5,6 +5,10 @@ from detectmatelibrary.utils.persistency.event_data_structures.trackers.stabilit
 
 from typing import Any, Dict, Optional
 
+import pyarrow.compute as pc
+import pyarrow as pa
+import numpy as np
+
 
 class CharsetDetectorConfig(VariableDetectorConfig):
     method_type: str = "charset_detector"
@@ -12,6 +16,7 @@ class CharsetDetectorConfig(VariableDetectorConfig):
 
 class CharsetDetector(VariableDetector):
     """Detect characters in log data not seen in training as anomalies."""
+    batch_detection = True
 
     def __init__(
         self,
@@ -41,5 +46,17 @@ class CharsetDetector(VariableDetector):
             return "Unknown character(s): " + ", ".join(f"'{c}'" for c in sorted(unknown))
         return None
 
+    def _candidates(
+        self, tracker: SingleStabilityTracker, values: pa.Array
+    ) -> Optional[np.ndarray]:
+        if not pa.types.is_string(values.type) or not all(
+            isinstance(c, str) and len(c) == 1 for c in tracker.unique_set
+        ):
+            return None
+        known = "".join(f"\\x{{{ord(c):x}}}" for c in tracker.unique_set)
+        pattern = f"^[{known}]*$" if known else "^$"
+        only_known = pc.match_substring_regex(values, pattern)
+        return ~np.asarray(only_known.to_numpy(zero_copy_only=False), dtype=bool)
+
     def _description(self) -> str:
         return f"{self.name} detects characters not encountered in training as anomalies."
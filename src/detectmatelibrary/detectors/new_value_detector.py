@@ -5,6 +5,10 @@ from detectmatelibrary.utils.persistency.event_data_structures.trackers.stabilit
 
 from typing import Any, Optional
 
+import pyarrow.compute as pc
+import pyarrow as pa
+import numpy as np
+
 
 class NewValueDetectorConfig(VariableDetectorConfig):
     method_type: str = "new_value_detector"
@@ -12,6 +16,7 @@ class NewValueDetectorConfig(VariableDetectorConfig):
 
 class NewValueDetector(VariableDetector):
     """Detect new values in log data as anomalies based on learned values."""
+    batch_detection = True
 
     def __init__(
         self,
@@ -30,5 +35,15 @@ class NewValueDetector(VariableDetector):
             return f"Unknown value: '{value}'"
         return None
 
+    def _candidates(
+        self, tracker: SingleStabilityTracker, values: pa.Array
+    ) -> Optional[np.ndarray]:
+        try:
+            known = pa.array(list(tracker.unique_set), type=values.type)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            return None
+        is_known = pc.is_in(values, value_set=known).to_numpy(zero_copy_only=False)
+        return ~np.asarray(is_known, dtype=bool)
+
     def _description(self) -> str:
         return f"{self.name} detects values not encountered in training as anomalies."
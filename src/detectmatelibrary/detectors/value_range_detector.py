@@ -6,6 +6,10 @@ from detectmatelibrary.utils.persistency.event_data_structures.trackers.stabilit
 )
 from detectmatelibrary.tools.logging import logger
 
+import pyarrow.compute as pc
+import pyarrow as pa
+import numpy as np
+
 
 class ValueRangeDetectorConfig(VariableDetectorConfig):
     method_type: str = "value_range_detector"
@@ -15,6 +19,7 @@ class ValueRangeDetectorConfig(VariableDetectorConfig):
 
 class ValueRangeDetector(VariableDetector):
     """Detect out-of-range numeric values in logs based on learned min/max."""
+    batch_detection = True
 
     def __init__(
         self,
@@ -86,5 +91,21 @@ class ValueRangeDetector(VariableDetector):
             return f"Out of range value: '{value}' ({min_} - {max_})"
         return None
 
+    def _candidates(
+        self, tracker: SingleStabilityTracker, values: pa.Array
+    ) -> Optional[np.ndarray]:
+        # Values that can not be cast go through _prepare_variables one by one
+        if not tracker.unique_set:
+            return None
+        try:
+            numbers = pc.cast(values, pa.float64())
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            return None
+        out_of_range = pc.or_(
+            pc.less(numbers, float(min(tracker.unique_set))),
+            pc.greater(numbers, float(max(tracker.unique_set))),
+        )
+        return np.asarray(out_of_range.to_numpy(zero_copy_only=False), dtype=bool)
+
     def _description(self) -> str:
         return f"{self.name} detects values not encountered in training as anomalies."
@@ -0,0 +1,202 @@
+"""Asyncio runtime for streaming pipelines of components.
+
+Every stage reads from its own bounded queue and runs
+``CoreComponent.process`` one record at a time, so stateful components
+keep their order. The calls are offloaded to a dedicated thread or process,
+a stage waiting on I/O only blocks itself, and full queues block the
+previous stage up to the source.
+"""
+from detectmatelibrary.common.core import CoreComponent
+from detectmatelibrary.schemas import BaseSchema
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from time import perf_counter
+import asyncio
+
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Literal
+
+
+ExecutorL = Literal["inline", "thread", "process"]
+
+_END = None  # Closes a queue
+_WORKER: dict[str, CoreComponent] = {}
+
+
+def _init_process_worker(component: CoreComponent) -> None:
+    _WORKER["component"] = component
+
+
+def _process_in_worker(data: bytes) -> bytes | None:
+    return _WORKER["component"].process(data)  # type: ignore
+
+
+@dataclass
+class StageMetrics:
+    """Counters of a stage, latencies in seconds."""
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    processed: int = 0
+    outputs: int = 0
+    total_latency: float = 0.
+    max_latency: float = 0.
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.processed if self.processed else 0.
+
+
+class AsyncStage:
+    """A component of an AsyncPipeline.
+
+    With executor "inline" the component runs in the event loop, with
+    "thread" in its own thread (for components waiting on I/O) and with
+    "process" in its own process (for CPU heavy components, which must be
+    picklable). In the last case the component of the main process is not
+    updated.
+    """
+    def __init__(
+        self,
+        component: CoreComponent,
+        executor: ExecutorL = "thread",
+        queue_size: int = 128,
+        name: str | None = None,
+    ) -> None:
+        self.component = component
+        self.executor = executor
+        self.name = component.name if name is None else name
+        self.queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=queue_size)
+        self.metrics = StageMetrics()
+        self._pool: Executor | None = None
+
+    def start(self) -> None:
+        self.queue = asyncio.Queue(maxsize=self.queue.maxsize)
+        self.metrics = StageMetrics()
+        if self.executor == "thread":
+            self._pool = ThreadPoolExecutor(1, thread_name_prefix=self.name)
+        elif self.executor == "process":
+            self._pool = ProcessPoolExecutor(
+                1, initializer=_init_process_worker, initargs=(self.component,)
+            )
+
+    def stop(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def process(self, data: BaseSchema) -> BaseSchema | None:
+        loop = asyncio.get_running_loop()
+        start = perf_counter()
+        if self.executor == "inline":
+            output = self.component.process(data)
+        elif self.executor == "thread":
+            output = await loop.run_in_executor(self._pool, self.component.process, data)
+        else:
+            message = await loop.run_in_executor(self._pool, _process_in_worker, data.serialize())
+            output = None
+            if message is not None:
+                output = self.component.output_schema()
+                output.deserialize(message)
+
+        latency = perf_counter() - start
+        self.metrics.processed += 1
+        self.metrics.total_latency += latency
+        self.metrics.max_latency = max(self.metrics.max_latency, latency)
+        self.metrics.outputs += output is not None
+        return output  # type: ignore
+
+    async def put(self, data: BaseSchema | None) -> None:
+        await self.queue.put(data)
+        self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, self.queue.qsize())
+
+
+class AsyncPipeline:
+    """Chain of stages connected by bounded queues.
+
+    A list of stages in place of a single stage is a fan-out: each of them
+    gets every record of the previous step and their outputs are merged,
+    e.g. ``[parser, [detector_1, detector_2], aggregator]``.
+    """
+    def __init__(
+        self, stages: list[AsyncStage | list[AsyncStage]], queue_size: int = 128
+    ) -> None:
+        self.steps = [step if isinstance(step, list) else [step] for step in stages]
+        self.queue_size = queue_size
+
+    def metrics(self) -> dict[str, StageMetrics]:
+        """Current metrics of each stage."""
+        metrics = {}
+        for step in self.steps:
+            for stage in step:
+                stage.metrics.queue_depth = stage.queue.qsize()
+                metrics[stage.name] = stage.metrics
+        return metrics
+
+    async def run(
+        self, source: Iterable[BaseSchema] | AsyncIterable[BaseSchema]
+    ) -> AsyncIterator[BaseSchema]:
+        """Feed the source through the stages and yield the outputs of the
+        last step."""
+        self._sink: asyncio.Queue[Any] = asyncio.Queue(maxsize=self.queue_size)
+        for step in self.steps:
+            for stage in step:
+                stage.start()
+
+        tasks = [asyncio.create_task(self._read(source))]
+        for i, step in enumerate(self.steps):
+            closed = [0]
+            tasks.extend(asyncio.create_task(self._work(stage, i, closed)) for stage in step)
+
+        getter: asyncio.Future[Any] | None = None
+        try:
+            while True:
+                if getter is None:
+                    getter = asyncio.ensure_future(self._sink.get())
+                running = [task for task in tasks if not task.done()]
+                await asyncio.wait([getter, *running], return_when=asyncio.FIRST_COMPLETED)
+
+                for task in tasks:
+                    if task.done() and not task.cancelled() and task.exception() is not None:
+                        raise task.exception()  # type: ignore
+                if not getter.done():
+                    continue
+
+                output, getter = getter.result(), None
+                if output is _END:
+                    break
+                yield output
+        finally:
+            if getter is not None:
+                getter.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for step in self.steps:
+                for stage in step:
+                    stage.stop()
+
+    async def _send(self, i: int, data: BaseSchema | None) -> None:
+        if i + 1 == len(self.steps):
+            await self._sink.put(data)
+            return
+        for stage in self.steps[i + 1]:
+            await stage.put(data)
+
+    async def _read(self, source: Iterable[BaseSchema] | AsyncIterable[BaseSchema]) -> None:
+        if isinstance(source, AsyncIterable):
+            async for data in source:
+                await self._send(-1, data)
+        else:
+            for data in source:
+                await self._send(-1, data)
+        await self._send(-1, _END)
+
+    async def _work(self, stage: AsyncStage, i: int, closed: list[int]) -> None:
+        while (data := await stage.queue.get()) is not _END:
+            if (output := await stage.process(data)) is not None:
+                await self._send(i, output)
+
+        # The next step is closed once every stage of this one is done
+        closed[0] += 1
+        if closed[0] == len(self.steps[i]):
+            await self._send(i, _END)
@@ -1,13 +1,21 @@
 from detectmatelibrary.common.core import CoreComponent
-from detectmatelibrary.schemas import BaseSchema, LogSchema
+from detectmatelibrary.common.parser import CoreParser
+from detectmatelibrary.schemas import BaseSchema, LogSchema, from_table
 from detectmatelibrary.utils.id_generator import SimpleIDGenerator
 
+from abc import ABC, abstractmethod
+from collections import deque
+from itertools import accumulate
 from ast import literal_eval
+from types import ModuleType
+import multiprocessing as mp
+import mmap
 import os
 
 import polars as pl
 
-from typing import Iterator, overload
+from typing_extensions import Self
+from typing import Any, Iterator, Literal, overload
 import yaml
 import json
 
@@ -22,42 +30,307 @@ def normalize_output(func):  # type: ignore
     return norm
 
 
+# Binary record format ###########################################################
+# [magic][version][flags] followed by varint length-delimited serialized schemas.
+# With zstd compression the records are grouped in blocks, each one stored as
+# varint length-delimited zstd frame.
+
+_MAGIC = b"DMREC"
+_VERSION = 1
+_HEADER_SIZE = len(_MAGIC) + 2
+_COMPRESSIONS: dict[str | None, int] = {None: 0, "zstd": 1}
+
+CompressionL = Literal["zstd"] | None
+
+
+def _zstd() -> ModuleType:
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "zstd compression needs the optional 'zstandard' package"
+        )
+    return zstandard
+
+
+def _encode_varint(value: int) -> bytes:
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _decode_varint(buf: Any, pos: int) -> tuple[int, int]:
+    result, shift = 0, 0
+    while True:
+        if pos >= len(buf):
+            raise ValueError("Truncated record in binary file")
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _iter_frames(buf: Any, pos: int = 0) -> Iterator[bytes]:
+    end = len(buf)
+    while pos < end:
+        size, pos = _decode_varint(buf, pos)
+        if pos + size > end:
+            raise ValueError("Truncated record in binary file")
+        yield bytes(buf[pos:pos + size])
+        pos += size
+
+
+def _read_header(header: bytes) -> CompressionL:
+    if len(header) < _HEADER_SIZE or header[:len(_MAGIC)] != _MAGIC:
+        raise ValueError("Not a DetectMate binary file")
+    if header[len(_MAGIC)] != _VERSION:
+        raise ValueError(f"Unsupported binary file version {header[len(_MAGIC)]}")
+    flags = header[len(_MAGIC) + 1]
+    for compression, flag in _COMPRESSIONS.items():
+        if flag == flags:
+            return compression  # type: ignore
+    raise ValueError(f"Unsupported binary file flags {flags}")
+
+
+def is_legacy_binary_file(path: str) -> bool:
+    """Check if a non empty file uses the old one repr per line format."""
+    with open(path, "rb") as f:
+        return (start := f.read(len(_MAGIC))) != b"" and start != _MAGIC
+
+
+class BinaryFileWriter:
+    """Append-only writer of length-delimited serialized schemas.
+
+    Records are buffered and written every block_size bytes, with zstd
+    compression every flush writes one compressed block. The compression
+    of an existing file is kept.
+    """
+    def __init__(
+        self, out_path: str, compression: CompressionL = None, block_size: int = 1 << 20
+    ) -> None:
+        self.block_size = block_size
+        self.buffer = bytearray()
+
+        exists = os.path.exists(out_path) and os.path.getsize(out_path) > 0
+        if exists:
+            if is_legacy_binary_file(out_path):
+                raise ValueError(f"{out_path} uses the legacy binary format and can not be appended to")
+            with open(out_path, "rb") as f:
+                file_compression = _read_header(f.read(_HEADER_SIZE))
+            if compression is not None and compression != file_compression:
+                raise ValueError(f"{out_path} is compressed with {file_compression}")
+            compression = file_compression
+
+        self.compression = compression
+        self._compressor = _zstd().ZstdCompressor() if compression == "zstd" else None
+        self._file = open(out_path, "ab")
+        if not exists:
+            self._file.write(_MAGIC + bytes([_VERSION, _COMPRESSIONS[compression]]))
+
+    def write(self, record: BaseSchema | bytes) -> bytes:
+        data = record.serialize() if isinstance(record, BaseSchema) else record
+        self.buffer += _encode_varint(len(data))
+        self.buffer += data
+        if len(self.buffer) >= self.block_size:
+            self.flush()
+        return data
+
+    def flush(self) -> None:
+        if self.buffer:
+            if self._compressor is not None:
+                block = self._compressor.compress(bytes(self.buffer))
+                self._file.write(_encode_varint(len(block)) + block)
+            else:
+                self._file.write(self.buffer)
+            self.buffer.clear()
+        self._file.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> "BinaryFileWriter":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+
+def iter_binary_file(in_path: str) -> Iterator[bytes]:
+    """Stream the serialized schemas of a binary file through mmap.
+
+    Files written in the legacy format are read line by line.
+    """
+    if os.path.getsize(in_path) == 0:
+        return
+    if is_legacy_binary_file(in_path):
+        with open(in_path, "r") as text:
+            for line in text:
+                if line.strip():
+                    yield literal_eval(line.strip())
+        return
+
+    with open(in_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        compression = _read_header(buf[:_HEADER_SIZE])
+        if compression is None:
+            yield from _iter_frames(buf, pos=_HEADER_SIZE)
+            return
+
+        decompressor = _zstd().ZstdDecompressor()
+        for block in _iter_frames(buf, pos=_HEADER_SIZE):
+            yield from _iter_frames(decompressor.decompress(block))
+
+
+def _as_plain_dict(schema: BaseSchema) -> dict[str, Any]:
+    """Schema as a dictionary of plain Python values, ready to be dumped."""
+    data = schema.as_dict()
+    for var, value in data.items():
+        if schema.is_field_list(var) and not isinstance(value, (list, dict)):
+            data[var] = dict(value) if hasattr(value, "items") else list(value)
+    return data
+
+
+# Streaming text formats #########################################################
+# NDJSON: one JSON object per line. YAML stream: one YAML document per record.
+# Both are append-only, so writing a record never reads the existing file.
+
+class _StreamWriter(ABC):
+    """Append-only writer that keeps the file open and buffers records.
+
+    The buffer is written every flush_every records and on close.
+    """
+    def __init__(self, out_path: str, flush_every: int = 1000) -> None:
+        self.flush_every = flush_every
+        self.buffer: list[str] = []
+        self._file = open(out_path, "a", encoding="utf-8")
+
+    @abstractmethod
+    def _dumps(self, data: dict[str, Any]) -> str:
+        """One record in the format of the file."""
+
+    def write(self, record: BaseSchema) -> BaseSchema:
+        self.buffer.append(self._dumps(_as_plain_dict(record)))
+        if len(self.buffer) >= self.flush_every:
+            self.flush()
+        return record
+
+    def flush(self) -> None:
+        if self.buffer:
+            self._file.write("".join(self.buffer))
+            self.buffer.clear()
+        self._file.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+
+class NdjsonWriter(_StreamWriter):
+    """Append-only writer of newline delimited JSON records."""
+    def _dumps(self, data: dict[str, Any]) -> str:
+        return json.dumps(data, ensure_ascii=False) + "\n"
+
+
+class YamlStreamWriter(_StreamWriter):
+    """Append-only writer of multi-document YAML, one document per record."""
+    def _dumps(self, data: dict[str, Any]) -> str:
+        return yaml.safe_dump(data, indent=4, default_flow_style=False, explicit_start=True)
+
+
+# Parallel log reading ###########################################################
+# The file is split in newline-aligned byte ranges. Workers first count the
+# lines of every range, so each range knows the number of its first line, and
+# then run the component over the lines of the ranges they get.
+
+_LOG_WORKER: dict[str, CoreComponent] = {}
+
+
+def line_ranges(in_path: str, chunk_bytes: int) -> list[tuple[int, int]]:
+    """Split a file in byte ranges of about `chunk_bytes`, each one ending
+    after a newline or at the end of the file."""
+    ranges: list[tuple[int, int]] = []
+    if (size := os.path.getsize(in_path)) == 0:
+        return ranges
+
+    with open(in_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        while start < size:
+            newline = mm.find(b"\n", min(start + chunk_bytes, size) - 1)
+            end = size if newline == -1 else newline + 1
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _read_lines(in_path: str, start: int, end: int) -> list[bytes]:
+    with open(in_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        lines = mm[start:end].split(b"\n")
+    return lines[:-1] if lines[-1] == b"" else lines
+
+
+def _count_lines(in_path: str, start: int, end: int) -> int:
+    return len(_read_lines(in_path, start, end))
+
+
+def _init_log_worker(component: CoreComponent) -> None:
+    _LOG_WORKER["component"] = component
+
+
+def _process_lines(in_path: str, start: int, end: int, first_line: int) -> list[bytes | None]:
+    component = _LOG_WORKER["component"]
+    # Same IDs as a single component, as long as it processes every line
+    component.id_generator.reset(component.config.start_id + first_line)
+
+    outputs: list[bytes | None] = []
+    for i, line in enumerate(_read_lines(in_path, start, end), start=first_line):
+        log = LogSchema({"log": line.decode().strip(), "logID": str(i)})
+        outputs.append(component.process(log.serialize()))  # type: ignore
+    return outputs
+
+
 class To:
     @staticmethod
     @overload
-    def binary_file(out_: BaseSchema | bytes | None, out_path: str) -> bytes | None:
+    def binary_file(
+        out_: BaseSchema | bytes | None, out_path: str, compression: CompressionL = None
+    ) -> bytes | None:
         ...
 
     @staticmethod
     @overload
-    def binary_file(out_: list[BaseSchema] | list[bytes], out_path: str) -> list[bytes]:
+    def binary_file(
+        out_: list[BaseSchema] | list[bytes], out_path: str, compression: CompressionL = None
+    ) -> list[bytes]:
         ...
 
     @staticmethod
     @normalize_output  # type: ignore
     def binary_file(
-        out_: BaseSchema | bytes | None | list[BaseSchema] | list[bytes], out_path: str
+        out_: BaseSchema | bytes | None | list[BaseSchema] | list[bytes],
+        out_path: str,
+        compression: CompressionL = None,
     ) -> bytes | None | list[bytes]:
 
         if out_ is None:
             return None
+        if not isinstance(out_, list):
+            out_ = [out_]  # type: ignore
 
-        elif isinstance(out_, BaseSchema):
-            out_ = [out_.serialize()]
-        elif isinstance(out_, list) and isinstance(out_[0], BaseSchema):
-            out_ = [o_.serialize() for o_ in out_]  # type: ignore
-        elif isinstance(out_, bytes):
-            out_ = [out_]
-
-        data = [str(o_) + "\n" for o_ in out_]
-        if os.path.exists(out_path):
-            with open(out_path, "r") as f:
-                data = f.readlines() + data
-
-        with open(out_path, "w") as f:
-            f.writelines(data)
-
-        return out_   # type: ignore
+        with BinaryFileWriter(out_path, compression=compression) as writer:
+            return [writer.write(o_) for o_ in out_]  # type: ignore
 
     @overload
     @staticmethod
@@ -87,14 +360,37 @@ class To:
 
         n = len(data)
         for i, o_ in enumerate(out_):
-            data[n + i] = o_.as_dict()
+            data[str(n + i)] = _as_plain_dict(o_)
 
         with open(out_path, "w") as f:
-            obj = literal_eval(str(data))
-            json.dump(obj, f, indent=4, ensure_ascii=False)
+            json.dump(data, f, indent=4, ensure_ascii=False)
 
         return out_
 
+    @overload
+    @staticmethod
+    def ndjson(out_: BaseSchema | None, out_path: str) -> BaseSchema | None:
+        ...
+
+    @overload
+    @staticmethod
+    def ndjson(out_: list[BaseSchema], out_path: str) -> list[BaseSchema]:
+        ...
+
+    @staticmethod
+    @normalize_output  # type: ignore
+    def ndjson(
+        out_: BaseSchema | None | list[BaseSchema], out_path: str
+    ) -> BaseSchema | None | list[BaseSchema]:
+
+        if out_ is None:
+            return None
+        if isinstance(out_, BaseSchema):
+            out_ = [out_]
+
+        with NdjsonWriter(out_path) as writer:
+            return [writer.write(o_) for o_ in out_]
+
     @staticmethod
     @overload
     def yaml(out_: BaseSchema | None, out_path: str) -> BaseSchema | None:
@@ -123,69 +419,68 @@ class To:
 
         n = len(data)
         for i, o_ in enumerate(out_):
-            data[n + i] = o_.as_dict()
+            data[n + i] = _as_plain_dict(o_)
 
         with open(out_path, "w") as f:
-            obj = literal_eval(str(data))
-            yaml.safe_dump(obj, f, indent=4, default_flow_style=False)
+            yaml.safe_dump(data, f, indent=4, default_flow_style=False)
 
         return out_
 
+    @staticmethod
+    @overload
+    def yaml_stream(out_: BaseSchema | None, out_path: str) -> BaseSchema | None:
+        ...
 
-class _Polars:
     @staticmethod
-    def with_dataframe(
-        component: CoreComponent,
-        df: pl.DataFrame,
-        renames: dict[str, str],
-        do_process: bool = True,
-    ) -> Iterator[BaseSchema]:
+    @overload
+    def yaml_stream(out_: list[BaseSchema], out_path: str) -> list[BaseSchema]:
+        ...
 
-        def __generator():  # type: ignore
-            for i in range(len(df)):
-                data = df.row(i, named=True)
-                if len(df_vars) > 0:
-                    data["logFormatVariables"] = df_vars.row(i, named=True)
-                data["logID"] = str(i)
-                schema = component.input_schema(data)
-                yield schema
+    @staticmethod
+    @normalize_output  # type: ignore
+    def yaml_stream(
+        out_: BaseSchema | None | list[BaseSchema], out_path: str
+    ) -> BaseSchema | None | list[BaseSchema]:
 
+        if out_ is None:
+            return None
+        if isinstance(out_, BaseSchema):
+            out_ = [out_]
+
+        with YamlStreamWriter(out_path) as writer:
+            return [writer.write(o_) for o_ in out_]
+
+
+class _Polars:
+    @staticmethod
+    def records(df: pl.DataFrame | pl.LazyFrame, renames: dict[str, str]) -> pl.LazyFrame:
+        """Query of the schema fields of each row, the remaining columns
+        packed as logFormatVariables and the row number as logID."""
         columns = list(renames.values())
-        format_vars = [colum for colum in df.columns if colum not in columns]
-        df_vars, df = df[format_vars], df[columns]
+        format_vars = [colum for colum in df.collect_schema().names() if colum not in columns]
 
-        return From._yield(component, __generator(), do_process=do_process)  # type: ignore
+        fields = [pl.col(colum) for colum in columns]
+        if len(format_vars) > 0:
+            fields.append(pl.struct(format_vars).alias("logFormatVariables"))
+        if "logID" not in columns:
+            df = df.with_row_index("logID")
+            fields.append(pl.col("logID").cast(pl.String))
+        return df.lazy().select(fields)
 
     @staticmethod
-    def with_lazyframe(
+    def stream(
         component: CoreComponent,
-        df: pl.LazyFrame,
+        df: pl.DataFrame | pl.LazyFrame,
         renames: dict[str, str],
+        batch_size: int,
         do_process: bool = True,
     ) -> Iterator[BaseSchema]:
 
         def __generator():  # type: ignore
-            batch_size, offset = int(2e6), 0
-
-            while True:
-                df_batch = df.slice(offset, batch_size).collect()
-                batch_vars = df_vars.slice(offset, batch_size).collect()
-
-                if df_batch.is_empty():
-                    break
-
-                for i in range(len(df_batch)):
-                    data = df_batch.row(i, named=True)
-                    data_var = batch_vars.row(i, named=True)
-                    if len(data_var) > 0:
-                        data["logFormatVariables"] = data_var
-                    data["logID"] = str(i)
-                    schema = component.input_schema(data)
-                    yield schema
-
-        columns = df.collect_schema().names()
-        format_vars = [colum for colum in columns if colum not in list(renames.values())]
-        df_vars, df = df.select(format_vars), df.select(list(renames.values()))
+            # Only one batch of rows is in memory at a time
+            query = _Polars.records(df, renames=renames)
+            for batch in query.collect_batches(chunk_size=batch_size, engine="streaming"):
+                yield from from_table(batch.to_arrow(), component.input_schema)
 
         return From._yield(component, __generator(), do_process=do_process)  # type: ignore
 
@@ -203,8 +498,19 @@ class From:
 
     @staticmethod
     def log(
-        component: CoreComponent, in_path: str, do_process: bool = True
+        component: CoreComponent,
+        in_path: str,
+        do_process: bool = True,
+        workers: int = 0,
+        chunk_bytes: int = 1 << 24,
     ) -> Iterator[BaseSchema]:
+        if workers > 0 and do_process:
+            if not (isinstance(component, CoreParser) and component.stateless):
+                raise ValueError(
+                    f"{component.name} cannot run in {workers} workers, only stateless parsers can"
+                )
+            return From._log_parallel(component, in_path, workers=workers, chunk_bytes=chunk_bytes)
+
         def __generator():  # type: ignore
             id_generator = SimpleIDGenerator(start_id=0)
 
@@ -217,16 +523,45 @@ class From:
 
         return From._yield(component, __generator(), do_process=do_process)  # type: ignore
 
+    @staticmethod
+    def _log_parallel(
+        component: CoreComponent, in_path: str, workers: int, chunk_bytes: int
+    ) -> Iterator[BaseSchema]:
+        ranges = line_ranges(in_path, chunk_bytes)
+        ctx: Any = mp.get_context()
+
+        with ctx.Pool(workers, _init_log_worker, (component,)) as pool:
+            counts = pool.starmap(_count_lines, [(in_path, start, end) for start, end in ranges])
+            first_lines = [0, *accumulate(counts)]
+
+            # At most two ranges per worker are processed or waiting to be read
+            pending: deque[Any] = deque()
+            for (start, end), first_line in zip(ranges, first_lines):
+                pending.append(pool.apply_async(_process_lines, (in_path, start, end, first_line)))
+                if len(pending) >= 2 * workers:
+                    yield from From._outputs(component, pending.popleft().get())
+            while pending:
+                yield from From._outputs(component, pending.popleft().get())
+
+    @staticmethod
+    def _outputs(component: CoreComponent, messages: list[bytes | None]) -> Iterator[BaseSchema]:
+        for message in messages:
+            if message is None:
+                yield message  # type: ignore
+                continue
+            output = component.output_schema()
+            output.deserialize(message)
+            yield output
+
     @staticmethod
     def binary_file(
         component: CoreComponent, in_path: str, do_process: bool = True
     ) -> Iterator[BaseSchema]:
         def __generator():  # type: ignore
-            with open(in_path, "r") as f:
-                for line in f:
-                    schema = component.input_schema()
-                    schema.deserialize(literal_eval(line.strip()))
-                    yield schema
+            for record in iter_binary_file(in_path):
+                schema = component.input_schema()
+                schema.deserialize(record)
+                yield schema
 
         return From._yield(component, __generator(), do_process=do_process)  # type: ignore
 
@@ -256,14 +591,44 @@ class From:
 
         return From._yield(component, __generator(), do_process=do_process)  # type: ignore
 
+    @staticmethod
+    def ndjson(
+        component: CoreComponent, in_path: str, do_process: bool = True
+    ) -> Iterator[BaseSchema]:
+        def __generator():  # type: ignore
+            with open(in_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield component.input_schema(json.loads(line))
+
+        return From._yield(component, __generator(), do_process=do_process)  # type: ignore
+
+    @staticmethod
+    def yaml_stream(
+        component: CoreComponent, in_path: str, do_process: bool = True
+    ) -> Iterator[BaseSchema]:
+        def __generator():  # type: ignore
+            with open(in_path, "r", encoding="utf-8") as f:
+                for data in yaml.safe_load_all(f):
+                    if data is not None:
+                        yield component.input_schema(data)
+
+        return From._yield(component, __generator(), do_process=do_process)  # type: ignore
+
     @staticmethod
     def polars(
         component: CoreComponent,
         df: pl.DataFrame | pl.LazyFrame,
         do_process: bool = True,
-        renames: dict[str, str] | None = None
+        renames: dict[str, str] | None = None,
+        batch_size: int = 100_000,
     ) -> Iterator[BaseSchema]:
+        """Read the rows of a DataFrame or LazyFrame (e.g. ``pl.scan_parquet``)
+        as schemas.
 
+        LazyFrames are executed by the streaming engine in batches of
+        ``batch_size`` rows.
+        """
         renames = {
             "Content": "log", "ParamList": "variables", "EventIDs": "EventID", "Templates": "template"
         } if renames is None else renames
@@ -273,21 +638,31 @@ class From:
 
         df = df.rename(renames)
 
-        return _Polars.with_dataframe(
-            component=component, df=df, do_process=do_process, renames=renames
-        ) if isinstance(df, pl.DataFrame) else _Polars.with_lazyframe(
-            component=component, df=df, do_process=do_process, renames=renames
+        return _Polars.stream(
+            component=component, df=df, renames=renames, batch_size=batch_size, do_process=do_process
         )
 
 
 class FromTo:
+    @staticmethod
+    def _streamed(
+        gen: Iterator[BaseSchema],
+        writer_class: type[_StreamWriter] | type[BinaryFileWriter],
+        out_path: str,
+    ) -> Iterator[BaseSchema]:
+        """Yield the outputs and append them with one writer kept open over
+        the whole run. The last records are written when the generator is
+        exhausted or closed."""
+        with writer_class(out_path) as writer:
+            for log in gen:
+                if log is not None:
+                    writer.write(log)
+                yield log
+
     @staticmethod
     def log2binary_file(component: CoreComponent, in_path: str, out_path: str) -> Iterator[BaseSchema]:
         gen = From.log(component, in_path=in_path, do_process=True)
-
-        for log in gen:
-            To.binary_file(log, out_path=out_path)
-            yield log
+        return FromTo._streamed(gen, BinaryFileWriter, out_path)
 
     @staticmethod
     def log2json(component: CoreComponent, in_path: str, out_path: str) -> Iterator[BaseSchema]:
@@ -303,16 +678,23 @@ class FromTo:
         for log in gen:
             yield To.yaml(log, out_path=out_path)  # type: ignore
 
+    @staticmethod
+    def log2ndjson(component: CoreComponent, in_path: str, out_path: str) -> Iterator[BaseSchema]:
+        gen = From.log(component, in_path=in_path, do_process=True)
+        return FromTo._streamed(gen, NdjsonWriter, out_path)
+
+    @staticmethod
+    def log2yaml_stream(component: CoreComponent, in_path: str, out_path: str) -> Iterator[BaseSchema]:
+        gen = From.log(component, in_path=in_path, do_process=True)
+        return FromTo._streamed(gen, YamlStreamWriter, out_path)
+
     @staticmethod
     def binary_file2binary_file(
         component: CoreComponent, in_path: str, out_path: str
     ) -> Iterator[BaseSchema]:
 
         gen = From.binary_file(component, in_path=in_path, do_process=True)
-
-        for log in gen:
-            To.binary_file(log, out_path=out_path)
-            yield log
+        return FromTo._streamed(gen, BinaryFileWriter, out_path)
 
     @staticmethod
     def binary_file2json(
@@ -332,15 +714,26 @@ class FromTo:
         for log in gen:
             yield To.yaml(log, out_path=out_path)  # type: ignore
 
+    @staticmethod
+    def binary_file2ndjson(
+        component: CoreComponent, in_path: str, out_path: str
+    ) -> Iterator[BaseSchema]:
+        gen = From.binary_file(component, in_path=in_path, do_process=True)
+        return FromTo._streamed(gen, NdjsonWriter, out_path)
+
+    @staticmethod
+    def binary_file2yaml_stream(
+        component: CoreComponent, in_path: str, out_path: str
+    ) -> Iterator[BaseSchema]:
+        gen = From.binary_file(component, in_path=in_path, do_process=True)
+        return FromTo._streamed(gen, YamlStreamWriter, out_path)
+
     @staticmethod
     def json2binary_file(
         component: CoreComponent, in_path: str, out_path: str
     ) -> Iterator[BaseSchema]:
         gen = From.json(component, in_path=in_path, do_process=True)
-
-        for log in gen:
-            To.binary_file(log, out_path=out_path)
-            yield log
+        return FromTo._streamed(gen, BinaryFileWriter, out_path)
 
     @staticmethod
     def json2json(
@@ -365,10 +758,7 @@ class FromTo:
         component: CoreComponent, in_path: str, out_path: str
     ) -> Iterator[BaseSchema]:
         gen = From.yaml(component, in_path=in_path, do_process=True)
-
-        for log in gen:
-            To.binary_file(log, out_path=out_path)
-            yield log
+        return FromTo._streamed(gen, BinaryFileWriter, out_path)
 
     @staticmethod
     def yaml2json(
@@ -396,9 +786,7 @@ class FromTo:
         renames: dict[str, str] | None = None
     ) -> Iterator[BaseSchema]:
         gen = From.polars(component, df=df, renames=renames, do_process=True)
-
-        for log in gen:
-            yield To.binary_file(log, out_path=out_path)  # type: ignore
+        return FromTo._streamed(gen, BinaryFileWriter, out_path)
 
     @staticmethod
     def polars2json(
@@ -0,0 +1,350 @@
+"""Multi-process runner for parser -> detectors -> aggregator pipelines.
+
+Parsing is spread over a pool of parser workers. Parsed logs are sharded by
+a key (``EventID`` by default) over long-lived detector workers, each one
+owning its own instances of every detector, so per-event state stays local
+to its shard. Alerts are merged back in input order in the main process and
+fed to the aggregator.
+"""
+from detectmatelibrary.common.core import CoreComponent, CoreConfig
+from detectmatelibrary.common.parser import CoreParser
+from detectmatelibrary.schemas import BaseSchema, LogSchema, DetectorSchema
+from detectmatelibrary.utils.id_generator import SimpleIDGenerator
+
+from pydantic import BaseModel, ConfigDict
+
+from collections import deque
+from importlib import import_module
+from queue import Empty
+import multiprocessing as mp
+import traceback
+import zlib
+import os
+
+from typing import Any, Iterable, Iterator
+import yaml
+
+
+# Library components, imported on demand. Their method type is the default
+# method_type of their config class, <class name>Config in the same module.
+LIBRARY_COMPONENTS: list[str] = [
+    "detectmatelibrary.parsers.template_matcher.MatcherParser",
+    "detectmatelibrary.parsers.json_parser.JsonParser",
+    "detectmatelibrary.parsers.logbatcher.parser.LogBatcherParser",
+    "detectmatelibrary.parsers.tree_matcher.TemplateCppTreeMatcher",
+    "detectmatelibrary.parsers.drain.DrainParser",
+    "detectmatelibrary.detectors.random_detector.RandomDetector",
+    "detectmatelibrary.detectors.new_value_detector.NewValueDetector",
+    "detectmatelibrary.detectors.new_value_combo_detector.NewValueComboDetector",
+    "detectmatelibrary.detectors.new_event_detector.NewEventDetector",
+    "detectmatelibrary.detectors.value_range_detector.ValueRangeDetector",
+    "detectmatelibrary.detectors.bigram_frequency_detector.BigramFrequencyDetector",
+    "detectmatelibrary.detectors.charset_detector.CharsetDetector",
+    "detectmatelibrary.detectors.event_sequence_detector.EventSequenceDetector",
+    "detectmatelibrary.detectors.rule_detector.RuleDetector",
+    "detectmatelibrary.detectors.ecvc_detector.ECVCDetector",
+    "detectmatelibrary.detectors.scvs_detector.SCVSDetector",
+    "detectmatelibrary.detectors.deeplog_detector.DeeplogDetector",
+    "detectmatelibrary.detectors.logbert_detector.LogBertDetector",
+    "detectmatelibrary.alert_aggregation.basic_concat.BasicConcatAggregation",
+]
+
+# Method type -> class of the library components imported so far
+COMPONENTS: dict[str, type[CoreComponent]] = {}
+_pending_components = deque(LIBRARY_COMPONENTS)
+_unavailable_components: list[str] = []
+
+
+def library_component(method_type: str) -> type[CoreComponent] | None:
+    """Class of the library component of a method type.
+
+    The components are imported in order until the method type is found.
+    Modules whose optional dependencies are missing are skipped.
+    """
+    while method_type not in COMPONENTS and _pending_components:
+        module_name, class_name = _pending_components.popleft().rsplit(".", 1)
+        try:
+            module = import_module(module_name)
+        except ImportError:
+            _unavailable_components.append(f"{module_name}.{class_name}")
+            continue
+        config_class = getattr(module, f"{class_name}Config")
+        COMPONENTS[config_class.model_fields["method_type"].default] = getattr(module, class_name)
+    return COMPONENTS.get(method_type)
+
+
+class PipelineWorkerError(Exception):
+    def __init__(self, worker: str, trace: str) -> None:
+        super().__init__(f"Pipeline worker {worker} failed:\n{trace}")
+
+
+class PipelineConfig(BaseModel):
+    """Layout of the pipeline, read from the ``pipeline`` section of the
+    configuration."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    parser: str
+    detectors: list[str] | None = None
+    aggregator: str | None = None
+
+    workers: int = max(os.cpu_count() or 1, 1)
+    parser_workers: int = 0
+    shard_key: str | None = "EventID"
+
+    batch_size: int = 512
+    max_inflight: int = 4
+    warmup: int | None = None
+    start_method: str | None = None
+
+
+def load_component(
+    config: dict[str, Any],
+    component_type: str,
+    name: str,
+    components: dict[str, type[CoreComponent]] | None = None,
+) -> CoreComponent:
+    """Build the component `name` of `component_type` from its method type."""
+    method_type = config[component_type][name]["method_type"]
+    if components is not None and method_type in components:
+        return components[method_type](name=name, config=config)  # type: ignore
+
+    if (component_class := library_component(method_type)) is None:
+        unavailable = ""
+        if _unavailable_components:
+            unavailable = f", not importable: {', '.join(_unavailable_components)}"
+        raise ValueError(f"Unknown method type '{method_type}' of {component_type} '{name}'{unavailable}")
+    return component_class(name=name, config=config)  # type: ignore
+
+
+def shard_of(value: Any, n_shards: int) -> int:
+    """Stable shard index of a key value, the same in every process."""
+    if isinstance(value, int):
+        return value % n_shards
+    return zlib.crc32(str(value).encode()) % n_shards
+
+
+# Workers ########################################################################
+_WORKER: dict[str, Any] = {}
+
+
+def _init_parser_worker(
+    config: dict[str, Any],
+    settings: PipelineConfig,
+    components: dict[str, type[CoreComponent]] | None,
+) -> None:
+    _WORKER["parser"] = load_component(config, "parsers", settings.parser, components)
+    _WORKER["settings"] = settings
+
+
+def _parse_chunk(offset: int, logs: list[str | bytes]) -> list[tuple[int, int, bytes]]:
+    parser: CoreComponent = _WORKER["parser"]
+    settings: PipelineConfig = _WORKER["settings"]
+    n_shards = settings.workers if settings.shard_key is not None else 1
+
+    # Same parsedLogIDs as a single parser, as long as every log is parsed
+    parser.id_generator.reset(parser.config.start_id + offset)
+
+    parsed_logs = []
+    for i, log in enumerate(logs, start=offset):
+        if isinstance(log, str):
+            log_schema = LogSchema({"log": log.strip(), "logID": str(i)})
+        else:
+            log_schema = LogSchema()
+            log_schema.deserialize(log)
+
+        if (parsed := parser.process(log_schema)) is None:
+            continue
+        assert isinstance(parsed, BaseSchema)
+        shard = 0 if settings.shard_key is None else shard_of(parsed[settings.shard_key], n_shards)
+        parsed_logs.append((i, shard, parsed.serialize()))
+    return parsed_logs
+
+
+def _detector_worker(
+    config: dict[str, Any],
+    settings: PipelineConfig,
+    components: dict[str, type[CoreComponent]] | None,
+    in_queue: Any,
+    out_queue: Any,
+) -> None:
+    try:
+        detectors = [
+            load_component(config, "detectors", name, components) for name in settings.detectors or []
+        ]
+        while (batch := in_queue.get()) is not None:
+            alerts = []
+            for i, parsed, owner in batch:
+                for j, detector in enumerate(detectors):
+                    if (alert := detector.process(parsed)) is not None and owner:
+                        alerts.append((i, j, alert))
+            out_queue.put(alerts)
+    except Exception:
+        out_queue.put(traceback.format_exc())
+
+
+# Runner #########################################################################
+class PipelineRunner:
+    """Run a parser, its detectors and an optional aggregator over
+    several processes.
+
+    The layout comes from the ``pipeline`` section of the configuration and
+    can be overridden with keyword arguments. The first ``warmup`` parsed
+    logs (by default the longest configure plus training window of the
+    detectors) are sent to every shard, so all of them configure and train
+    on the same data as a single detector would. Detectors whose detection
+    state spans several events must run with ``shard_key=None``.
+    """
+    def __init__(
+        self,
+        config: str | dict[str, Any],
+        components: dict[str, type[CoreComponent]] | None = None,
+        **settings: Any,
+    ) -> None:
+        if isinstance(config, str):
+            with open(config, "r") as f:
+                config = yaml.safe_load(f)
+        assert isinstance(config, dict)
+
+        self.config = config
+        self.components = components
+        self.settings = PipelineConfig(**{**config.get("pipeline", {}), **settings})
+        if self.settings.detectors is None:
+            self.settings.detectors = list(config.get("detectors", {}))
+        self.n_shards = self.settings.workers if self.settings.shard_key is not None else 1
+        if self.settings.warmup is None:
+            self.settings.warmup = max([
+                (config["detectors"][name].get("data_use_configure") or 0)
+                + (config["detectors"][name].get("data_use_training") or 0)
+                for name in self.settings.detectors
+            ], default=0)
+
+        if self.settings.parser_workers > 0:
+            # Every worker parses its own chunks, which breaks parsers that
+            # learn from the logs they saw
+            parser = load_component(config, "parsers", self.settings.parser, components)
+            if not (isinstance(parser, CoreParser) and parser.stateless):
+                raise ValueError(
+                    f"{parser.name} cannot run in {self.settings.parser_workers} parser workers, "
+                    "only stateless parsers can"
+                )
+
+        self.aggregator = None if self.settings.aggregator is None else load_component(
+            config, "alert_aggregators", self.settings.aggregator, components
+        )
+        self._alert_ids = [
+            SimpleIDGenerator(
+                config["detectors"][name].get("start_id", CoreConfig().start_id), prefix=name
+            )
+            for name in self.settings.detectors
+        ]
+
+    def run_file(self, in_path: str) -> Iterator[BaseSchema]:
+        """Run the pipeline over a log file, one log per line."""
+        with open(in_path, "r") as f:
+            yield from self.run(f)
+
+    def run(self, logs: Iterable[str | LogSchema]) -> Iterator[BaseSchema]:
+        """Run the pipeline and yield the alerts, or the aggregator outputs,
+        in input order."""
+        ctx: Any = mp.get_context(self.settings.start_method)
+        in_queues = [ctx.Queue() for _ in range(self.n_shards)]
+        out_queues = [ctx.Queue() for _ in range(self.n_shards)]
+        shards = [
+            ctx.Process(
+                target=_detector_worker,
+                args=(self.config, self.settings, self.components, in_queues[i], out_queues[i]),
+                daemon=True,
+            )
+            for i in range(self.n_shards)
+        ]
+        for shard in shards:
+            shard.start()
+
+        initargs = (self.config, self.settings, self.components)
+        pool = None
+        if self.settings.parser_workers > 0:
+            pool = ctx.Pool(self.settings.parser_workers, _init_parser_worker, initargs)
+        else:
+            _init_parser_worker(*initargs)
+
+        parsing: deque[Any] = deque()
+        detecting, self._n_parsed = 0, 0
+        try:
+            for offset, chunk in self._chunks(logs):
+                if pool is None:
+                    self._dispatch(_parse_chunk(offset, chunk), in_queues)
+                    detecting += 1
+                else:
+                    parsing.append(pool.apply_async(_parse_chunk, (offset, chunk)))
+                    if len(parsing) >= self.settings.max_inflight:
+                        self._dispatch(parsing.popleft().get(), in_queues)
+                        detecting += 1
+
+                if detecting >= self.settings.max_inflight:
+                    yield from self._collect(out_queues, shards)
+                    detecting -= 1
+
+            while parsing:
+                self._dispatch(parsing.popleft().get(), in_queues)
+                detecting += 1
+            for _ in range(detecting):
+                yield from self._collect(out_queues, shards)
+        finally:
+            for queue in in_queues:
+                queue.put(None)
+                # Do not block on batches a failed shard will never read
+                queue.cancel_join_thread()
+            for shard in shards:
+                shard.join(timeout=5)
+                if shard.is_alive():
+                    shard.terminate()
+            if pool is not None:
+                pool.terminate()
+
+    def _chunks(self, logs: Iterable[str | LogSchema]) -> Iterator[tuple[int, list[str | bytes]]]:
+        offset, chunk = 0, []
+        for log in logs:
+            chunk.append(log if isinstance(log, str) else log.serialize())
+            if len(chunk) == self.settings.batch_size:
+                yield offset, chunk
+                offset, chunk = offset + len(chunk), []
+        if chunk:
+            yield offset, chunk
+
+    def _dispatch(self, parsed_logs: list[tuple[int, int, bytes]], in_queues: list[Any]) -> None:
+        batches: list[list[tuple[int, bytes, bool]]] = [[] for _ in in_queues]
+        for i, shard, parsed in parsed_logs:
+            if self._n_parsed < self.settings.warmup:  # type: ignore
+                for j, batch in enumerate(batches):
+                    batch.append((i, parsed, j == shard))
+            else:
+                batches[shard].append((i, parsed, True))
+            self._n_parsed += 1
+        # Every shard gets a (maybe empty) batch to keep the outputs aligned
+        for queue, batch in zip(in_queues, batches):
+            queue.put(batch)
+
+    def _collect(self, out_queues: list[Any], shards: list[Any]) -> Iterator[BaseSchema]:
+        alerts = []
+        for i, (queue, shard) in enumerate(zip(out_queues, shards)):
+            while True:
+                try:
+                    result = queue.get(timeout=1)
+                    break
+                except Empty:
+                    if not shard.is_alive():
+                        raise PipelineWorkerError(f"shard {i}", f"exit code {shard.exitcode}")
+            if isinstance(result, str):
+                raise PipelineWorkerError(f"shard {i}", result)
+            alerts.extend(result)
+
+        for _, j, message in sorted(alerts, key=lambda alert: alert[:2]):
+            alert = DetectorSchema()
+            alert.deserialize(message)
+            alert["alertID"] = self._alert_ids[j]()
+
+            if self.aggregator is None:
+                yield alert
+            elif (aggregated := self.aggregator.process(alert)) is not None:
+                yield aggregated  # type: ignore
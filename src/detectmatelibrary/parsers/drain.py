@@ -0,0 +1,262 @@
+"""Online log parser after Drain (He et al., "Drain: An Online Log Parsing
+Approach with Fixed Depth Tree", ICWS 2017).
+
+A log is routed through a tree of fixed depth: the first level splits on the
+number of tokens, the next ``depth - 2`` levels on the leading tokens. The
+leaf holds the clusters of these logs and the log joins the most similar
+one, or starts a new cluster. Tokens of a cluster template that differ
+between its logs become ``<*>``.
+
+The ID of a cluster is the EventID of its logs. The templates are kept in an
+EventPersistency, so export_state/import_state and the ``persist`` config
+save and restore them with the IDs they had.
+"""
+from detectmatelibrary.common.parser import CoreParser, CoreParserConfig
+from detectmatelibrary.common.persist import init_persistency
+from detectmatelibrary.utils.persistency.component_interfaces import PersistConfig
+from detectmatelibrary.utils.persistency.event_persistency import EventPersistency
+from detectmatelibrary.utils.persistency.event_data_structures.trackers import EventTracker
+from detectmatelibrary import schemas
+
+from operator import eq
+from typing import Any
+import re
+
+
+WILDCARD = "<*>"
+
+_DIGIT_RE = re.compile(r"\d")
+
+
+class LogCluster:
+    __slots__ = ("cluster_id", "tokens", "size")
+
+    def __init__(self, cluster_id: int, tokens: list[str]) -> None:
+        self.cluster_id = cluster_id
+        self.tokens = tokens
+        self.size = 1
+
+    @property
+    def template(self) -> str:
+        return " ".join(self.tokens)
+
+    def __repr__(self) -> str:
+        return f"LogCluster({self.cluster_id}, {self.template!r}, size={self.size})"
+
+
+class _Node:
+    __slots__ = ("children", "clusters")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.clusters: list[LogCluster] = []
+
+
+class Drain:
+    """Fixed depth parse tree of log clusters."""
+    def __init__(
+        self,
+        depth: int = 4,
+        similarity_threshold: float = 0.4,
+        max_children: int = 100,
+        max_clusters: int = 64,
+    ) -> None:
+        if depth < 3:
+            raise ValueError(f"Drain needs a depth of at least 3, got {depth}")
+        if max_children < 2 or max_clusters < 1:
+            raise ValueError("Drain needs max_children >= 2 and max_clusters >= 1")
+
+        self.prefix_depth = depth - 2
+        self.similarity_threshold = similarity_threshold
+        self.max_children = max_children
+        self.max_clusters = max_clusters
+
+        self.root: dict[int, _Node] = {}
+        self.clusters: dict[int, LogCluster] = {}
+        self.next_id = 0
+
+    def add_log(self, tokens: list[str]) -> tuple[LogCluster, bool, LogCluster | None]:
+        """Cluster the log.
+
+        Returns the cluster, whether its template is new or changed and
+        the cluster dropped from the leaf to make room for it, if any.
+        """
+        leaf = self._search(tokens)
+        cluster = None if leaf is None else self._most_similar(leaf.clusters, tokens)
+        if leaf is None or cluster is None:
+            cluster = LogCluster(self.next_id, list(tokens))
+            self.next_id += 1
+            return cluster, True, self._insert(cluster)
+
+        cluster.size += 1
+        # the least recently matched cluster of a leaf is the first one
+        if leaf.clusters[-1] is not cluster:
+            leaf.clusters.remove(cluster)
+            leaf.clusters.append(cluster)
+        return cluster, self._merge(cluster, tokens), None
+
+    def restore(self, templates: dict[int, str], next_id: int) -> None:
+        """Rebuild the tree from the templates of the clusters, given from
+        the least to the most recently matched one.
+
+        The clusters are inserted in ID order as they were created, and the
+        clusters of every leaf are then put back in the order they were
+        matched.
+        """
+        self.root, self.clusters = {}, {}
+        for cluster_id in sorted(templates):
+            self._insert(LogCluster(cluster_id, templates[cluster_id].split()))
+
+        recency = {cluster_id: n for n, cluster_id in enumerate(templates)}
+        nodes = list(self.root.values())
+        while nodes:
+            node = nodes.pop()
+            node.clusters.sort(key=lambda cluster: recency[cluster.cluster_id])
+            nodes.extend(node.children.values())
+        self.next_id = max(next_id, max(templates, default=-1) + 1)
+
+    def _search(self, tokens: list[str]) -> _Node | None:
+        node = self.root.get(len(tokens))
+        for token in tokens[:self.prefix_depth]:
+            if node is None:
+                return None
+            children = node.children
+            node = children.get(token) or children.get(WILDCARD)
+        return node
+
+    def _insert(self, cluster: LogCluster) -> LogCluster | None:
+        tokens = cluster.tokens
+        node = self.root.get(len(tokens))
+        if node is None:
+            node = self.root[len(tokens)] = _Node()
+
+        for token in tokens[:self.prefix_depth]:
+            child = node.children.get(token)
+            if child is None:
+                # tokens with digits are most likely variables, and one
+                # child is kept free for the wildcard
+                if (
+                    token == WILDCARD or _DIGIT_RE.search(token)
+                    or len(node.children) >= self.max_children - 1
+                ):
+                    token = WILDCARD
+                child = node.children.get(token)
+                if child is None:
+                    child = node.children[token] = _Node()
+            node = child
+
+        evicted = None
+        if len(node.clusters) >= self.max_clusters:
+            evicted = node.clusters.pop(0)
+            del self.clusters[evicted.cluster_id]
+        node.clusters.append(cluster)
+        self.clusters[cluster.cluster_id] = cluster
+        return evicted
+
+    def _most_similar(self, clusters: list[LogCluster], tokens: list[str]) -> LogCluster | None:
+        """The cluster with most tokens equal to the log, ties to the one with
+        more wildcards."""
+        best, best_same, best_params = None, -1, -1
+        for cluster in clusters:
+            same = sum(map(eq, cluster.tokens, tokens))
+            if same < best_same:
+                continue
+            params = cluster.tokens.count(WILDCARD)
+            if same > best_same or params > best_params:
+                best, best_same, best_params = cluster, same, params
+
+        if best is None or (tokens and best_same < self.similarity_threshold * len(tokens)):
+            return None
+        return best
+
+    @staticmethod
+    def _merge(cluster: LogCluster, tokens: list[str]) -> bool:
+        changed = False
+        template = cluster.tokens
+        for i, token in enumerate(tokens):
+            if template[i] != token and template[i] != WILDCARD:
+                template[i] = WILDCARD
+                changed = True
+        return changed
+
+
+def get_variables(cluster: LogCluster, tokens: list[str]) -> list[str]:
+    return [token for token, field in zip(tokens, cluster.tokens) if field == WILDCARD]
+
+
+class DrainParserConfig(CoreParserConfig):
+    method_type: str = "drain_parser"
+
+    # Levels of the parse tree, with the root and the token count level
+    depth: int = 4
+    # Share of equal tokens for a log to join a cluster
+    similarity_threshold: float = 0.4
+    # Children of a tree node before new tokens go to the wildcard child
+    max_children: int = 100
+    # Clusters of a leaf, the least recently matched one is dropped when full
+    max_clusters: int = 64
+
+    persist: PersistConfig | None = None
+
+
+class DrainParser(CoreParser):
+    """Learns the templates of the logs while parsing them."""
+    def __init__(
+        self,
+        name: str = "DrainParser",
+        config: DrainParserConfig | dict[str, Any] = DrainParserConfig(),
+    ) -> None:
+
+        if isinstance(config, dict):
+            config = DrainParserConfig.from_dict(config, name)
+        super().__init__(name=name, config=config)
+        self.config: DrainParserConfig
+
+        self.drain = Drain(
+            depth=self.config.depth,
+            similarity_threshold=self.config.similarity_threshold,
+            max_children=self.config.max_children,
+            max_clusters=self.config.max_clusters,
+        )
+        # Only the templates and the seen IDs are kept, no variables
+        self.persistency = EventPersistency(event_data_class=EventTracker)
+        self.saver = init_persistency(self.name, self.config, self.persistency)
+        if self.saver is not None:
+            self._restore()
+
+    def import_state(
+        self, path: str | bytes, storage_options: dict[str, Any] | None = None
+    ) -> None:
+        super().import_state(path, storage_options=storage_options)
+        self._restore()
+
+    def _restore(self) -> None:
+        # the templates are in the order their clusters were last matched
+        templates = {int(k): v for k, v in self.persistency.get_event_templates().items()}
+        next_id = max((int(k) for k in self.persistency.get_events_seen()), default=-1) + 1
+        self.drain.restore(templates, next_id)
+
+    def _record(self, cluster: LogCluster, evicted: LogCluster | None) -> None:
+        if evicted is not None:
+            self.persistency.remove_event_template(evicted.cluster_id)
+        # counts the change for the saver and keeps the ID as seen, so it is
+        # not given to another cluster after a restart
+        self.persistency.ingest_event(cluster.cluster_id, cluster.template)
+
+    def parse(
+        self,
+        input_: schemas.LogSchema,
+        output_: schemas.ParserSchema
+    ) -> None:
+
+        tokens = input_["log"].split()
+        cluster, changed, evicted = self.drain.add_log(tokens)
+        # moves the template to the end, so the templates keep the order in
+        # which the clusters were matched
+        self.persistency.set_event_template(cluster.cluster_id, cluster.template)
+        if changed:
+            self._record(cluster, evicted)
+
+        output_["template"] = cluster.template
+        output_["variables"].extend(get_variables(cluster, tokens))
+        output_["EventID"] = cluster.cluster_id
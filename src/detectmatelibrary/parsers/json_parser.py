@@ -1,13 +1,16 @@
 from detectmatelibrary.parsers.template_matcher import MatcherParser, MatcherParserConfig
 from detectmatelibrary.common.parser import CoreParser, CoreParserConfig
-from detectmatelibrary.utils.key_extractor import KeyExtractor
+from detectmatelibrary.utils.key_extractor import FieldPath, KeyExtractor
 from detectmatelibrary import schemas
 
 from collections.abc import Mapping
-from typing import Any, Iterable
+from typing import Any, Callable, Iterable, List, Literal
 import json
 
 
+JsonDecoderL = Literal["auto", "json", "orjson", "msgspec"]
+
+
 def iter_flatten(obj: dict[str, Any], sep: str = '.') -> Iterable[tuple[str, Any]]:
     """Iteratively flattens a nested dict/list JSON-like object. Yields
     (flat_key, value) pairs.
@@ -43,11 +46,60 @@ def flatten_dict(obj: dict[str, Any], sep: str = '.') -> dict[str, Any]:
     return dict(iter_flatten(obj, sep=sep))
 
 
+def _with_fallback(loads: Callable[[str | bytes], Any]) -> Callable[[str | bytes], Any]:
+    def decode(doc: str | bytes) -> Any:
+        try:
+            return loads(doc)
+        except Exception:
+            # e.g. integers beyond 64 bits, json raises the usual error
+            return json.loads(doc)
+    return decode
+
+
+def json_decoder(name: JsonDecoderL = "auto") -> Callable[[str | bytes], Any]:
+    """The loads function of a JSON library. "auto" takes orjson or msgspec
+    when installed and the json module otherwise."""
+    if name in ("auto", "orjson"):
+        try:
+            import orjson
+            return _with_fallback(orjson.loads)
+        except ImportError:
+            if name == "orjson":
+                raise ImportError("json_decoder 'orjson' needs the optional 'orjson' package")
+    if name in ("auto", "msgspec"):
+        try:
+            import msgspec
+            return _with_fallback(msgspec.json.decode)
+        except ImportError:
+            if name == "msgspec":
+                raise ImportError("json_decoder 'msgspec' needs the optional 'msgspec' package")
+    return json.loads
+
+
+def _flatten_field(obj: Any, field: FieldPath, sep: str = '.') -> Iterable[tuple[str, Any]]:
+    """(flat_key, value) pairs of one field, only its own subtree is
+    flattened. KeyError if the document does not have it."""
+    value = field.get(obj)
+    if isinstance(value, (Mapping, list, tuple)):
+        for key, leaf in iter_flatten(value, sep=sep):  # type: ignore[arg-type]
+            yield field.path + sep + key, leaf
+    else:
+        yield field.path, value
+
+
 class JsonParserConfig(CoreParserConfig):
     method_type: str = "json_parser"
     timestamp_name: str = "time"
     content_name: str = "message"
     content_parser: str = "JsonMatcherParser"
+    # Dot-separated paths of timestamp and content, None searches the
+    # first key containing timestamp_name / content_name
+    timestamp_path: str | None = None
+    content_path: str | None = None
+    # Dot-separated paths of the fields kept in logFormatVariables, None
+    # flattens the whole document
+    fields: List[str] | None = None
+    json_decoder: JsonDecoderL = "auto"
 
 
 class JsonParser(CoreParser):
@@ -64,29 +116,42 @@ class JsonParser(CoreParser):
             config = cfg_dict
         super().__init__(name=name, config=config)
 
-        self.time_extractor = KeyExtractor(key_substr=config.timestamp_name)
-        self.content_extractor = KeyExtractor(key_substr=config.content_name)
+        self.config: JsonParserConfig
+        # the paths of timestamp and content not given are learned from the
+        # first document that has them
+        self.time_extractor = KeyExtractor(key_substr=config.timestamp_name, path=config.timestamp_path)
+        self.content_extractor = KeyExtractor(key_substr=config.content_name, path=config.content_path)
+        self.stateless = config.timestamp_path is not None and config.content_path is not None
+        self.fields = None if config.fields is None else [FieldPath(path) for path in config.fields]
+        self._loads = json_decoder(config.json_decoder)
 
     def parse(self, input_: schemas.LogSchema, output_: schemas.ParserSchema) -> None:
-        log = json.loads(input_["log"])
-        # extract timestamp and content in the most efficient way from the json log
-        timestamp = self.time_extractor.extract(obj=log, delete=True)
-        content = self.content_extractor.extract(obj=log, delete=True)
+        log = self._loads(input_["log"])
+        # extract timestamp and content in the most efficient way from the json log,
+        # only the whole document is flattened without them
+        delete = self.fields is None
+        timestamp = self.time_extractor.extract(obj=log, delete=delete)
+        content = self.content_extractor.extract(obj=log, delete=delete)
 
-        parsed = {"EventTemplate": "", "Params": [], "EventId": 0}
+        template, event_id = "", 0
+        variables: list[str] = []
         # if the json also contains a message field, parse it for template and parameters
         if content:
-            log_ = schemas.LogSchema({"log": content})
-            parsed_content = self.content_parser.process(log_)
-            parsed["EventTemplate"] = parsed_content["template"]  # type: ignore
-            parsed["Params"] = parsed_content["variables"]  # type: ignore
-            parsed["EventId"] = parsed_content["EventID"]  # type: ignore
+            template, variables, event_id = self.content_parser.parse_content(str(content))
 
-        log_flat = flatten_dict(log)
+        if self.fields is None:
+            log_flat = flatten_dict(log)
+        else:
+            log_flat = {}
+            for field in self.fields:
+                try:
+                    log_flat.update(_flatten_field(log, field))
+                except KeyError:
+                    pass
         output_["logFormatVariables"].clear()  # ensure it's empty before updating
         output_["logFormatVariables"].update({k: str(v) for k, v in log_flat.items()})
         time = self.time_format_handler.parse_timestamp(timestamp, self.config.time_format)  # type: ignore
         output_["logFormatVariables"].update({"Time": time})
-        output_["template"] = parsed["EventTemplate"]
-        output_["variables"].extend(parsed["Params"])
-        output_["EventID"] = parsed["EventId"]
+        output_["template"] = template
+        output_["variables"].extend(variables)
+        output_["EventID"] = event_id
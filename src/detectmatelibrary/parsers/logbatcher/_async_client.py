@@ -0,0 +1,103 @@
+"""Concurrent LLM requests for LogBatcherParser.
+
+The requests run on an event loop in a background thread. ``submit``
+returns a ``concurrent.futures.Future`` at once, so the parser keeps
+serving cache hits while the requests are in flight.
+"""
+from openai import AsyncOpenAI
+from tenacity import AsyncRetrying, stop_after_attempt, wait_random_exponential
+
+from concurrent.futures import Future
+from time import monotonic
+from typing import Any, Callable, Dict, List
+import threading
+import asyncio
+
+
+class TokenBucket:
+    """Allow ``rate`` requests per second on average, in bursts of up to
+    ``burst`` requests."""
+    def __init__(self, rate: float, burst: int = 1, clock: Callable[[], float] = monotonic) -> None:
+        if rate <= 0 or burst < 1:
+            raise ValueError("TokenBucket needs rate > 0 and burst >= 1")
+        self.rate, self.burst = rate, burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._last = clock()
+
+    def delay(self) -> float:
+        """Take a token and return the seconds to wait before using it.
+
+        The bucket may go into debt, so callers queue up in order.
+        """
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate) - 1
+        self._last = now
+        return 0. if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        if (delay := self.delay()) > 0:
+            await asyncio.sleep(delay)
+
+
+class AsyncChatClient:
+    """Run up to ``max_concurrent`` chat requests at the same time.
+
+    Every attempt takes a token of the bucket when ``requests_per_second``
+    is set. A request that did not succeed within ``timeout`` seconds, its
+    retries included, fails with ``TimeoutError``.
+    """
+    def __init__(
+        self,
+        model: str,
+        api_key: str,
+        base_url: str | None = None,
+        max_concurrent: int = 4,
+        requests_per_second: float | None = None,
+        timeout: float | None = None,
+        max_attempts: int = 10,
+    ) -> None:
+        self.model = model
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.bucket = None if requests_per_second is None else TokenBucket(requests_per_second)
+
+        self._client = AsyncOpenAI(api_key=api_key, base_url=base_url or None)
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def submit(self, messages: List[Dict[str, str]]) -> "Future[tuple[str, float]]":
+        """Start the request, the future gives the answer and the seconds it
+        took."""
+        return asyncio.run_coroutine_threadsafe(self._request(messages), self._loop)
+
+    def close(self) -> None:
+        if not self._loop.is_running():
+            return
+        asyncio.run_coroutine_threadsafe(self._client.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    async def _request(self, messages: List[Dict[str, str]]) -> tuple[str, float]:
+        async with self._semaphore:
+            start = monotonic()
+            answer = await asyncio.wait_for(self._chat(messages), self.timeout)
+            return answer, monotonic() - start
+
+    async def _chat(self, messages: List[Dict[str, str]]) -> str:
+        async for attempt in AsyncRetrying(
+            wait=wait_random_exponential(min=1, max=8),
+            stop=stop_after_attempt(self.max_attempts),
+            reraise=True,
+        ):
+            with attempt:
+                if self.bucket is not None:
+                    await self.bucket.acquire()
+                response: Any = await self._client.chat.completions.create(
+                    model=self.model, messages=messages, temperature=0.05,  # type: ignore[arg-type]
+                )
+                return str(response.choices[0].message.content).strip('\n')
+        raise AssertionError("unreachable")
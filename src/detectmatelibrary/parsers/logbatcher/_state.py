@@ -0,0 +1,140 @@
+"""Saved state of the template cache of LogBatcherParser.
+
+The cache is written as one JSON file: the templates with the logs they
+were learned from, in ID order, the LRU entries of the standardized logs
+from least to most recently used and the variable candidates. Loading
+inserts the templates again, so a restarted parser matches the logs it
+knew without asking the LLM.
+"""
+from detectmatelibrary.parsers.logbatcher.engine.parsing_cache import ParsingCache, message_split
+from detectmatelibrary.utils.persistency import PersistencyLoadError
+from detectmatelibrary.utils.persistency.persistency_saver import _SaveTimer
+from detectmatelibrary.tools.logging import logger
+
+from typing import Any, Callable, Iterator
+import threading
+import atexit
+import json
+
+import fsspec
+
+
+STATE_VERSION = 1
+STATE_FILE = "parsing_cache.json"
+
+
+def _leaves(tree: dict[str, Any]) -> Iterator[tuple[Any, ...]]:
+    for value in tree.values():
+        if isinstance(value, tuple):
+            yield value
+        else:
+            yield from _leaves(value)
+
+
+def dump_cache(cache: ParsingCache) -> bytes:
+    refer_logs = {leaf[3]: leaf[4] for leaf in _leaves(cache.template_tree)}
+    state = {
+        "version": STATE_VERSION,
+        "templates": [
+            [template, refer_logs.get(template_id)]
+            for template_id, template in enumerate(cache.template_list)
+        ],
+        "hashing_cache": [[key, *entry] for key, entry in cache.hashing_cache.items()],
+        "variable_candidates": cache.variable_candidates,
+    }
+    return json.dumps(state).encode()
+
+
+def load_cache(data: bytes, max_size: int) -> ParsingCache:
+    try:
+        state = json.loads(data)
+        if state.get("version") != STATE_VERSION:
+            raise PersistencyLoadError(f"Unknown version {state.get('version')} of the saved cache")
+
+        cache = ParsingCache(max_size=max_size)
+        for template_id, (template, refer_log) in enumerate(state["templates"]):
+            cache.template_list.append(template)
+            # a template without a leaf in the tree is only kept in the list
+            if refer_log is not None:
+                cache.insert(template, message_split(template), template_id, refer_log)
+        for key, template, template_id in state["hashing_cache"]:
+            cache._cache_put(key, (template, template_id))
+        cache.variable_candidates = list(state["variable_candidates"])
+    except PersistencyLoadError:
+        raise
+    except Exception as e:
+        raise PersistencyLoadError(f"Failed to restore the template cache: {e}") from e
+    return cache
+
+
+def write_state(data: bytes, path: str, storage_options: dict[str, Any] | None = None) -> None:
+    fs, root = fsspec.url_to_fs(path, **(storage_options or {}))
+    fs.makedirs(root, exist_ok=True)
+    fs.pipe(f"{root}/{STATE_FILE}", data)
+
+
+def read_state(path: str, storage_options: dict[str, Any] | None = None) -> bytes:
+    fs, root = fsspec.url_to_fs(path, **(storage_options or {}))
+    if not fs.exists(f"{root}/{STATE_FILE}"):
+        raise PersistencyLoadError(f"No saved cache found at '{root}' ({STATE_FILE} missing)")
+    data: bytes = fs.cat_file(f"{root}/{STATE_FILE}")
+    return data
+
+
+class CacheSaver:
+    """Save the cache every ``interval_seconds`` and after
+    ``changes_until_save`` new templates, as PersistencySaver does for an
+    EventPersistency.
+
+    ``dump`` serializes the cache under the lock of the parser, the file
+    is written outside of it.
+    """
+    def __init__(
+        self,
+        dump: Callable[[], bytes],
+        path: str,
+        interval_seconds: int = 300,
+        changes_until_save: int | None = None,
+        storage_options: dict[str, Any] | None = None,
+    ) -> None:
+        self._dump = dump
+        self.path = path
+        self.interval_seconds = interval_seconds
+        self.changes_until_save = changes_until_save
+        self.storage_options = storage_options or {}
+        self.changes_since_save = 0
+        self._lock = threading.Lock()
+        # one save at a time, the timer and changed() may both start one
+        self._save_lock = threading.Lock()
+        self._timer: _SaveTimer | None = None
+
+    def changed(self) -> None:
+        with self._lock:
+            self.changes_since_save += 1
+            due = self.changes_until_save is not None and self.changes_since_save >= self.changes_until_save
+        if due:
+            self.save()
+
+    def save(self) -> None:
+        with self._save_lock:
+            with self._lock:
+                self.changes_since_save = 0
+            try:
+                write_state(self._dump(), self.path, self.storage_options)
+            except Exception as e:
+                logger.warning(f"CacheSaver: save failed — {e}")
+
+    def start(self) -> None:
+        atexit.register(self.stop)
+        self._timer = _SaveTimer(interval=self.interval_seconds, callback=self.save)
+        self._timer.start()
+
+    def stop(self) -> None:
+        """Stop the timer and do a final save."""
+        if self._timer is None:
+            return
+        self._timer.stop()
+        self._timer.join(timeout=5.0)
+        self._timer = None
+        atexit.unregister(self.stop)
+        self.save()
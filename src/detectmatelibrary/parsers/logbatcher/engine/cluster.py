@@ -31,9 +31,8 @@ from typing import List, Optional, Tuple
 import numpy as np
 from scipy.sparse import spmatrix
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.cluster import DBSCAN
-from .sample import group_samples_clustering, dpp_sample
+from .sample import group_samples_clustering, greedy_dpp_sample
 from .util import not_varibility
 import random
 class Cluster:
@@ -61,7 +60,6 @@ class Cluster:
         vectorizer = TfidfVectorizer()
         try:
             tfidf_matrix = vectorizer.fit_transform(vars)
-            tfidf_matrix = tfidf_matrix.toarray()
         except Exception as e:
             print("VARS", vars)
             raise ValueError("Error during TF-IDF vectorization:", e)
@@ -70,13 +68,12 @@ class Cluster:
         if len(self.batch_logs) <= batch_size:
             result = range(len(self.batch_logs))
         elif sample_method == "dpp":
-            similarity_matrix = cosine_similarity(tfidf_matrix)
-            result = dpp_sample(similarity_matrix, batch_size)
+            result = greedy_dpp_sample(tfidf_matrix, batch_size)
         elif sample_method == "random":
             random.seed(0)
             result = random.sample(range(0, len(self.batch_logs)), batch_size)
         elif sample_method == "similar":
-            result = group_samples_clustering(tfidf_matrix, batch_size)[0]
+            result = group_samples_clustering(tfidf_matrix.toarray(), batch_size)[0]
         else:
             raise ValueError("Invalid sample method")
         self.batch_logs = [self.batch_logs[i] for i in result]
@@ -95,17 +92,15 @@ class Cluster:
         # vetorize logs
         vectorizer = TfidfVectorizer()
         tfidf_matrix = vectorizer.fit_transform(self.batch_logs)
-        tfidf_matrix = tfidf_matrix.toarray()
 
         # sample
         if sample_method == "dpp":
-            similarity_matrix = cosine_similarity(tfidf_matrix)
-            result = dpp_sample(similarity_matrix, batch_size)
+            result = greedy_dpp_sample(tfidf_matrix, batch_size)
         elif sample_method == "random":
             random.seed(0)
             result = random.sample(range(0, len(self.batch_logs)), batch_size)
         elif sample_method == "similar":
-            result = group_samples_clustering(tfidf_matrix, batch_size)[0]
+            result = group_samples_clustering(tfidf_matrix.toarray(), batch_size)[0]
         else:
             raise ValueError("Invalid sample method")
         self.batch_logs = [self.batch_logs[i] for i in result]
@@ -25,42 +25,42 @@
 from __future__ import annotations
 
 import re
-from types import FrameType
+from functools import lru_cache
 from typing import Optional, Tuple
 
+import regex
+
 from .cluster import Cluster
 
-import signal
 
-class TimeoutException(Exception):
-    pass
+def safe_search(
+    pattern: str | regex.Pattern[str], string: str, timeout: float = 0.5
+) -> Optional[regex.Match[str]]:
+    """Perform regex search with a timeout to prevent catastrophic
+    backtracking. Unlike SIGALRM this works outside the main thread."""
+    try:
+        if isinstance(pattern, str):
+            return regex.search(pattern, string, timeout=timeout)
+        return pattern.search(string, timeout=timeout)
+    except TimeoutError:
+        return None
 
-def timeout_handler(_signum: int, _frame: Optional[FrameType]) -> None:
-    raise TimeoutException()
 
-def safe_search(pattern: str, string: str, timeout: float = 0.5) -> Optional[re.Match[str]]:
-    signal.signal(signal.SIGALRM, timeout_handler)
-    signal.alarm(timeout)
-    try:
-        result = re.search(pattern, string)
-    except TimeoutException:
-        result = None
-    finally:
-        signal.alarm(0)
-    return result
+@lru_cache(maxsize=4096)
+def template_regex(template: str) -> regex.Pattern[str]:
+    """The compiled pattern of a template, ``<*>`` matching any text."""
+    pattern_parts_escaped = [re.escape(part) for part in template.split("<*>")]
+    return regex.compile("^" + "(.*?)".join(pattern_parts_escaped) + "$")
+
 
+_SPACES = re.compile(r'\s+')
 
-# @timeout(10)
 def extract_variables(log: str, template: str) -> Optional[Tuple[str, ...]]:
-    log = re.sub(r'\s+', ' ', log.strip()) # DS
-    pattern_parts = template.split("<*>")
-    pattern_parts_escaped = [re.escape(part) for part in pattern_parts]
-    regex_pattern = "(.*?)".join(pattern_parts_escaped)
-    regex = "^" + regex_pattern + "$"  
-    # matches = re.search(regex, log)
-    matches = safe_search(regex, log, 1)
+    log = _SPACES.sub(' ', log.strip()) # DS
+    matches = safe_search(template_regex(template), log, 1)
     if matches:
-        return matches.groups()
+        groups: tuple[str, ...] = matches.groups()
+        return groups
     else:
         return None
 
@@ -25,7 +25,7 @@
 from __future__ import annotations
 
 import time
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from openai import OpenAI
 from tenacity import retry, stop_after_attempt, wait_random_exponential
@@ -64,10 +64,28 @@ class Parser:
 
     def get_responce(self, cluster: Cluster, cache_base: ParsingCache) -> Tuple[str, Cluster, Cluster]:
 
-        # initialize
-        logs = cluster.batch_logs
-        sample_log = cluster.sample_log
-        
+        cached = self.match_cached(cluster, cache_base)
+        if cached is not None:
+            return cached
+
+        messages = self.build_messages(cluster, cache_base)
+        try:
+            t0 = time.time()
+            answer = self.chat(messages)
+            # print(messages)
+            # print(answer)
+            self.count_request(messages, time.time() - t0)
+        except Exception as e:
+            logger.error(f"invoke LLM error: {e}")
+            answer = cluster.sample_log
+
+        return self.parse_answer(answer, cluster)
+
+    def match_cached(
+        self, cluster: Cluster, cache_base: ParsingCache
+    ) -> Optional[Tuple[str, Cluster, Cluster]]:
+        """Template of the cluster from the cache, if one of its logs
+        matches a cached template, else None."""
         # Matching and Pruning
         new_cluster = Cluster()
         for log in cluster.logs:
@@ -80,6 +98,12 @@ class Parser:
                 elif new_cluster.size == cluster.size:
                     cluster.logs, cluster.indexs = new_cluster.logs, new_cluster.indexs
                     new_cluster = Cluster()
+        return None
+
+    def build_messages(self, cluster: Cluster, cache_base: ParsingCache) -> List[Dict[str, str]]:
+
+        # initialize
+        logs = cluster.batch_logs
 
         # historical variables
         variable_cluster = Cluster()
@@ -92,26 +116,23 @@ class Parser:
         instruction = "You will be provided with some log messages separated by line break. You must abstract variables with `{{placeholders}}` to extract the corresponding template. The variable type in log messages can be any of the following: ['url', 'IPv4_port', 'host_port', 'package_host', 'IPv6', 'Mac_address', 'time', 'path', 'id', 'date', 'duration', 'size', 'numerical', 'weekday_months', 'user_name']." + variable_prompt + " Constant text and strings should not be recognized as variables.\nPrint the input log's template delimited by backticks."
 
         # invoke LLM
-        messages = [
+        return [
             {"role": "system", "content": instruction},
             {"role": "user", "content": '\n'.join(f'Log[{i+1}]: `{log}`' for i, log in enumerate(logs))}
         ]
-        try:
-            t0 = time.time()
-            answer = self.chat(messages)
-            # print(messages)
-            # print(answer)
-            self.token_list[0] += 1
-            self.token_list[1] += count_message_tokens(messages, self.model)
-            self.time_consumption_llm += (time.time() - t0)
-        except Exception as e:
-            logger.error(f"invoke LLM error: {e}")
-            answer = sample_log
-        
+
+    def count_request(self, messages: List[Dict[str, str]], seconds: float) -> None:
+        self.token_list[0] += 1
+        self.token_list[1] += count_message_tokens(messages, self.model)
+        self.time_consumption_llm += seconds
+
+    def parse_answer(self, answer: str, cluster: Cluster) -> Tuple[str, Cluster, Cluster]:
+        sample_log = cluster.sample_log
+
         template = post_process(answer)
         if not verify_template(template):
             template = correct_single_template(sample_log)
-        
+
         cluster, new_cluster = prune_from_cluster(template, cluster)
         if new_cluster.size == cluster.size:
             cluster.logs, cluster.indexs = new_cluster.logs, new_cluster.indexs
@@ -205,6 +205,7 @@ def single_dataset_parsing(
         'parsing_time': round(parsing_time, 3),
         'llm_invocation_time': round(parser.time_consumption_llm, 3),
         'cache_hit_num': cache.hit_num,
+        'cache_hit_rate': round(cache.hit_rate, 3),
         'hash_table_size': len(cache.hashing_cache),
         'token_stats': parser.token_list,
         'template_count': template_count,
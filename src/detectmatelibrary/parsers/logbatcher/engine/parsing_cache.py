@@ -24,33 +24,14 @@
 
 from __future__ import annotations
 
-from hashlib import sha256
+from collections import OrderedDict
 import re
 import sys
-from types import FrameType
-from typing import Any, Dict, List, Match, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 sys.setrecursionlimit(1000000)
 
-import re
-import signal
-
-class TimeoutException(Exception):
-    pass
-
-def timeout_handler(_signum: int, _frame: Optional[FrameType]) -> None:
-    raise TimeoutException()
-
-def safe_search(pattern: str, string: str, timeout: int = 1) -> Optional[Match[str]]:
-    signal.signal(signal.SIGALRM, timeout_handler)
-    signal.alarm(timeout)
-    try:
-        result = re.search(pattern, string)
-    except TimeoutException:
-        result = None
-    finally:
-        signal.alarm(0)
-    return result
+from .matching import safe_search, template_regex
 
 # _PATTERN = re.compile(r'(?:<\*>|\b\d+\b|[\s\/,:._-]+)')
 # def old_standardize(log: str) -> str:
@@ -62,13 +43,21 @@ _PATTERN2 = re.compile(r'\d')               # digit
 _PATTERN3 = re.compile(r'[\/:,._-]+')        # : , . _ -
 _PATTERN4 = re.compile(r'\s')           # space
 
-def standardize(input_string: str) -> str:
+def standardize_multipass(input_string: str) -> str:
     result = _PATTERN1.sub('', input_string)
     result = _PATTERN2.sub('', result)
     result = _PATTERN3.sub('', result)
     result = _PATTERN4.sub('', result)
     return result
 
+# the four passes above in one: a path segment followed by another, or
+# digits, punctuation and spaces. '/' is left out of the run, it may start
+# a path segment.
+_STANDARDIZE = re.compile(r'/[^/]*(?=/)|[\d:,._\s-]+|/')
+
+def standardize(input_string: str) -> str:
+    return _STANDARDIZE.sub('', input_string)
+
 def print_tree(move_tree: Dict[str, Any], indent: str = ' ') -> None:
     for key, value in move_tree.items():
         if isinstance(value, dict):
@@ -93,12 +82,38 @@ def lcs_similarity(X: List[str], Y: List[str]) -> float:
 
 
 class ParsingCache:
-    def __init__(self) -> None:
+    """Template tree of the parsed logs, with an LRU cache of the
+    standardized logs in front of it.
+
+    The cache keeps at most ``max_size`` logs, 0 for no limit. It is keyed
+    by the standardized log itself: the str hash is computed once and kept
+    by the string, cheaper than any digest of it.
+    """
+    def __init__(self, max_size: int = 100_000) -> None:
         self.template_tree: Dict[str, Any] = {}
         self.template_list: List[str] = []
-        self.hashing_cache: Dict[str, Tuple[str, str, int]] = {}
+        self.hashing_cache: OrderedDict[str, Tuple[str, int]] = OrderedDict()
+        self.max_size = max_size
         self.variable_candidates: List[str] = []
         self.hit_num: int = 0
+        self.miss_num: int = 0
+        self.eviction_num: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hit_num + self.miss_num
+        return self.hit_num / lookups if lookups else 0.
+
+    @property
+    def size(self) -> int:
+        return len(self.hashing_cache)
+
+    def _cache_put(self, key: str, entry: Tuple[str, int]) -> None:
+        self.hashing_cache[key] = entry
+        self.hashing_cache.move_to_end(key)
+        if self.max_size and len(self.hashing_cache) > self.max_size:
+            self.hashing_cache.popitem(last=False)
+            self.eviction_num += 1
 
     def add_templates(
         self,
@@ -149,8 +164,7 @@ class ParsingCache:
     def insert(self, event_template: str, template_tokens: List[str], template_id: int, refer_log: str = '') -> int:
 
         standardized = standardize(event_template)
-        hash_key = sha256(standardized.encode()).hexdigest()
-        self.hashing_cache[hash_key] = (standardized, event_template, template_id)
+        self._cache_put(standardized, (event_template, template_id))
 
         start_token = template_tokens[0]
         if start_token not in self.template_tree:
@@ -215,17 +229,15 @@ class ParsingCache:
 
     def match_event(self, log: str) -> Tuple[str, Any, List[str]]:
         standardized = standardize(log)
-        hash_key = sha256(standardized.encode()).hexdigest()
-        if hash_key in self.hashing_cache:
-            cached_str, template, id = self.hashing_cache[hash_key]
-            if cached_str == standardized:
-                self.hit_num += 1
-                return template, id, []
+        entry = self.hashing_cache.get(standardized)
+        if entry is not None:
+            self.hashing_cache.move_to_end(standardized)
+            self.hit_num += 1
+            return entry[0], entry[1], []
+        self.miss_num += 1
         results = tree_match(self.template_tree, self.template_list, log)
         if results[0] != "NoMatch":
-            standardized = standardize(log)
-            hash_key = sha256(standardized.encode()).hexdigest()
-            self.hashing_cache[hash_key] = (standardized, results[0], results[1])
+            self._cache_put(standardized, (results[0], results[1]))
         return results
 
 
@@ -285,11 +297,7 @@ def tree_match(match_tree: Dict[str, Any], template_list: List[str], log_content
     return ("NoMatch", "NoMatch", relevant_templates)
 
 def match_log(log: str, template: str) -> bool:
-    pattern_parts = template.split("<*>")
-    pattern_parts_escaped = [re.escape(part) for part in pattern_parts]
-    regex_pattern = "(.*?)".join(pattern_parts_escaped)
-    regex = "^" + regex_pattern + "$"  
-    matches = safe_search(regex, log)
+    matches = safe_search(template_regex(template), log, 1)
 
     if matches == None:
         return False
@@ -28,8 +28,10 @@ from typing import Any, List, Tuple
 
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
 import random
 from sklearn.cluster import KMeans
+from scipy.sparse import issparse, spmatrix
 import numpy as np
 
 
@@ -62,6 +64,46 @@ def dpp_sample(S: np.ndarray, k: int) -> List[int]:
     return list(Y)
 
 
+def greedy_dpp_sample(features: np.ndarray | spmatrix, k: int) -> List[int]:
+    """Same selection as ``dpp_sample`` on the cosine similarities of the
+    rows of ``features``, dense or sparse, in O(n * k^2).
+
+    Greedy MAP inference of Chen et al. (NeurIPS 2018): the determinant of
+    the selected submatrix grows by ``d[i] ** 2`` when ``i`` is added,
+    and ``d`` is updated with one new row of the incremental Cholesky
+    factor per step. Only the similarities of the selected items to all
+    items are computed, never the full matrix.
+    """
+    X = normalize(features)
+    n = X.shape[0]
+    k = min(k, n)
+    C = np.zeros((k, n))
+    d2 = np.asarray(X.multiply(X).sum(axis=1) if issparse(X) else (X * X).sum(axis=1))
+    d2 = d2.ravel().astype(float)
+
+    selected: List[int] = []
+    for step in range(k):
+        gains = d2.copy()
+        gains[selected] = -np.inf
+        # the first of the items that are equal up to rounding, as the
+        # diagonal of cosine similarities is 1 for all of them
+        j = int(np.flatnonzero(gains >= gains.max() - 1e-9)[0])
+        if gains[j] <= 1e-10:
+            # the items left add nothing, fill up with the first of them
+            selected += [i for i in range(n) if i not in selected][:k - step]
+            break
+        selected.append(j)
+        if step == k - 1:
+            break
+        similarities = (X @ X[j].T).toarray().ravel() if issparse(X) else X @ X[j]
+        e = (similarities - C[:step, j] @ C[:step]) / np.sqrt(d2[j])
+        C[step] = e
+        d2 -= e ** 2
+
+    # dpp_sample returns the items in the order of a set
+    return list(set(selected))
+
+
 def sample_from_clusters(clusters: List[Any], shot: int = 32) -> List[Tuple[str, str]]:
     clusters = sorted(clusters, key=lambda cluster: len(cluster.indexs), reverse=True)
     # form a random list
@@ -26,11 +26,14 @@ from __future__ import annotations
 
 import re
 import string
-from typing import Dict, List, Tuple
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 import tiktoken
 
+from detectmatelibrary.tools.logging import logger
+
 def data_loader(file_name: str, dataset_format: str, file_format: str) -> List[str]:
     if file_format == 'structured':
         df = pd.read_csv(file_name)
@@ -62,22 +65,35 @@ def count_prompt_tokens(prompt: str, model_name: str) -> int:
     return len(prompt_tokens)
 
 
+@lru_cache(maxsize=None)
+def _message_encoder(model_name: str) -> Optional[tiktoken.Encoding]:
+    try:
+        try:
+            return tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            # ponytail: token count is estimate-only bookkeeping; use the modern
+            # OpenAI encoding for models tiktoken doesn't know rather than raising
+            # (raising here silently discards a successful LLM answer upstream).
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # the encodings are downloaded on first use, which fails offline
+        logger.warning(f"Can not load the token encoding, counting words instead: {e}")
+        return None
+
+
 def count_message_tokens(messages: List[Dict[str, str]], model_name: str = "gpt-3.5-turbo") -> int:
     """
     Count the number of tokens in the messages
     Models supported: gpt-4o-mini, gpt-3.5-turbo
     """
-    try:
-        encoder = tiktoken.encoding_for_model(model_name)
-    except KeyError:
-        # ponytail: token count is estimate-only bookkeeping; use the modern
-        # OpenAI encoding for models tiktoken doesn't know rather than raising
-        # (raising here silently discards a successful LLM answer upstream).
-        encoder = tiktoken.get_encoding("o200k_base")
+    encoder = _message_encoder(model_name)
 
     token_count = 0
 
     for message in messages:
+        if encoder is None:
+            token_count += len(message['content'].split()) + 5
+            continue
         role_tokens = encoder.encode(message['role'])
         content_tokens = encoder.encode(message['content'])
         token_count += len(role_tokens) + len(content_tokens) + 4
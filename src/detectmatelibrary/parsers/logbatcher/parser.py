@@ -1,11 +1,26 @@
 from detectmatelibrary.common.parser import CoreParser, CoreParserConfig
 from detectmatelibrary.parsers.logbatcher.engine.parser import Parser as LLMParser
 from detectmatelibrary.parsers.logbatcher.engine.parsing_cache import ParsingCache
-from detectmatelibrary.parsers.logbatcher.engine.cluster import Cluster
+from detectmatelibrary.parsers.logbatcher.engine.cluster import (
+    Cluster, tokenize, vectorize, cluster as cluster_logs, reassign_clusters, process_new_cluster
+)
 from detectmatelibrary.parsers.logbatcher.engine.matching import extract_variables
+from detectmatelibrary.parsers.logbatcher._async_client import AsyncChatClient
+from detectmatelibrary.parsers.logbatcher._state import (
+    CacheSaver, dump_cache, load_cache, read_state, write_state
+)
+from detectmatelibrary.utils.persistency.component_interfaces import PersistConfig
+from detectmatelibrary.utils.persistency import PersistencyLoadError
+from detectmatelibrary.utils.aux import get_timestamp
+from detectmatelibrary.tools.logging import logger
 from detectmatelibrary import schemas
 
-from typing import Any
+from concurrent.futures import Future
+from dataclasses import dataclass
+from collections import deque
+from time import monotonic
+from typing import Any, Dict, List
+import threading
 
 
 class LogBatcherParserConfig(CoreParserConfig):
@@ -15,10 +30,41 @@ class LogBatcherParserConfig(CoreParserConfig):
     api_key: str = ""
     base_url: str = ""
     batch_size: int = 10
+    # Standardized logs kept in the LRU cache of matched templates, 0 for
+    # no limit
+    cache_size: int = 100_000
+    # Cache misses of a batch clustered together before the LLM is asked
+    # once per cluster, 0 asks for every miss on its own
+    buffer_size: int = 0
+    # Seconds after the first buffered miss the buffer is parsed anyway
+    buffer_timeout: float | None = None
+    # LLM requests in flight at the same time during process_batch, cache
+    # hits are parsed meanwhile
+    max_concurrent_requests: int = 1
+    # Requests started per second, None for no limit
+    requests_per_second: float | None = None
+    # Seconds a concurrent request may take with its retries before the
+    # logs are parsed without the LLM answer
+    request_timeout: float | None = None
+
+    # Saves the template cache, events_until_save counts new templates
+    persist: PersistConfig | None = None
+
+
+@dataclass
+class _Request:
+    future: "Future[tuple[str, float]]"
+    messages: List[Dict[str, str]]
+    cluster: Cluster
+    pending: List[tuple[str, schemas.ParserSchema]]
 
 
 class LogBatcherParser(CoreParser):
-    """LLM-based log parser wrapping LogBatcher, integrated as a CoreParser."""
+    """LLM-based log parser wrapping LogBatcher, integrated as a CoreParser.
+
+    ``process`` may be called from several threads, the template cache is
+    shared between them. ``process_batch`` is for one thread at a time.
+    """
 
     def __init__(
         self,
@@ -35,8 +81,124 @@ class LogBatcherParser(CoreParser):
             "base_url": config.base_url,
         }
         self._llm_parser = LLMParser(model=config.model, theme="default", config=llm_config)
-        self._cache = ParsingCache()
+        self._cache = ParsingCache(max_size=config.cache_size)
+        # Guards the cache, but not the LLM requests
+        self._lock = threading.Lock()
         self._batch_size = config.batch_size
+        self.config: LogBatcherParserConfig
+        # Cache misses waiting to be parsed, only while run_batch buffers
+        self._pending: List[tuple[str, schemas.ParserSchema]] | None = None
+        # Requests in flight, answered in this order
+        self._requests: deque[_Request] = deque()
+        self._client: AsyncChatClient | None = None
+
+        self._cache_saver: CacheSaver | None = None
+        if (persist := self.config.persist) is not None:
+            path = f"{persist.path}/{self.name}"
+            if persist.auto_load:
+                try:
+                    self.import_state(path, storage_options=persist.storage_options)
+                except PersistencyLoadError as e:
+                    logger.info(f"LogBatcherParser: auto_load enabled but no cache found, start fresh. ({e})")
+            self.saver = self._cache_saver = CacheSaver(
+                self._dump_cache,
+                path=path,
+                interval_seconds=persist.interval_seconds,
+                changes_until_save=persist.events_until_save,
+                storage_options=persist.storage_options,
+            )
+            self._cache_saver.start()
+
+    def export_state(
+        self, path: str | None = None, storage_options: dict[str, Any] | None = None,
+    ) -> bytes | None:
+        """Save the template cache to an fsspec URI, or return it as bytes
+        when path is None."""
+        data = self._dump_cache()
+        if path is None:
+            return data
+        write_state(data, path, storage_options)
+        return None
+
+    def import_state(
+        self, path: str | bytes, storage_options: dict[str, Any] | None = None
+    ) -> None:
+        """Replace the template cache by the one saved at path, or given as
+        bytes by export_state."""
+        data = path if isinstance(path, bytes) else read_state(path, storage_options)
+        cache = load_cache(data, max_size=self.config.cache_size)
+        with self._lock:
+            self._cache = cache
+
+    def _dump_cache(self) -> bytes:
+        with self._lock:
+            return dump_cache(self._cache)
+
+    def run_batch(  # type: ignore[override]
+        self, input_: List[schemas.LogSchema], output_: List[schemas.ParserSchema]
+    ) -> List[bool]:
+        """With ``buffer_size`` set, the cache misses of the batch are held
+        back, clustered and parsed with one LLM request per cluster. With
+        ``max_concurrent_requests`` above 1 the requests run in the
+        background while the next logs are parsed.
+
+        The outputs keep the order of the inputs.
+        """
+        if self.config.buffer_size <= 0 and self.config.max_concurrent_requests <= 1:
+            return super().run_batch(input_=input_, output_=output_)  # type: ignore[arg-type]
+        if self.config.max_concurrent_requests > 1 and self._client is None:
+            self._client = AsyncChatClient(
+                model=self.config.model,
+                api_key=self.config.api_key,
+                base_url=self.config.base_url,
+                max_concurrent=self.config.max_concurrent_requests,
+                requests_per_second=self.config.requests_per_second,
+                timeout=self.config.request_timeout,
+            )
+
+        results: List[bool] = []
+        buffer_size, timeout = max(self.config.buffer_size, 1), self.config.buffer_timeout
+        self._pending, first_miss = [], None
+        try:
+            for i, o in zip(input_, output_):
+                results.append(self.run(input_=i, output_=o))
+                if self._requests:
+                    self._collect(wait=False)
+                if not self._pending:
+                    continue
+                if first_miss is None:
+                    first_miss = monotonic()
+                if len(self._pending) >= buffer_size or (
+                    timeout is not None and monotonic() - first_miss >= timeout
+                ):
+                    self._parse_pending()
+                    first_miss = None
+            self._parse_pending()
+            self._collect(wait=True)
+        finally:
+            self._pending = None
+            for request in self._requests:
+                request.future.cancel()
+            self._requests.clear()
+        return results
+
+    def cache_stats(self) -> Dict[str, float]:
+        """Hits, misses, evictions, hit rate and size of the template
+        cache."""
+        with self._lock:
+            return {
+                "hits": self._cache.hit_num,
+                "misses": self._cache.miss_num,
+                "evictions": self._cache.eviction_num,
+                "hit_rate": self._cache.hit_rate,
+                "size": self._cache.size,
+            }
+
+    def __exit__(self, *args: Any) -> None:
+        super().__exit__(*args)
+        if self._client is not None:
+            self._client.close()
+            self._client = None
 
     def parse(
         self,
@@ -45,20 +207,128 @@ class LogBatcherParser(CoreParser):
     ) -> None:
         log_content = input_["log"]
 
-        template, event_id, _ = self._cache.match_event(log_content)
+        with self._lock:
+            template, event_id, _ = self._cache.match_event(log_content)
 
         if template == "NoMatch":
+            if self._pending is not None:
+                self._pending.append((log_content, output_))
+                return
+
             cluster = Cluster()
             cluster.append_log(log_content, 0)
             cluster.batching(self._batch_size)
 
-            template, cluster, _ = self._llm_parser.get_responce(cluster, cache_base=self._cache)
+            template, cluster, _ = self._get_responce(cluster)
+            event_id = self._event_id(template, refer_log=log_content)
+
+        self._set_output(output_, log_content, template, event_id)
 
-            if template not in self._cache.template_list:
-                event_id, _, _ = self._cache.add_templates(template, refer_log=log_content)
-            else:
-                event_id = self._cache.template_list.index(template)
+    def _get_responce(self, cluster: Cluster) -> tuple[str, Cluster, Cluster]:
+        """``get_responce`` of the LLM parser, with the cache locked
+        everywhere but during the request."""
+        with self._lock:
+            cached = self._llm_parser.match_cached(cluster, self._cache)
+            if cached is not None:
+                return cached
+            messages = self._llm_parser.build_messages(cluster, self._cache)
+        try:
+            start = monotonic()
+            answer = self._llm_parser.chat(messages)
+            with self._lock:
+                self._llm_parser.count_request(messages, monotonic() - start)
+        except Exception as e:
+            logger.error(f"invoke LLM error: {e}")
+            answer = cluster.sample_log
+        return self._llm_parser.parse_answer(answer, cluster)
 
+    def _parse_pending(self) -> None:
+        """Cluster the buffered misses as LogBatcher does and ask the LLM
+        once per cluster."""
+        pending, self._pending = self._pending or [], []
+        if not pending:
+            return
+
+        tokenized_logs = [tokenize(log) for log, _ in pending]
+        labels, cluster_nums = cluster_logs(vectorize(tokenized_logs))
+        labels, cluster_nums = reassign_clusters(labels, cluster_nums, tokenized_logs)
+
+        clusters: List[Cluster] = [Cluster() for _ in range(cluster_nums)]
+        for i, label in enumerate(labels):
+            clusters[label].append_log(pending[i][0], i)
+        clusters = sorted(clusters, key=lambda cluster: cluster.size, reverse=True)
+        for cluster in clusters:
+            cluster.batching(self._batch_size)
+
+        for cluster in clusters:
+            self._ask(cluster, pending, clusters)
+
+    def _ask(
+        self,
+        cluster: Cluster,
+        pending: List[tuple[str, schemas.ParserSchema]],
+        clusters: List[Cluster],
+    ) -> None:
+        if self._client is None:
+            self._resolve(*self._get_responce(cluster), pending, clusters)
+            return
+        with self._lock:
+            cached = self._llm_parser.match_cached(cluster, self._cache)
+            if cached is None:
+                messages = self._llm_parser.build_messages(cluster, self._cache)
+        if cached is not None:
+            self._resolve(*cached, pending, clusters)
+        else:
+            self._requests.append(_Request(self._client.submit(messages), messages, cluster, pending))
+
+    def _collect(self, wait: bool) -> None:
+        """Parse the logs of the answered requests, in the order the
+        requests were made."""
+        while self._requests and (wait or self._requests[0].future.done()):
+            request = self._requests.popleft()
+            try:
+                answer, seconds = request.future.result()
+                with self._lock:
+                    self._llm_parser.count_request(request.messages, seconds)
+            except Exception as e:
+                logger.error(f"invoke LLM error: {e!r}")
+                answer = request.cluster.sample_log
+
+            new_clusters: List[Cluster] = []
+            parsed = self._llm_parser.parse_answer(answer, request.cluster)
+            self._resolve(*parsed, request.pending, new_clusters)
+            for cluster in new_clusters:
+                self._ask(cluster, request.pending, new_clusters)
+
+    def _resolve(
+        self,
+        template: str,
+        cluster: Cluster,
+        new_cluster: Cluster,
+        pending: List[tuple[str, schemas.ParserSchema]],
+        clusters: List[Cluster],
+    ) -> None:
+        # logs that do not fit the template are appended as a new cluster
+        process_new_cluster(new_cluster, clusters, self._batch_size)  # type: ignore[arg-type]
+        event_id = self._event_id(template, refer_log=cluster.logs[0])
+        for i in cluster.indexs:
+            log_content, output_ = pending[i]
+            self._set_output(output_, log_content, template, event_id)
+            output_["parsedTimestamp"] = get_timestamp()
+
+    def _event_id(self, template: str, refer_log: str) -> int:
+        with self._lock:
+            if template in self._cache.template_list:
+                return self._cache.template_list.index(template)
+            event_id, _, _ = self._cache.add_templates(template, refer_log=refer_log)
+        if self._cache_saver is not None:
+            self._cache_saver.changed()
+        return event_id
+
+    @staticmethod
+    def _set_output(
+        output_: schemas.ParserSchema, log_content: str, template: str, event_id: int
+    ) -> None:
         variables = extract_variables(log_content, template) or ()
 
         output_["template"] = template
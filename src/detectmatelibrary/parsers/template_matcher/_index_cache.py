@@ -0,0 +1,67 @@
+"""Preprocessed templates saved next to the templates file.
+
+The file holds a header ([magic][version][key]) and the msgpack encoded
+state of the TemplatesManager: the raw templates with their preprocessed
+tokens, lengths and event IDs, and the labels of named templates. The key
+hashes the templates file, the matching options and the library version,
+so a stale index is rebuilt instead of loaded. The tries and the
+automaton are built again from the saved tokens on load.
+"""
+from detectmatelibrary.parsers.template_matcher._matcher_op import TemplatesManager
+from detectmatelibrary.metadata import __version__
+
+from typing import Any
+import hashlib
+import os
+
+import msgpack
+
+
+INDEX_VERSION = 2
+INDEX_SUFFIX = ".index"
+
+_MAGIC = b"DMTPLIDX"
+_KEY_SIZE = 32
+_HEADER_SIZE = len(_MAGIC) + 1 + _KEY_SIZE
+
+
+def index_path(path_templates: str) -> str:
+    return path_templates + INDEX_SUFFIX
+
+
+def index_key(path_templates: str, options: dict[str, Any]) -> bytes:
+    """Hash of the content of the templates file and the options the index
+    was built with."""
+    key = hashlib.blake2b(digest_size=_KEY_SIZE)
+    with open(path_templates, "rb") as f:
+        key.update(f.read())
+    key.update(repr(sorted(options.items())).encode())
+    key.update(__version__.encode())
+    return key.digest()
+
+
+def load_index(path: str, key: bytes) -> TemplatesManager | None:
+    """The saved manager, or None if the file is missing, of another
+    version or built from other templates."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        if (
+            data[:len(_MAGIC)] != _MAGIC
+            or data[len(_MAGIC)] != INDEX_VERSION
+            or data[len(_MAGIC) + 1:_HEADER_SIZE] != key
+        ):
+            return None
+        return TemplatesManager.from_state(msgpack.unpackb(data[_HEADER_SIZE:]))
+    except (OSError, ValueError, IndexError, KeyError, TypeError, msgpack.UnpackException):
+        return None
+
+
+def save_index(path: str, key: bytes, manager: TemplatesManager) -> None:
+    """Write the index to a temporary file and move it in place, so
+    readers never see a partial file."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_MAGIC + bytes([INDEX_VERSION]) + key)
+        f.write(msgpack.packb(manager.to_state()))
+    os.replace(tmp_path, path)
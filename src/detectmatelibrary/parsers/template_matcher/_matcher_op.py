@@ -1,5 +1,5 @@
-from collections import defaultdict
-from typing import Dict, List, Any, Tuple, TypedDict
+from collections import OrderedDict, defaultdict, deque
+from typing import Dict, List, Any, Literal, Tuple, TypedDict, cast
 import regex
 import re
 
@@ -8,21 +8,146 @@ from detectmatelibrary.common._config._formats import (
 )
 
 
+_WS_RE = re.compile(r'\s+')
+_SKELETON_RE = re.compile(r'\b(?:(?:0x)?[0-9a-fA-F]{8,}\b|\w*\d\w*)')  # \b: one try per word
+_WORD_RE = re.compile(r'\w')
+_HEAD_WORD_RE = re.compile(r'^\w+')
+_TAIL_WORD_RE = re.compile(r'\w+$')
+
+MatchingEngineL = Literal["sequential", "automaton"]
+
+
 class TemplateMetadata(TypedDict):
     event_id_label: str | None
     labels: list[str]
 
 
-def safe_search(pattern: str, string: str, timeout: int = 1) -> regex.Match[str] | None:
+def safe_search(
+    pattern: str | regex.Pattern[str], string: str, timeout: int = 1
+) -> regex.Match[str] | None:
     """Perform regex search with a timeout to prevent catastrophic
     backtracking."""
     try:
-        result = regex.search(pattern, string, timeout=timeout)
+        if isinstance(pattern, str):
+            result = regex.search(pattern, string, timeout=timeout)
+        else:
+            result = pattern.search(string, timeout=timeout)
     except TimeoutError:
         result = None
     return result
 
 
+def template_regex(template: str) -> str:
+    """Regex matching a whole log of the template, one group per
+    wildcard."""
+    pattern_parts = template.split("<*>")
+    pattern_parts_escaped = [re.escape(part) for part in pattern_parts]
+    return "^" + "(.*?)".join(pattern_parts_escaped) + "$"
+
+
+class PrefixTrie:
+    """Character trie of the leading literals of the templates, stored
+    flat in lists of nodes."""
+    def __init__(self) -> None:
+        self._children: list[dict[str, int]] = [{}]
+        self._idxs: list[list[int]] = [[]]
+
+    def add(self, prefix: str, idx: int) -> None:
+        node = 0
+        for char in prefix:
+            if (next_node := self._children[node].get(char)) is None:
+                next_node = len(self._children)
+                self._children.append({})
+                self._idxs.append([])
+                self._children[node][char] = next_node
+            node = next_node
+        self._idxs[node].append(idx)
+
+    def prefixes_of(self, s: str) -> list[int]:
+        """Indices of the templates whose leading literal is a prefix of
+        `s`, walking at most len(s) nodes."""
+        children, idxs = self._children, self._idxs
+        found = list(idxs[0])
+        node = 0
+        for char in s:
+            if (next_node := children[node].get(char)) is None:
+                break
+            node = next_node
+            found.extend(idxs[node])
+        return found
+
+
+class LiteralAutomaton:
+    """Aho-Corasick automaton over one anchor literal per template.
+
+    The anchor is the literal of the template shared by the fewest other
+    templates, so one scan of a text only yields the few templates whose
+    anchor occurs in it.
+    """
+    def __init__(self) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[int]] = [[]]  # templates anchored at each state
+        self._literals: dict[int, set[str]] = {}
+
+    def add(self, literals: list[str], idx: int) -> None:
+        self._literals[idx] = {literal for literal in literals if literal}
+
+    def build(self) -> None:
+        """Choose the anchors and build the automaton, call after the last
+        add."""
+        frequency: dict[str, int] = defaultdict(int)
+        for literals in self._literals.values():
+            for literal in literals:
+                frequency[literal] += 1
+
+        for idx, literals in self._literals.items():
+            if literals:
+                anchor = min(literals, key=lambda literal: (frequency[literal], -len(literal)))
+                self._insert(anchor, idx)
+            else:
+                self._out[0].append(idx)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def _insert(self, literal: str, idx: int) -> None:
+        state = 0
+        for char in literal:
+            if (next_state := self._goto[state].get(char)) is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._out[state].append(idx)
+
+    def templates_in(self, text: str) -> list[int]:
+        """Indices of the templates with all their literals in `text`."""
+        goto, fail, out = self._goto, self._fail, self._out
+        anchored: set[int] = set(out[0])
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                anchored.update(out[state])
+
+        return [
+            idx for idx in anchored if all(literal in text for literal in self._literals[idx])
+        ]
+
+
 class Preprocess:
     def __init__(
         self,
@@ -76,8 +201,15 @@ class TemplatesManager:
         metadata: dict[int, TemplateMetadata] | None = None,
         remove_spaces: bool = True,
         remove_punctuation: bool = True,
-        lowercase: bool = True
+        lowercase: bool = True,
+        engine: MatchingEngineL = "sequential",
     ) -> None:
+        self._options: dict[str, Any] = dict(
+            remove_spaces=remove_spaces,
+            remove_punctuation=remove_punctuation,
+            lowercase=lowercase,
+            engine=engine,
+        )
         self.preprocess = Preprocess(
             re_spaces=remove_spaces,
             re_punctuation=remove_punctuation,
@@ -85,26 +217,12 @@ class TemplatesManager:
         )
 
         self.templates: List[Dict[str, Any]] = []
-        self._prefix_index = defaultdict(list)  # first literal -> [template_idx]
-
         event_id = 0
         for tpl in template_list:
             cleaned_tpl = self.preprocess(tpl)
             tokens = cleaned_tpl.split("<*>")
             min_len = sum(len(t) for t in tokens)  # lower bound to skip impossibles
-
-            info = {
-                "raw": tpl,
-                "tokens": tokens,
-                "min_len": min_len,
-                "count": 0,
-                "event_id": (event_id := event_id + 1)
-            }
-
-            idx = len(self.templates)
-            self.templates.append(info)
-            first = tokens[0] if tokens else ""
-            self._prefix_index[first].append(idx)
+            self.templates.append(self._template(tpl, tokens, min_len, event_id := event_id + 1))
 
         _metadata: dict[int, TemplateMetadata] = metadata or {}
         self._event_label_to_idx: dict[str, int] = {
@@ -117,6 +235,69 @@ class TemplatesManager:
             for i, m in _metadata.items()
             if m["labels"]
         }
+        self._build_index()
+
+    @staticmethod
+    def _template(raw: str, tokens: list[str], min_len: int, event_id: int) -> Dict[str, Any]:
+        return {
+            "raw": raw,
+            "tokens": tokens,
+            "min_len": min_len,
+            "pattern": None,  # compiled on first use
+            "count": 0,
+            "event_id": event_id,
+        }
+
+    def _build_index(self) -> None:
+        """Index the preprocessed templates by their literals."""
+        self._prefix_index: defaultdict[str, list[int]] = defaultdict(list)  # first literal -> [idx]
+        self._prefix_trie = PrefixTrie()
+        for idx, template in enumerate(self.templates):
+            tokens = template["tokens"]
+            first = tokens[0] if tokens else ""
+            self._prefix_index[first].append(idx)
+            self._prefix_trie.add(first, idx)
+
+        # Ties in count keep the order of the templates grouped by first literal
+        self._rank = [0] * len(self.templates)
+        for rank, idx in enumerate(i for idxs in self._prefix_index.values() for i in idxs):
+            self._rank[idx] = rank
+
+        self.skeleton_unsafe: set[int] = set()
+        self._skeleton_groups: list[list[int]] = []
+        self._skeleton_automaton: LiteralAutomaton | None = None  # see index_skeletons
+
+        self._automaton: LiteralAutomaton | None = None
+        if self._options["engine"] == "automaton":
+            self._automaton = LiteralAutomaton()
+            for idx, template in enumerate(self.templates):
+                self._automaton.add(template["tokens"], idx)
+            self._automaton.build()
+
+    def to_state(self) -> dict[str, Any]:
+        """Plain data of the preprocessed templates, see from_state."""
+        return {
+            "options": self._options,
+            "templates": [
+                [t["raw"], t["tokens"], t["min_len"], t["event_id"]] for t in self.templates
+            ],
+            "event_labels": list(self._event_label_to_idx.items()),
+            "var_maps": [[i, list(var_map.items())] for i, var_map in self._idx_to_var_map.items()],
+        }
+
+    @classmethod
+    def from_state(cls, state: dict[str, Any]) -> "TemplatesManager":
+        """The manager of to_state, indexed again without preprocessing the
+        templates."""
+        manager = cls(template_list=[], **state["options"])
+        manager.templates = [
+            cls._template(raw, list(tokens), min_len, event_id)
+            for raw, tokens, min_len, event_id in state["templates"]
+        ]
+        manager._event_label_to_idx = {label: idx for label, idx in state["event_labels"]}
+        manager._idx_to_var_map = {idx: dict(var_map) for idx, var_map in state["var_maps"]}
+        manager._build_index()
+        return manager
 
     def compile_events_config(self, events_config: EventsConfig) -> EventsConfig:
         """Resolve named event IDs and named variable labels to positional
@@ -161,16 +342,143 @@ class TemplatesManager:
 
         return EventsConfig(events=new_events)
 
+    def pattern(self, idx: int) -> regex.Pattern[str]:
+        """Compiled regex of a template."""
+        template = self.templates[idx]
+        if template["pattern"] is None:
+            template["pattern"] = regex.compile(template_regex(template["raw"]))
+        return cast(regex.Pattern[str], template["pattern"])
+
+    def index_skeletons(self) -> None:
+        """Index the templates whose match may differ between logs of one
+        skeleton by the text their skeletons contain, for the match cache."""
+        if self._skeleton_automaton is not None:
+            return
+        self.skeleton_unsafe = {
+            idx for idx, template in enumerate(self.templates) if not skeleton_safe(template["raw"])
+        }
+        # templates differing only in masked words share their literals
+        groups: dict[tuple[str, ...], list[int]] = defaultdict(list)
+        for idx in sorted(self.skeleton_unsafe):
+            groups[tuple(skeleton_literals(self.templates[idx]["raw"]))].append(idx)
+        self._skeleton_groups = list(groups.values())
+        self._skeleton_automaton = LiteralAutomaton()
+        for group, literals in enumerate(groups):
+            self._skeleton_automaton.add(list(literals), group)
+        self._skeleton_automaton.build()
+
+    def skeleton_competitors(self, key: str) -> tuple[int, ...]:
+        """Skeleton-unsafe templates that may match some log of a
+        skeleton."""
+        self.index_skeletons()
+        assert self._skeleton_automaton is not None
+        groups = self._skeleton_automaton.templates_in(key)
+        return tuple(sorted(idx for group in groups for idx in self._skeleton_groups[group]))
+
     def candidate_indices(self, s: str) -> Tuple[str, List[int]]:
         pre_s = self.preprocess(s)
-        candidates = []
-        for first, idxs in self._prefix_index.items():
-            if first == "" or pre_s.startswith(first):
-                candidates.extend(idxs)
-        candidates.sort(key=lambda i: -self.templates[i]["count"])  # small heuristic
+        if self._automaton is None:
+            candidates = self._prefix_trie.prefixes_of(pre_s)
+        else:
+            candidates = [
+                i for i in self._automaton.templates_in(pre_s)
+                if pre_s.startswith(self.templates[i]["tokens"][0])
+            ]
+        # small heuristic
+        candidates.sort(key=lambda i: (-self.templates[i]["count"], self._rank[i]))
         return pre_s, candidates
 
 
+# MatchCache values of skeletons seen once and of skeletons matching
+# several templates
+_SEEN, _AMBIGUOUS = -1, -2
+
+
+class MatchCache:
+    """LRU cache of the template index matched by the logs of a
+    skeleton."""
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        # skeleton -> (template index, templates that may match instead)
+        self._entries: OrderedDict[str, tuple[int, tuple[int, ...]]] = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> int | None:
+        if (entry := self._entries.get(key)) is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        if entry[0] < 0:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry[0]
+
+    def competitors(self, key: str) -> tuple[int, ...]:
+        return self._entries[key][1]
+
+    def put(self, key: str, idx: int, competitors: tuple[int, ...] = ()) -> None:
+        self._entries[key] = (idx, competitors)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def skeleton(log: str) -> str:
+    """Log with the variable-looking tokens (numbers, hex, IDs) masked."""
+    return _SKELETON_RE.sub("#", log)
+
+
+def skeleton_literals(template: str) -> list[str]:
+    """Text that the skeleton of every log of the template contains.
+
+    The words inside a literal are masked as in the logs. Words at the ends
+    of a literal that touch a wildcard may run on into it, so they are left
+    out.
+    """
+    literals = template.split("<*>")
+    last = len(literals) - 1
+    trimmed = []
+    for n, literal in enumerate(literals):
+        if n > 0:
+            literal = _HEAD_WORD_RE.sub("", literal)
+        if n < last:
+            literal = _TAIL_WORD_RE.sub("", literal)
+        trimmed.append(literal)
+    # one pass masks all literals, the NUL between them is not a word char
+    return [literal for literal in skeleton("\0".join(trimmed)).split("\0") if literal]
+
+
+def skeleton_safe(template: str) -> bool:
+    """Whether the template matches either all or none of the logs of a
+    skeleton.
+
+    The masked tokens are whole words. A literal without maskable words
+    that does not end in a word character next to a wildcard only ever
+    covers unmasked words, so it is found in every log of the skeleton or
+    in none.
+    """
+    literals = template.split("<*>")
+    for n, literal in enumerate(literals):
+        if skeleton(literal) != literal:
+            return False
+        if literal and (
+            (n > 0 and _WORD_RE.match(literal[0])) or (n < len(literals) - 1 and _WORD_RE.match(literal[-1]))
+        ):
+            return False
+    return True
+
+
 class TemplateMatcher:
     def __init__(
         self,
@@ -178,15 +486,34 @@ class TemplateMatcher:
         metadata: dict[int, TemplateMetadata] | None = None,
         remove_spaces: bool = True,
         remove_punctuation: bool = True,
-        lowercase: bool = True
+        lowercase: bool = True,
+        engine: MatchingEngineL = "sequential",
+        cache_size: int = 0,
     ) -> None:
-        self.manager = TemplatesManager(
-            template_list=template_list,
-            metadata=metadata,
+        self._options = dict(
             remove_spaces=remove_spaces,
             remove_punctuation=remove_punctuation,
-            lowercase=lowercase
+            lowercase=lowercase,
+            engine=engine,
         )
+        self.cache = MatchCache(cache_size) if cache_size > 0 else None
+        self.set_templates(template_list, metadata)
+
+    def set_templates(
+        self, template_list: list[str], metadata: dict[int, TemplateMetadata] | None = None
+    ) -> None:
+        """Replace the templates, invalidating the match cache."""
+        self.set_manager(TemplatesManager(
+            template_list=template_list, metadata=metadata, **self._options  # type: ignore
+        ))
+
+    def set_manager(self, manager: TemplatesManager) -> None:
+        """Use already indexed templates, invalidating the match cache."""
+        self.manager = manager
+        self._event_ids = {t["raw"]: i for i, t in enumerate(self.manager.templates)}
+        if self.cache is not None:
+            self.manager.index_skeletons()
+            self.cache.clear()
 
     def compile_detector_config(self, events_config: EventsConfig) -> EventsConfig:
         """Resolve named event IDs and variable labels to positional ints.
@@ -200,42 +527,111 @@ class TemplateMatcher:
     @staticmethod
     def extract_parameters(log: str, template: str) -> tuple[str, ...] | None:
         """Extract parameters from the log based on the template."""
-        log = re.sub(r'\s+', ' ', log.strip())
-        pattern_parts = template.split("<*>")
-        pattern_parts_escaped = [re.escape(part) for part in pattern_parts]
-        regex_pattern = "(.*?)".join(pattern_parts_escaped)
-        regex = "^" + regex_pattern + "$"
-        matches = safe_search(regex, log, 1)
+        return TemplateMatcher._search(_WS_RE.sub(' ', log.strip()), template_regex(template))
+
+    @staticmethod
+    def _search(log: str, pattern: str | regex.Pattern[str]) -> tuple[str, ...] | None:
+        matches = safe_search(pattern, log, 1)
         if matches:
             groups: tuple[str, ...] = matches.groups()
             return groups
         else:
             return None
 
-    def match_template_with_params(self, log: str) -> tuple[str, tuple[str, ...]] | None:
-        """Return (template_string, [param1, param2, ...]) or None."""
-        s, candidates = self.manager.candidate_indices(log)
-        for i in candidates:
+    def _match(self, log: str) -> tuple[int, tuple[str, ...]] | None:
+        raw_log, log = log, _WS_RE.sub(' ', log.strip())
+        key, cached = None, None
+        if self.cache is not None:
+            key = skeleton(log)
+            if (cached := self.cache.get(key)) is not None and cached >= 0:
+                # A hit only needs the regex of the cached template and of
+                # the few templates whose match depends on the masked tokens
+                if (res := self._match_cached(raw_log, log, key, cached)) is not None:
+                    return res
+                self.cache.discard(key)
+                cached = None
+
+        s, candidates = self.manager.candidate_indices(raw_log)
+        for n, i in enumerate(candidates):
             t = self.manager.templates[i]
             if len(s) < t["min_len"]:
                 continue
-            params = self.extract_parameters(log, t["raw"])
+            params = self._search(log, self.manager.pattern(i))
             if params is not None:
                 t["count"] += 1
-                return t["raw"], params
+                if key is not None:
+                    self._remember(key, cached, log, s, i, candidates[n + 1:])
+                return i, params
         return None
 
+    def _match_cached(
+        self, raw_log: str, log: str, key: str, i: int
+    ) -> tuple[int, tuple[str, ...]] | None:
+        if (params := self._search(log, self.manager.pattern(i))) is None:
+            return None
+        # the other skeleton-safe templates did not match the cached log,
+        # so only the unsafe ones of the skeleton ahead of i may match instead
+        assert self.cache is not None
+        templates, rank = self.manager.templates, self.manager._rank
+        best, order = (i, params), (-templates[i]["count"], rank[i])
+        s, candidates = "", None
+        for u in self.cache.competitors(key):
+            if (-templates[u]["count"], rank[u]) >= order:
+                continue
+            if (u_params := self._search(log, self.manager.pattern(u))) is None:
+                continue
+            if candidates is None:
+                s, candidates = self.manager.candidate_indices(raw_log)
+            if u in candidates and len(s) >= templates[u]["min_len"]:
+                best, order = (u, u_params), (-templates[u]["count"], rank[u])
+        templates[best[0]]["count"] += 1
+        return best
+
+    def _remember(
+        self, key: str, cached: int | None, log: str, s: str, i: int, others: list[int]
+    ) -> None:
+        """Cache the template of a skeleton once it was seen twice, and only
+        if no other skeleton-safe template matches the log too. The
+        skeleton-unsafe templates that may match its other logs are cached
+        with it."""
+        assert self.cache is not None
+        if cached is None:
+            self.cache.put(key, _SEEN)
+        elif cached == _SEEN:
+            if not self._only_match(log, s, others):
+                self.cache.put(key, _AMBIGUOUS)
+                return
+            competitors = tuple(u for u in self.manager.skeleton_competitors(key) if u != i)
+            self.cache.put(key, i, competitors)
+
+    def _only_match(self, log: str, s: str, others: list[int]) -> bool:
+        # Logs matching several templates are left to the candidate order
+        unsafe = self.manager.skeleton_unsafe
+        return not any(
+            i not in unsafe
+            and len(s) >= self.manager.templates[i]["min_len"]
+            and self._search(log, self.manager.pattern(i)) is not None
+            for i in others
+        )
+
+    def match_template_with_params(self, log: str) -> tuple[str, tuple[str, ...]] | None:
+        """Return (template_string, [param1, param2, ...]) or None."""
+        if (res := self._match(log)) is None:
+            return None
+        i, params = res
+        return self.manager.templates[i]["raw"], params
+
     def __call__(self, log: str) -> Dict[str, Any]:
         """Batch matching that also returns the params list."""
         output: dict[str, Any] = {}
-        res = self.match_template_with_params(log)
+        res = self._match(log)
         if res is None:
             output["EventTemplate"] = "<Not Found>"
             output["Params"] = []
+            output["EventId"] = -1
         else:
-            tpl, params = res
-            output["EventTemplate"] = tpl
+            i, params = res
+            output["EventTemplate"] = self.manager.templates[i]["raw"]
             output["Params"] = params
-        tpl_to_id = {t["raw"]: i for i, t in enumerate(self.manager.templates)}
-        output["EventId"] = tpl_to_id.get(tpl, -1) if output["EventTemplate"] != "<Not Found>" else -1
+            output["EventId"] = self._event_ids[output["EventTemplate"]]
         return output
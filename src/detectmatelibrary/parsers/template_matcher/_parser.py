@@ -1,5 +1,11 @@
-from detectmatelibrary.parsers.template_matcher._matcher_op import TemplateMatcher, TemplateMetadata
+from detectmatelibrary.parsers.template_matcher._matcher_op import (
+    TemplateMatcher, TemplateMetadata, MatchingEngineL
+)
+from detectmatelibrary.parsers.template_matcher._index_cache import (
+    index_key, index_path, load_index, save_index
+)
 from detectmatelibrary.common.parser import CoreParser, CoreParserConfig
+from detectmatelibrary.tools.logging import logger
 from detectmatelibrary import schemas
 
 from typing import Any
@@ -113,11 +119,22 @@ class MatcherParserConfig(CoreParserConfig):
     remove_spaces: bool = True
     remove_punctuation: bool = True
     lowercase: bool = True
+    # "automaton" finds the candidates of each log with one scan over the
+    # literals of all templates, for large template sets
+    matching_engine: MatchingEngineL = "sequential"
+    # Number of log skeletons (numbers and IDs masked) whose template is
+    # cached, 0 to disable the cache
+    match_cache_size: int = 0
 
     path_templates: str | None = None
+    # Save the indexed templates next to path_templates and load them on the
+    # next start while the templates file and matching options are the same
+    template_index: bool = False
 
 
 class MatcherParser(CoreParser):
+    stateless = True
+
     def __init__(
         self,
         name: str = "MatcherParser",
@@ -129,19 +146,36 @@ class MatcherParser(CoreParser):
         super().__init__(name=name, config=config)
         self.config: MatcherParserConfig
 
-        if self.config.path_templates is not None:
-            raw_templates, eid_labels = load_templates(self.config.path_templates)
-        else:
-            raw_templates, eid_labels = [], []
-        compiled_templates, metadata = _compile_templates(raw_templates, eid_labels)
-        self.template_matcher = TemplateMatcher(
-            template_list=compiled_templates,
-            metadata=metadata,
+        options: dict[str, Any] = dict(
             remove_spaces=self.config.remove_spaces,
             remove_punctuation=self.config.remove_punctuation,
             lowercase=self.config.lowercase,
+            engine=self.config.matching_engine,
+        )
+        self.template_matcher = TemplateMatcher(
+            template_list=[], cache_size=self.config.match_cache_size, **options
         )
 
+        path, key = self.config.path_templates, None
+        if path is not None and self.config.template_index and os.path.exists(path):
+            key = index_key(path, options)
+            if (manager := load_index(index_path(path), key)) is not None:
+                self.template_matcher.set_manager(manager)
+                return
+
+        if path is not None:
+            raw_templates, eid_labels = load_templates(path)
+        else:
+            raw_templates, eid_labels = [], []
+        compiled_templates, metadata = _compile_templates(raw_templates, eid_labels)
+        self.template_matcher.set_templates(compiled_templates, metadata)
+
+        if key is not None:
+            try:
+                save_index(index_path(path), key, self.template_matcher.manager)
+            except OSError as e:
+                logger.warning(f"{self.name}: could not save the template index: {e}")
+
     def parse(
         self,
         input_: schemas.LogSchema,
@@ -153,3 +187,11 @@ class MatcherParser(CoreParser):
         output_["template"] = parsed["EventTemplate"]
         output_["variables"] = parsed["Params"]
         output_["EventID"] = parsed["EventId"]
+
+    def parse_content(self, content: str) -> tuple[str, list[str], int]:
+        """Match the content directly, unless a log_format has to split it
+        first."""
+        if self.config._regex is not None:
+            return super().parse_content(content)
+        parsed = self.template_matcher(content)
+        return parsed["EventTemplate"], list(parsed["Params"]), parsed["EventId"]
@@ -14,6 +14,8 @@ class TemplateCppTreeMatcherConfig(CoreParserConfig):
 
 
 class TemplateCppTreeMatcher(CoreParser):
+    stateless = True
+
     def __init__(
         self,
         name: str = "TreeMatcher",
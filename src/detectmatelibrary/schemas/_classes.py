@@ -20,48 +20,104 @@ def _initialize_schema(
     return _schema
 
 
+_var_names_cache: dict[op.SchemaT, set[str]] = {}
+
+
+def _get_variables_names(schema_class: op.SchemaT) -> set[str]:
+    """Return the variable names of a schema class, computed once per
+    class."""
+    if (var_names := _var_names_cache.get(schema_class)) is None:
+        var_names = set(op.get_variables_names(schema_class))
+        _var_names_cache[schema_class] = var_names
+    return var_names
+
+
 class SchemaVariables:
+    """Schema variables exposed as attributes.
+
+    By default every field is copied to a Python attribute and the protobuf
+    message is rebuilt on demand. With ``lazy=True`` the variables are read
+    from and written to a single underlying message instead, repeated and map
+    fields are returned as the live protobuf containers and only turned into
+    lists and dicts by ``as_dict``.
+    """
     def __init__(
-        self, schema_class: op.SchemaT, kwargs: dict[str, Any] | None = None
+        self,
+        schema_class: op.SchemaT,
+        kwargs: dict[str, Any] | None = None,
+        lazy: bool = False,
     ) -> None:
+        self._message: op.SchemaT | None = None
         self.schema_class = schema_class
         self.var_names: set[str]
         self.__is_list: dict[str, bool] = {}
-        self.init_schema(kwargs=kwargs)
+        self.init_schema(kwargs=kwargs, lazy=lazy)
 
     def __contains__(self, idx: str) -> bool:
         return idx in self.var_names
 
+    def __getattr__(self, name: str) -> Any:
+        # Only reached when the normal lookup fails, i.e. for lazy variables
+        message = self.__dict__.get("_message")
+        if message is not None and name in self.__dict__["var_names"]:
+            return getattr(message, name)
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        message = self.__dict__.get("_message")
+        if message is not None and name in self.__dict__["var_names"]:
+            op.set_field(schema=message, field_name=name, value=value)
+        else:
+            super().__setattr__(name, value)
+
+    @property
+    def is_lazy(self) -> bool:
+        """Check if the variables live in the underlying message."""
+        return self._message is not None
+
     def as_dict(self) -> dict[str, Any]:
         """Return the schema variables as a dictionary."""
-        return {var: getattr(self, var) for var in self.var_names}
+        if self._message is None:
+            return {var: getattr(self, var) for var in self.var_names}
+
+        result = {}
+        for var in self.var_names:
+            value = getattr(self._message, var)
+            if self.is_field_list(var):
+                value = dict(value) if op.is_map(self._message, var) else list(value)
+            result[var] = value
+        return result
 
     def get_schema(self) -> op.SchemaT:
         """Retrieve the current schema instance."""
+        if self._message is not None:
+            return self._message
         return _initialize_schema(schema_class=self.schema_class, kwargs=self.as_dict())
 
     def set_schema(self, schema: op.SchemaT) -> None:
         """Set the schema instance and update attributes."""
-        for var in self.var_names:
-            setattr(self, var, getattr(schema, var))
+        if self._message is not None:
+            self._message = schema
+            return
+        self.__dict__.update({var: getattr(schema, var) for var in self.var_names})
 
-    def init_schema(self, kwargs: dict[str, Any] | None) -> None:
+    def init_schema(self, kwargs: dict[str, Any] | None, lazy: bool = False) -> None:
         """Initialize the schema instance and set attributes."""
         _schema = _initialize_schema(schema_class=self.schema_class, kwargs=kwargs)
+        self.var_names = _get_variables_names(self.schema_class)
 
-        var_names = []
-        for var in op.get_variables_names(_schema):
-            setattr(self, var, getattr(_schema, var))
-            var_names.append(var)
-        self.var_names = set(var_names)
+        if lazy:
+            self._message = _schema
+            return
+        self._message = None
+        self.__dict__.update({var: getattr(_schema, var) for var in self.var_names})
 
     def is_field_list(self, field_name: str) -> bool:
         """Check if a field is a list."""
         if field_name in self.__is_list:  # Avoid recomputation
             return self.__is_list[field_name]
 
-        schema = self.get_schema()
-        is_list = op.is_repeated(schema=schema, field_name=field_name)
+        is_list = op.is_repeated(schema=self.schema_class, field_name=field_name)
         self.__is_list[field_name] = is_list
         return is_list
 
@@ -70,15 +126,21 @@ class BaseSchema(SchemaVariables):
     def __init__(
         self,
         schema_class: op.SchemaT = op.BASE_SCHEMA,
-        kwargs: dict[str, Any] | None = None
+        kwargs: dict[str, Any] | None = None,
+        lazy: bool = False,
     ) -> None:
-        super().__init__(schema_class=schema_class, kwargs=kwargs)
+        super().__init__(schema_class=schema_class, kwargs=kwargs, lazy=lazy)
 
     def __str__(self) -> str:
         return str(self.get_schema())
 
     def copy(self) -> "BaseSchema":
         """Create a deep copy of the schema instance."""
+        if self._message is not None:
+            return self._from_message(
+                op.copy(schema_class=self.schema_class, schema=self._message)
+            )
+
         copy_schema = op.copy(schema_class=self.schema_class, schema=self.get_schema())
         new_instance = BaseSchema(schema_class=self.schema_class)
         new_instance.set_schema(copy_schema)
@@ -104,29 +166,49 @@ class BaseSchema(SchemaVariables):
     def __eq__(self, other: object) -> bool:
         """Check equality between two schema instances."""
         if isinstance(other, BaseSchema):
+            if self.is_lazy != other.is_lazy:
+                # Eager messages mark every optional field as present
+                return self.as_dict() == other.as_dict()
             return self.get_schema() == other.get_schema()  # type: ignore
-        return False
+        # left to the other object, e.g. a CopyOnWriteSchema
+        return NotImplemented
 
     def __getitem__(self, idx: str) -> Any:
         if idx not in self:
             raise FieldNotFound(idx, self.var_names)
 
+        if self._message is not None:
+            return getattr(self._message, idx)
         return getattr(self, idx)
 
     def __setitem__(self, idx: str, value: Any) -> None:
         if idx not in self:
             raise FieldNotFound(idx, self.var_names)
 
-        return setattr(self, idx, value)
+        if self._message is not None:
+            return op.set_field(schema=self._message, field_name=idx, value=value)
+        self.__dict__[idx] = value
+
+    def _from_message(self, message: op.SchemaT) -> Self:
+        """Wrap a message in a new lazy instance of the same class, without
+        initializing a fresh message first."""
+        new_instance = object.__new__(type(self))
+        new_instance.__dict__.update(
+            _message=message,
+            schema_class=self.schema_class,
+            var_names=self.var_names,
+            _SchemaVariables__is_list=self._SchemaVariables__is_list,
+        )
+        return new_instance
 
 
 # Main schema classes ########################################
 class LogSchema(BaseSchema):
     """Log schema class."""
     def __init__(
-        self, kwargs: dict[str, Any] | None = None
+        self, kwargs: dict[str, Any] | None = None, lazy: bool = False
     ) -> None:
-        super().__init__(schema_class=op.LOG_SCHEMA, kwargs=kwargs)
+        super().__init__(schema_class=op.LOG_SCHEMA, kwargs=kwargs, lazy=lazy)
 
     def copy(self) -> "LogSchema":
         schema: LogSchema = super().copy()  # type: ignore
@@ -136,9 +218,9 @@ class LogSchema(BaseSchema):
 class ParserSchema(BaseSchema):
     """Parser schema class."""
     def __init__(
-        self, kwargs: dict[str, Any] | None = None
+        self, kwargs: dict[str, Any] | None = None, lazy: bool = False
     ) -> None:
-        super().__init__(schema_class=op.PARSER_SCHEMA, kwargs=kwargs)
+        super().__init__(schema_class=op.PARSER_SCHEMA, kwargs=kwargs, lazy=lazy)
 
     def copy(self) -> "ParserSchema":
         schema: ParserSchema = super().copy()  # type: ignore
@@ -148,9 +230,9 @@ class ParserSchema(BaseSchema):
 class DetectorSchema(BaseSchema):
     """Detector schema class."""
     def __init__(
-        self, kwargs: dict[str, Any] | None = None
+        self, kwargs: dict[str, Any] | None = None, lazy: bool = False
     ) -> None:
-        super().__init__(schema_class=op.DETECTOR_SCHEMA, kwargs=kwargs)
+        super().__init__(schema_class=op.DETECTOR_SCHEMA, kwargs=kwargs, lazy=lazy)
 
     def copy(self) -> "DetectorSchema":
         schema: DetectorSchema = super().copy()  # type: ignore
@@ -160,9 +242,9 @@ class DetectorSchema(BaseSchema):
 class AggregateSchema(BaseSchema):
     """Aggregate schema class."""
     def __init__(
-        self, kwargs: dict[str, Any] | None = None
+        self, kwargs: dict[str, Any] | None = None, lazy: bool = False
     ) -> None:
-        super().__init__(schema_class=op.AGGREGATE_SCHEMA, kwargs=kwargs)
+        super().__init__(schema_class=op.AGGREGATE_SCHEMA, kwargs=kwargs, lazy=lazy)
 
     def copy(self) -> "AggregateSchema":
         schema: AggregateSchema = super().copy()  # type: ignore
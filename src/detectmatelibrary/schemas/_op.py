@@ -40,6 +40,11 @@ def __is_repeated(field: Any) -> bool:
     return bool(field.is_repeated)
 
 
+def __is_map(field: Any) -> bool:
+    """Check if a field in the message is a map element."""
+    return field.message_type is not None and bool(field.message_type.GetOptions().map_entry)
+
+
 # Auxiliar methods *****************************************
 def is_repeated(schema: SchemaT, field_name: str) -> bool:
     """Check if a field is a repeated element."""
@@ -76,6 +81,11 @@ def get_variables_names(schema: SchemaT) -> list[str]:
     return [field.name for field in schema.DESCRIPTOR.fields]
 
 
+def is_map(schema: SchemaT, field_name: str) -> bool:
+    """Check if a field is a map element."""
+    return __is_map(schema.DESCRIPTOR.fields_by_name[field_name])
+
+
 # Main methods *****************************************
 def initialize(schema: SchemaT, **kwargs: Any) -> SchemaT:
     """Initialize a protobuf schema, it uses its arguments and the assigned
@@ -96,6 +106,29 @@ def copy(
         raise IncorrectSchema()
 
 
+def set_field(schema: SchemaT, field_name: str, value: Any) -> None:
+    """Assign a value to a field of the schema in place.
+
+    Repeated and map fields are replaced by the new content, None clears
+    the field.
+    """
+    field = schema.DESCRIPTOR.fields_by_name[field_name]
+    if value is None:
+        schema.ClearField(field_name)
+    elif __is_map(field):
+        items = dict(value)
+        container = getattr(schema, field_name)
+        container.clear()
+        container.update(items)
+    elif __is_repeated(field):
+        values = list(value)
+        container = getattr(schema, field_name)
+        del container[:]
+        container.extend(values)
+    else:
+        setattr(schema, field_name, value)
+
+
 def serialize(schema: SchemaT) -> bytes:
     return schema.SerializeToString()  # type: ignore
 
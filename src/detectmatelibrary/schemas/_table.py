@@ -0,0 +1,92 @@
+"""Columnar batches of schemas as Arrow tables.
+
+Every schema field is a column. Repeated fields are list columns and map
+fields (e.g. ``logFormatVariables``) map columns. Tables convert to Polars
+with ``polars.from_arrow``.
+"""
+import detectmatelibrary.schemas._op as op
+from detectmatelibrary.schemas._classes import BaseSchema
+
+from google.protobuf.descriptor import FieldDescriptor
+import pyarrow as pa
+
+from typing import Any, Sequence
+
+
+_ARROW_TYPES: dict[int, pa.DataType] = {
+    FieldDescriptor.CPPTYPE_INT32: pa.int32(),
+    FieldDescriptor.CPPTYPE_INT64: pa.int64(),
+    FieldDescriptor.CPPTYPE_UINT32: pa.uint32(),
+    FieldDescriptor.CPPTYPE_UINT64: pa.uint64(),
+    FieldDescriptor.CPPTYPE_DOUBLE: pa.float64(),
+    FieldDescriptor.CPPTYPE_FLOAT: pa.float32(),
+    FieldDescriptor.CPPTYPE_BOOL: pa.bool_(),
+    FieldDescriptor.CPPTYPE_STRING: pa.string(),
+}
+_arrow_schemas: dict[op.SchemaT, pa.Schema] = {}
+
+
+def arrow_schema(schema_class: op.SchemaT) -> pa.Schema:
+    """Arrow schema of the columns of a protobuf schema class."""
+    if (schema := _arrow_schemas.get(schema_class)) is not None:
+        return schema
+
+    fields = []
+    for field in schema_class.DESCRIPTOR.fields:
+        if op.is_map(schema_class, field.name):
+            key, value = field.message_type.fields_by_name["key"], field.message_type.fields_by_name["value"]
+            type_ = pa.map_(_ARROW_TYPES[key.cpp_type], _ARROW_TYPES[value.cpp_type])
+        elif field.is_repeated:
+            type_ = pa.list_(_ARROW_TYPES[field.cpp_type])
+        else:
+            type_ = _ARROW_TYPES[field.cpp_type]
+        fields.append(pa.field(field.name, type_))
+
+    _arrow_schemas[schema_class] = schema = pa.schema(fields)
+    return schema
+
+
+def _column(schemas: Sequence[Any], name: str, type_: pa.DataType) -> pa.Array:
+    values = [schema[name] for schema in schemas]
+    if pa.types.is_map(type_):
+        values = [list(value.items()) for value in values]
+    elif pa.types.is_list(type_):
+        values = [list(value) for value in values]
+    return pa.array(values, type=type_)
+
+
+def to_table(schemas: Sequence[BaseSchema], columns: Sequence[str] | None = None) -> pa.Table:
+    """Convert a list of schemas of the same class to an Arrow table.
+
+    With ``columns`` only these fields are converted.
+    """
+    if not schemas:
+        raise ValueError("Can not build a table without schemas")
+    schema = arrow_schema(schemas[0].schema_class)
+    if columns is not None:
+        schema = pa.schema([schema.field(name) for name in columns])
+
+    return pa.Table.from_arrays(
+        [_column(schemas, field.name, field.type) for field in schema], schema=schema
+    )
+
+
+def from_table(table: pa.Table, schema_type: type[BaseSchema]) -> list[BaseSchema]:
+    """Convert an Arrow table back to a list of schemas, null fields are
+    left unset.
+
+    The values are converted column by column and only then zipped into
+    the rows.
+    """
+    columns = []
+    for name in table.column_names:
+        values = table.column(name).to_pylist()
+        if pa.types.is_map(table.schema.field(name).type):
+            values = [None if value is None else dict(value) for value in values]
+        columns.append(values)
+
+    names = table.column_names
+    return [
+        schema_type({name: value for name, value in zip(names, row) if value is not None})
+        for row in zip(*columns)
+    ]
@@ -3,6 +3,10 @@ class SimpleIDGenerator:
         self.current_id = start_id - 1
         self.prefix = "" if prefix == "" else prefix + "_"
 
+    def reset(self, start_id: int) -> None:
+        """Make `start_id` the next ID."""
+        self.current_id = start_id - 1
+
     def __call__(self) -> str:
         self.current_id += 1
         return f"{self.prefix}{self.current_id}"
@@ -2,14 +2,57 @@ from collections.abc import Mapping, Sequence
 from typing import Any
 
 
+# values never searched, checked before the slower abstract classes
+_LEAVES = (str, int, float, type(None), bytes, bytearray)
+
+
+class FieldPath:
+    """Compiled dot-separated path of a field, as the keys of flatten_dict.
+
+    A step into a list is taken as its index.
+    """
+    def __init__(self, path: str, sep: str = '.') -> None:
+        self.path = path
+        self._steps = [(step, int(step) if step.isdecimal() else None) for step in path.split(sep)]
+
+    def get(self, obj: Any) -> Any:
+        """The value at the path, KeyError if the object has none."""
+        cur = obj
+        for key, index in self._steps:
+            if isinstance(cur, Mapping):
+                cur = cur[key]
+            elif isinstance(cur, list) and index is not None and index < len(cur):
+                cur = cur[index]
+            else:
+                raise KeyError(self.path)
+        return cur
+
+    def keys(self, obj: Any) -> list[str | int]:
+        """The keys/indices of the path in obj, KeyError if it has none."""
+        path: list[str | int] = []
+        cur = obj
+        for key, index in self._steps:
+            if isinstance(cur, Mapping):
+                cur = cur[key]
+                path.append(key)
+            elif isinstance(cur, list) and index is not None and index < len(cur):
+                cur = cur[index]
+                path.append(index)
+            else:
+                raise KeyError(self.path)
+        return path
+
+
 class KeyExtractor:
     """Efficient extractor for a key in nested dict/list JSON-like objects.
 
     Caches the path of the first occurrence to speed up future lookups.
+    With a given dot-separated path, only that path is looked up.
     """
-    def __init__(self, key_substr: str = "time") -> None:
+    def __init__(self, key_substr: str = "time", path: str | None = None) -> None:
         self.key_substr = key_substr.lower()
         self._cached_path: list[str | int] | None = None  # list of keys/indices
+        self._path = None if path is None else FieldPath(path)
 
     def _get_by_path(self, obj: dict[str, Any], path: list[str | int]) -> Any:
         """Follow the cached path in the given object."""
@@ -24,20 +67,34 @@ class KeyExtractor:
         Returns the path as a list of keys/indices, or None if not
         found.
         """
-        stack: list[tuple[Any, list[str | int]]] = [(root, [])]
+        # only containers are pushed, with the (parent, key) link of their
+        # path, which is built once a key is found
+        stack: list[tuple[Any, Any]] = [] if isinstance(root, _LEAVES) else [(root, None)]
+        key_substr = self.key_substr
         while stack:
-            current, path = stack.pop()
+            current, link = stack.pop()
             if isinstance(current, Mapping):
                 for k, v in current.items():
-                    if self.key_substr in str(k).lower():
+                    if key_substr in (k if isinstance(k, str) else str(k)).lower():
                         # path to the VALUE of this key
-                        return path + [k]
-                    stack.append((v, path + [k]))
-            elif isinstance(current, Sequence) and not isinstance(current, (str, bytes, bytearray)):
+                        return self._unlink((link, k))
+                    if not isinstance(v, _LEAVES) and isinstance(v, (Mapping, Sequence)):
+                        stack.append((v, (link, k)))
+            else:
                 for idx, item in enumerate(current):
-                    stack.append((item, path + [idx]))
+                    if not isinstance(item, _LEAVES) and isinstance(item, (Mapping, Sequence)):
+                        stack.append((item, (link, idx)))
         return None
 
+    @staticmethod
+    def _unlink(link: Any) -> list[str | int]:
+        path: list[str | int] = []
+        while link is not None:
+            link, key = link
+            path.append(key)
+        path.reverse()
+        return path
+
     def _del_by_path(self, obj: dict[str, Any], path: list[str | int]) -> None:
         """Delete the value at the given path from obj.
 
@@ -76,6 +133,16 @@ class KeyExtractor:
         :return: value or (value, path) or (None / (None, None)) if not
             found
         """
+        if self._path is not None:
+            try:
+                keys = self._path.keys(obj)
+            except KeyError:
+                return (None, None) if return_path else None
+            value = self._get_by_path(obj, keys)
+            if delete:
+                self._del_by_path(obj, keys)
+            return (value, keys) if return_path else value
+
         path = self._cached_path
 
         # 1. Try cached path first
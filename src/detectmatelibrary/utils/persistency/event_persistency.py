@@ -67,6 +67,20 @@ class EventPersistency:
         for _cb in self._on_ingest_callbacks:
             _cb()
 
+    def set_event_template(self, event_id: int | str, event_template: str) -> None:
+        """Set the template of an event without ingesting data.
+
+        The templates are kept in the order they were last set.
+        """
+        with self._lock:
+            self.event_templates.pop(event_id, None)
+            self.event_templates[event_id] = event_template
+
+    def remove_event_template(self, event_id: int | str) -> None:
+        """Remove the template of an event, the event stays seen."""
+        with self._lock:
+            self.event_templates.pop(event_id, None)
+
     @property
     def events_since_save(self) -> int:
         """Number of events ingested since the last successful save."""
@@ -1,5 +1,143 @@
 import re
+import time
+import calendar
 from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Iterable
+
+import numpy as np
+
+
+# Fields of the strptime directives the compiled parsers support, as the
+# regexes of the standard library's _strptime
+_MONTHS = {name.lower(): i for i, name in enumerate(calendar.month_abbr) if name}
+_DIRECTIVES = {
+    "Y": r"(?P<Y>\d\d\d\d)",
+    "m": r"(?P<m>1[0-2]|0[1-9]|[1-9])",
+    "d": r"(?P<d>3[01]|[12]\d|0[1-9]|[1-9]| [1-9])",
+    "H": r"(?P<H>2[0-3]|[0-1]\d|\d)",
+    "M": r"(?P<M>[0-5]\d|\d)",
+    "S": r"(?P<S>6[0-1]|[0-5]\d|\d)",
+    "f": r"(?P<f>[0-9]{1,6})",
+    "z": r"(?P<z>[+-]\d\d:?[0-5]\d(?::?[0-5]\d(?:\.\d{1,6})?)?|(?-i:Z))",
+    "b": "(?P<b>" + "|".join(map(re.escape, _MONTHS)) + ")",
+}
+_DIRECTIVE_RE = re.compile(r"%(.?)|\s+|[^%\s]+")
+_SYSLOG_FORMAT = "%b %d %H:%M:%S"
+# epoch seconds, with the ":<serial>" of audit stamps such as 1642726457.339:397
+_EPOCH_RE = re.compile(r"(\d+)(?:\.\d+(?::\d+)?)?")
+# strings of the same shape with all digits 1 are valid values for every
+# supported format, see TimeFormatHandler._unparseable
+_CANONICAL = str.maketrans("0123456789", "1111111111")
+
+
+class _CurrentYear:
+    """The current year, looked up again once the year is over."""
+    def __init__(self) -> None:
+        self._year, self._until = 0, 0.
+
+    def get(self) -> int:
+        if (now := time.time()) >= self._until:
+            self._year = datetime.fromtimestamp(now).year
+            self._until = datetime(self._year + 1, 1, 1).timestamp()
+        return self._year
+
+
+_current_year = _CurrentYear()
+
+
+class CompiledTimeFormat:
+    """Parser of one strptime format into unix seconds, as
+    ``datetime.strptime`` with the timestamp of a naive result taken as UTC.
+
+    The format is compiled to a single regex. The seconds of the date and
+    time fields are memoised, so logs of the same second only pay the
+    regex match.
+    """
+    MEMO_SIZE = 1 << 16
+
+    def __init__(self, fmt: str, regex: re.Pattern[str], current_year: bool = False) -> None:
+        self.format = fmt
+        self._regex = regex
+        self._current_year = current_year
+        # the date and time fields, the memo key
+        self._fields = tuple(name for name in "YmbdHMS" if name in regex.groupindex)
+        self._fraction = regex.groupindex.get("f")
+        self._zone = regex.groupindex.get("z")
+        self._memo: dict[Any, int | None] = {}
+        self._offsets: dict[str, int | None] = {}
+
+    def __call__(self, time_str: str) -> int | None:
+        if (match := self._regex.fullmatch(time_str)) is None:
+            return None
+        key: Any = match.group(*self._fields) if self._fields else ()
+        if self._current_year:
+            key = (_current_year.get(), key)
+        try:
+            seconds = self._memo[key]
+        except KeyError:
+            if len(self._memo) >= self.MEMO_SIZE:
+                self._memo.clear()
+            seconds = self._memo[key] = self._seconds(key)
+        if seconds is None:
+            return None
+
+        if self._zone is not None and (zone := match.group(self._zone)) is not None:
+            if (offset := self._offset(zone)) is None:
+                return None
+            seconds -= offset
+        # int() of the datetime timestamp truncates towards zero
+        if seconds < 0 and self._fraction is not None and int(match.group(self._fraction)):
+            seconds += 1
+        return seconds
+
+    def _seconds(self, key: Any) -> int | None:
+        if self._current_year:
+            year, key = key
+        values = dict(zip(self._fields, (key,) if isinstance(key, str) else key))
+        if self._current_year:
+            values["Y"] = year
+        try:
+            dt = datetime(
+                int(values.get("Y", 1900)),
+                _MONTHS[values["b"].lower()] if "b" in values else int(values.get("m", 1)),
+                int(values.get("d", 1)), int(values.get("H", 0)), int(values.get("M", 0)),
+                int(values.get("S", 0)),
+                tzinfo=timezone.utc,
+            )
+        except ValueError:
+            return None
+        return int(dt.timestamp())
+
+    def _offset(self, zone: str) -> int | None:
+        """Seconds of a %z offset, None if out of range."""
+        if zone not in self._offsets:
+            try:
+                dt = datetime.strptime(zone, "%z")
+                self._offsets[zone] = int(dt.utcoffset().total_seconds())  # type: ignore[union-attr]
+            except ValueError:
+                self._offsets[zone] = None
+        return self._offsets[zone]
+
+
+@lru_cache(maxsize=256)
+def compile_time_format(fmt: str) -> CompiledTimeFormat | None:
+    """The compiled parser of a format, None if it has directives the
+    compiled parsers do not support (these are parsed with strptime)."""
+    parts, seen = [], set()
+    for match in _DIRECTIVE_RE.finditer(fmt):
+        directive = match.group(1)
+        if directive is None:
+            text = match.group()
+            parts.append(r"\s+" if text.isspace() else re.escape(text))
+        elif directive in _DIRECTIVES and directive not in seen:
+            parts.append(_DIRECTIVES[directive])
+            seen.add(directive)
+        else:
+            return None
+    return CompiledTimeFormat(
+        fmt, re.compile("".join(parts), re.IGNORECASE), current_year=fmt == _SYSLOG_FORMAT,
+    )
 
 
 class TimeFormatHandler:
@@ -26,32 +164,48 @@ class TimeFormatHandler:
         "%H:%M:%S",
         "%A, %B %d, %Y %H:%M:%S",  # "Wednesday, March 4, 2026 14:18:00"
     ]
+    # Shapes of strings no format can parse, kept at most
+    UNPARSEABLE_SIZE = 4096
 
     def __init__(self) -> None:
         """Initialize the TimeFormatHandler with an empty format cache."""
+        # detected format per source, "last_format" if none is given
         self._format_cache: dict[str, str] = {}
+        self._unparseable: set[str] = set()
 
     def _to_unix(self, dt: datetime) -> str:
         """Convert datetime to unix timestamp string."""
+        return str(self._to_seconds(dt))
+
+    @staticmethod
+    def _to_seconds(dt: datetime) -> int:
+        """Convert datetime to unix seconds."""
         if dt.tzinfo is None:
             dt = dt.replace(tzinfo=timezone.utc)
-        return str(int(dt.timestamp()))
+        return int(dt.timestamp())
 
-    def _parse_with_format(self, time_str: str, fmt: str) -> str | None:
-        """Parse time string with given format and return unix timestamp."""
-        try:
-            # handle syslog-like formats that lack a year by prepending the current year
-            if fmt == "%b %d %H:%M:%S" and re.match(r"^[A-Za-z]{3} \d{1,2} ", time_str):
-                year = datetime.now().year
-                dt = datetime.strptime(f"{year} {time_str}", f"%Y {fmt}")
-            else:
-                dt = datetime.strptime(time_str, fmt)
-            self._format_cache["last_format"] = fmt
-            return self._to_unix(dt)
-        except ValueError:
-            return None
+    def _parse_with_format(
+        self, time_str: str, fmt: str, source: str = "last_format", remember: bool = True
+    ) -> int | None:
+        """Parse time string with given format and return unix seconds.
+
+        The format is cached for the source on success, unless remember
+        is False.
+        """
+        if (compiled := compile_time_format(fmt)) is not None:
+            seconds = compiled(time_str)
+        else:
+            try:
+                seconds = self._to_seconds(datetime.strptime(time_str, fmt))
+            except ValueError:
+                seconds = None
+        if seconds is not None and remember:
+            self._format_cache[source] = fmt
+        return seconds
 
-    def parse_timestamp(self, time_str: str, time_format: str | None = None) -> str:
+    def parse_timestamp(
+        self, time_str: str, time_format: str | None = None, source: str = "last_format"
+    ) -> str:
         """Convert time_str to a unix timestamp string (seconds since epoch).
 
         If time_format is provided, try that first. Otherwise, attempt a series
@@ -62,38 +216,82 @@ class TimeFormatHandler:
         Args:
             time_str: The timestamp string to parse
             time_format: Optional explicit format string to use
+            source: Key of the detected format, for handlers shared by
+                sources with different formats
 
         Returns:
             Unix timestamp as string, or "0" if parsing fails
         """
-        if not time_str:
-            return "0"
+        return str(self.parse_seconds(time_str, time_format, source))
 
-        cache_key = "last_format"
+    def parse_seconds(
+        self, time_str: str, time_format: str | None = None, source: str = "last_format"
+    ) -> int:
+        """``parse_timestamp`` as an int."""
+        if not time_str:
+            return 0
 
         # 1) Try cached format (if no explicit format requested)
         if not time_format:
-            cached_format = self._format_cache.get(cache_key)
+            cached_format = self._format_cache.get(source)
             if cached_format:
-                ts = self._parse_with_format(time_str, cached_format)
+                ts = self._parse_with_format(time_str, cached_format, source)
                 if ts is not None:
                     return ts
 
         # 2) Try caller-provided explicit format
         if time_format:
-            ts = self._parse_with_format(time_str, time_format)
+            ts = self._parse_with_format(time_str, time_format, source)
             if ts is not None:
                 return ts
 
+        # 3) and 4) epoch and ISO strings
+        if (ts := self._parse_builtin(time_str)) is not None:
+            return ts
+
+        # 5) Try the list of common formats, unless a string of the same
+        # shape matched none of them
+        canonical = time_str.translate(_CANONICAL)
+        if canonical in self._unparseable:
+            return 0
+        if (ts := self._parse_common(time_str, source=source)) is not None:
+            return ts
+        # the values of the string may be out of range, but if a string of
+        # the same shape with valid values fails too, so does every string
+        # of that shape
+        if self._parse_builtin(canonical) is None and self._parse_common(canonical, remember=False) is None:
+            if len(self._unparseable) >= self.UNPARSEABLE_SIZE:
+                self._unparseable.clear()
+            self._unparseable.add(canonical)
+
+        # 6) Nothing matched
+        return 0
+
+    def parse_timestamps(
+        self, time_strs: Iterable[str], time_format: str | None = None, source: str = "last_format"
+    ) -> np.ndarray:
+        """Convert a column of time strings to an int64 array of unix
+        seconds, 0 where parsing fails."""
+        seen: dict[str, int] = {}
+        parse = self.parse_seconds
+
+        def _seconds(time_str: str) -> int:
+            if (seconds := seen.get(time_str)) is None:
+                seconds = seen[time_str] = parse(time_str, time_format, source)
+            return seconds
+
+        return np.fromiter(map(_seconds, time_strs), dtype=np.int64)
+
+    def _parse_builtin(self, time_str: str) -> int | None:
         # 3) Numeric epoch (seconds, milliseconds, microseconds or nanoseconds)
-        if re.fullmatch(r"\d+(?:\.\d+)?", time_str):
+        if epoch := _EPOCH_RE.fullmatch(time_str):
             try:
-                val = int(time_str.split(".", 1)[0])
+                val = int(epoch.group(1))
                 # Fold sub-second units until the value is a plausible seconds epoch.
                 # 100_000_000_000 seconds is the year 5138, so anything above that is ms/us/ns.
                 while val > 100_000_000_000:
                     val //= 1000
-                return str(val)
+                return val
             except (ValueError, OverflowError):
                 pass
 
@@ -101,19 +299,20 @@ class TimeFormatHandler:
         try:
             iso_str = time_str[:-1] + "+00:00" if time_str.endswith("Z") else time_str
             dt = datetime.fromisoformat(iso_str)
-            return self._to_unix(dt)
+            return self._to_seconds(dt)
         except (ValueError, TypeError):
-            pass
+            return None
 
-        # 5) Try the list of common formats
+    def _parse_common(
+        self, time_str: str, source: str = "last_format", remember: bool = True
+    ) -> int | None:
         for fmt in self.COMMON_TIME_FORMATS:
-            ts = self._parse_with_format(time_str, fmt)
+            ts = self._parse_with_format(time_str, fmt, source, remember)
             if ts is not None:
                 return ts
-
-        # 6) Nothing matched
-        return "0"
+        return None
 
     def clear_cache(self) -> None:
         """Clear the format cache."""
         self._format_cache.clear()
+        self._unparseable.clear()
@@ -31,7 +31,8 @@ default_args = {
     "start_id": 10,
     "data_use_training": None,
     "data_use_configure": None,
-    "use_config_data_as_training": True
+    "use_config_data_as_training": True,
+    "copy_input": "always",
 }
 
 
@@ -529,3 +530,93 @@ class TestCoreComponentContextManager:
         with component:
             pass
         assert stopped["called"]
+
+
+class MockComponentBatch(CoreComponent):
+    def __init__(self, name: str, config: CoreConfig = CoreConfig()) -> None:
+        super().__init__(
+            name=name,
+            type_="Dummy",
+            config=config,
+            input_schema=schemas.LogSchema,
+            output_schema=schemas.LogSchema,
+        )
+        self.calls: list = []
+        self.batches: list = []
+
+    def configure(self, input_) -> None:
+        self.calls.append(("configure", input_["logID"]))
+
+    def set_configuration(self) -> None:
+        self.calls.append(("set_configuration", None))
+
+    def train(self, input_) -> None:
+        self.calls.append(("train", input_["logID"]))
+
+    def post_train(self) -> None:
+        self.calls.append(("post_train", None))
+
+    def run(self, input_, output_) -> bool:
+        self.calls.append(("run", input_["logID"]))
+        output_["logID"] = input_["logID"]
+        return int(input_["logID"]) % 2 == 0
+
+    def run_batch(self, input_, output_) -> list[bool]:
+        self.batches.append([i["logID"] for i in input_])
+        return super().run_batch(input_=input_, output_=output_)
+
+
+class TestProcessBatch:
+    config = CoreConfig(data_use_configure=2, data_use_training=3, use_config_data_as_training=True)
+
+    def test_same_as_process(self) -> None:
+        logs = [_make_log(i) for i in range(10)]
+        single = MockComponentBatch(name="Single", config=self.config)
+        batch = MockComponentBatch(name="Batch", config=self.config)
+
+        expected = [out for log in logs if (out := single.process(log)) is not None]
+        results = batch.process_batch(logs)
+
+        assert results == expected
+        assert batch.calls == single.calls
+        assert batch.get_state() == single.get_state()
+
+    def test_split_at_phase_boundaries(self) -> None:
+        component = MockComponentBatch(name="Batch", config=self.config)
+        component.process_batch([_make_log(i) for i in range(10)])
+
+        # 0-1 configure, 2-4 train, 5 finishes training, then 6-9 in one batch
+        assert component.batches == [["2"], ["3"], ["4"], ["5", "6", "7", "8", "9"]]
+
+    def test_split_over_several_batches(self) -> None:
+        logs = [_make_log(i) for i in range(10)]
+        single = MockComponentBatch(name="Single", config=self.config)
+        batch = MockComponentBatch(name="Batch", config=self.config)
+
+        expected = [out for log in logs if (out := single.process(log)) is not None]
+        results = batch.process_batch(logs[:3]) + batch.process_batch(logs[3:])
+
+        assert results == expected
+        assert batch.calls == single.calls
+
+    def test_bytes(self) -> None:
+        component = MockComponentBatch(name="Batch")
+        results = component.process_batch([_make_log(i).serialize() for i in range(4)])
+
+        assert len(results) == 2
+        assert all(isinstance(result, bytes) for result in results)
+
+        output_ = schemas.LogSchema()
+        output_.deserialize(results[1])
+        assert output_["logID"] == "2"
+
+    def test_with_buffer(self) -> None:
+        single = DummyComponentWithBuffer(name="Single", size=3)
+        batch = DummyComponentWithBuffer(name="Batch", size=3)
+        logs = [_make_log(i) for i in range(7)]
+
+        expected = [out for log in logs if (out := single.process(log)) is not None]
+        assert batch.process_batch(logs) == expected
+
+    def test_empty(self) -> None:
+        assert MockComponentBatch(name="Batch").process_batch([]) == []
@@ -0,0 +1,96 @@
+from detectmatelibrary.detectors.value_range_detector import ValueRangeDetector
+from detectmatelibrary.detectors.new_value_detector import NewValueDetector
+from detectmatelibrary.detectors.charset_detector import CharsetDetector
+from detectmatelibrary.parsers.template_matcher import MatcherParser
+from detectmatelibrary._testutils.dummy_detector import DummyDetector
+from detectmatelibrary.common._core_op._fit_logic import EnumState
+from detectmatelibrary.helper.from_to import From
+from detectmatelibrary.utils.aux import time_test_mode
+from tests.test_data import AUDIT_LOG, TRAIN_UNTIL
+from tests.test_detectors.test_value_range_detector import _PARSER_CONFIG
+
+import pytest
+
+
+time_test_mode()
+
+
+@pytest.fixture(scope="module")
+def parsed_logs() -> list:
+    return list(From.log(MatcherParser(config=_PARSER_CONFIG), in_path=AUDIT_LOG, do_process=True))
+
+
+def _global_config(name: str, method_type: str) -> dict:
+    return {
+        "detectors": {
+            name: {
+                "method_type": method_type,
+                "auto_config": False,
+                "params": {},
+                "global": {"test": {"header_variables": [{"pos": "Type"}, {"pos": "Time"}]}},
+            }
+        }
+    }
+
+
+def trained(detector, logs):
+    """Configure and train through process, then stay in detection."""
+    detector.fitlogic.config_state.current = EnumState.KEEP
+    for log in logs:
+        detector.process(log)
+    detector.fitlogic.config_state.current = EnumState.STOP
+
+    detector.fitlogic.train_state.current = EnumState.KEEP
+    for log in logs:
+        detector.process(log)
+    detector.fitlogic.train_state.current = EnumState.STOP
+    detector.process(logs[0])
+    return detector
+
+
+DETECTORS = [
+    lambda: NewValueDetector(),
+    lambda: ValueRangeDetector(),
+    lambda: CharsetDetector(),
+    lambda: NewValueDetector(config=_global_config("NewValueDetector", "new_value_detector")),
+    lambda: CharsetDetector(config=_global_config("CharsetDetector", "charset_detector")),
+]
+
+
+class TestDetectBatch:
+    @pytest.mark.parametrize("make_detector", DETECTORS)
+    def test_same_alerts_as_process(self, make_detector, parsed_logs) -> None:
+        detector = trained(make_detector(), parsed_logs[:TRAIN_UNTIL])
+        batch_detector = trained(make_detector(), parsed_logs[:TRAIN_UNTIL])
+
+        detected = [
+            alert for log in parsed_logs[TRAIN_UNTIL:] if (alert := detector.process(log)) is not None
+        ]
+        assert batch_detector.process_batch(parsed_logs[TRAIN_UNTIL:]) == detected
+        assert len(detected) > 0
+
+    @pytest.mark.parametrize("make_detector", DETECTORS)
+    def test_detect_only_candidates(self, make_detector, parsed_logs, monkeypatch) -> None:
+        detector = trained(make_detector(), parsed_logs[:TRAIN_UNTIL])
+        calls = []
+        detect = detector.detect
+        monkeypatch.setattr(detector, "detect", lambda **kwargs: calls.append(1) or detect(**kwargs))
+
+        alerts = detector.process_batch(parsed_logs[TRAIN_UNTIL:])
+        assert len(alerts) <= len(calls) < len(parsed_logs) - TRAIN_UNTIL
+
+    def test_opt_in(self, parsed_logs) -> None:
+        detector = DummyDetector()
+        assert not detector.batch_detection
+
+        reference = DummyDetector()
+        expected = [reference.process(log) for log in parsed_logs[:10]]
+        assert detector.process_batch(parsed_logs[:10]) == [a for a in expected if a is not None]
+
+    def test_default_detect_batch(self, parsed_logs) -> None:
+        detector = DummyDetector()
+        detector.batch_detection = True
+
+        reference = DummyDetector()
+        expected = [reference.process(log) for log in parsed_logs[:10]]
+        assert detector.process_batch(parsed_logs[:10]) == [a for a in expected if a is not None]
@@ -0,0 +1,93 @@
+"""Per record cost of the output fields of CoreDetector.run that are only
+filled for alerts, for every built-in detector on audit.log.
+
+Run on demand with ``pytest tests/test_common/test_detector_benchmark.py
+--run-ignored -s``.
+"""
+from detectmatelibrary.common.detector import CoreDetector, _extract_logIDs, _extract_timestamp, _time_handler
+from detectmatelibrary.detectors.bigram_frequency_detector import BigramFrequencyDetector
+from detectmatelibrary.detectors.charset_detector import CharsetDetector
+from detectmatelibrary.detectors.ecvc_detector import ECVCDetector
+from detectmatelibrary.detectors.event_sequence_detector import EventSequenceDetector
+from detectmatelibrary.detectors.new_event_detector import NewEventDetector
+from detectmatelibrary.detectors.new_value_combo_detector import NewValueComboDetector
+from detectmatelibrary.detectors.new_value_detector import NewValueDetector
+from detectmatelibrary.detectors.rule_detector import RuleDetector
+from detectmatelibrary.detectors.scvs_detector import SCVSDetector
+from detectmatelibrary.detectors.value_range_detector import ValueRangeDetector
+from detectmatelibrary.parsers.template_matcher import MatcherParser
+from detectmatelibrary.helper.from_to import From
+from detectmatelibrary.utils.aux import get_timestamp, time_test_mode
+from tests.test_data import AUDIT_LOG, AUDIT_PARSER_CONFIG
+
+from time import perf_counter
+from typing import Any
+
+import pytest
+
+
+time_test_mode()
+
+DETECTORS: list[type[CoreDetector]] = [
+    BigramFrequencyDetector, CharsetDetector, ECVCDetector, EventSequenceDetector, NewEventDetector,
+    NewValueComboDetector, NewValueDetector, RuleDetector, SCVSDetector, ValueRangeDetector,
+]
+
+
+def _eager(detector: type[CoreDetector]) -> type[CoreDetector]:
+    """The detector filling the fields of every record before detect, as
+    run did before, and not again for alerts."""
+    def run(self: CoreDetector, input_: Any, output_: Any) -> bool:
+        inputs = input_ if isinstance(input_, list) else [input_]
+        output_["logIDs"] = _extract_logIDs(input_)
+        output_["extractedTimestamps"] = [
+            _time_handler.parse_seconds(i["logFormatVariables"]["Time"]) for i in inputs
+        ]
+        return detector.run(self, input_=input_, output_=output_)  # type: ignore[call-arg]
+
+    def _set_alert(self: CoreDetector, input_: Any, output_: Any) -> None:
+        output_["alertID"] = str(self.id_generator())
+        output_["detectionTimestamp"] = get_timestamp()
+
+    return type(f"Eager{detector.__name__}", (detector,), {"run": run, "_set_alert": _set_alert})
+
+
+def _run(detector: CoreDetector, parsed: list) -> tuple[int, float]:
+    start = perf_counter()
+    alerts = sum(detector.process(p) is not None for p in parsed)
+    return alerts, perf_counter() - start
+
+
+@pytest.mark.ignored
+def test_alert_only_fields() -> None:
+    logs = list(From.log(None, in_path=AUDIT_LOG, do_process=False))  # type: ignore
+    parsed = MatcherParser(config=AUDIT_PARSER_CONFIG).process_batch(logs)
+
+    print()
+    for detector in DETECTORS:
+        # warm up both, the timestamp memo and the imports of detect
+        _run(detector(), parsed)
+        _run(_eager(detector)(), parsed)
+
+        alerts, lazy = _run(detector(), parsed)
+        eager_alerts, eager = _run(_eager(detector)(), parsed)
+        assert alerts == eager_alerts
+        print(
+            f"{detector.__name__:24} {alerts:5} alerts, "
+            f"{eager / len(parsed) * 1e6:6.2f} -> {lazy / len(parsed) * 1e6:6.2f} us/log"
+        )
+
+
+@pytest.mark.ignored
+def test_parsed_epoch() -> None:
+    # the Time of parsers with a time_format is already in unix seconds
+    records = [{"logFormatVariables": {"Time": str(1642723741 + i % 3600)}} for i in range(100_000)]
+
+    start = perf_counter()
+    seconds = [_time_handler.parse_seconds(r["logFormatVariables"]["Time"]) for r in records]
+    parse = perf_counter() - start
+    start = perf_counter()
+    assert _extract_timestamp(records) == seconds  # type: ignore[arg-type]
+    fast = perf_counter() - start
+
+    print(f"\nparsed epoch: {parse / len(records) * 1e6:.2f} -> {fast / len(records) * 1e6:.2f} us/log")
@@ -89,4 +89,32 @@ class TestFinishTraining:
         logic.update_state("keep_training")
         assert not logic.finish_training()
         logic.update_state("stop_training")
-        assert logic.finish_training()
\ No newline at end of file
+        assert logic.finish_training()
+
+
+class TestIsSettled:
+    def test_settled_without_fit(self) -> None:
+        logic = FitLogic(data_use_configure=None, data_use_training=None)
+        assert logic.is_settled()
+
+    def test_settled_after_finish(self) -> None:
+        logic = FitLogic(data_use_configure=1, data_use_training=2)
+        settled = []
+        for _ in range(6):
+            settled.append(logic.is_settled())
+            logic.run()
+            logic.finish_config()
+            logic.finish_training()
+        # configure, train, train, finish training, then nothing left to do
+        assert settled == [False, False, False, False, True, True]
+
+    def test_not_settled_when_forced(self) -> None:
+        logic = FitLogic(data_use_configure=None, data_use_training=None)
+        logic.update_state("keep_training")
+        assert not logic.is_settled()
+
+        logic.update_state("stop_training")
+        assert not logic.is_settled()
+        logic.run()
+        logic.finish_training()
+        assert logic.is_settled()
@@ -0,0 +1,142 @@
+from detectmatelibrary.common._core_op._schema_pipeline import SchemaPipeline, CopyOnWriteSchema
+from detectmatelibrary.common.core import CoreComponent, CoreConfig
+from detectmatelibrary.utils.data_buffer import ArgsBuffer, BufferMode
+from detectmatelibrary.schemas import LogSchema, ParserSchema, FieldNotFound
+
+import pytest
+
+
+def _make_parsed() -> ParserSchema:
+    return ParserSchema({
+        "EventID": 1,
+        "variables": ["a", "b"],
+        "logFormatVariables": {"Time": "0"},
+    })
+
+
+class TestCopyOnWriteSchema:
+    def test_read_without_copy(self) -> None:
+        schema = _make_parsed()
+        view = CopyOnWriteSchema(schema)
+
+        assert view["EventID"] == 1
+        assert view.EventID == 1
+        assert view["variables"] == ("a", "b")
+        assert view["logFormatVariables"]["Time"] == "0"
+        assert "variables" in view
+        assert view == schema and schema == view
+        assert view != ParserSchema() and ParserSchema() != view
+        assert view._schema is schema
+
+    def test_containers_are_read_only(self) -> None:
+        view = CopyOnWriteSchema(_make_parsed())
+
+        with pytest.raises(AttributeError):
+            view["variables"].append("c")
+        with pytest.raises(TypeError):
+            view["logFormatVariables"]["Time"] = "1"
+
+    def test_copy_on_write(self) -> None:
+        schema = _make_parsed()
+        view = CopyOnWriteSchema(schema)
+
+        view["EventID"] = 2
+        view.template = "new template"
+        view["variables"].append("c")
+
+        assert view["EventID"] == 2
+        assert view["template"] == "new template"
+        assert view["variables"] == ["a", "b", "c"]
+        assert schema["EventID"] == 1
+        assert schema["template"] == ""
+        assert schema["variables"] == ["a", "b"]
+
+    def test_field_not_found(self) -> None:
+        view = CopyOnWriteSchema(LogSchema())
+
+        with pytest.raises(FieldNotFound):
+            view["logFormatVariables"]
+        with pytest.raises(FieldNotFound):
+            view["unknown"] = 1
+
+    def test_delegates_methods(self) -> None:
+        schema = _make_parsed()
+        view = CopyOnWriteSchema(schema)
+
+        assert view.serialize() == schema.serialize()
+        assert view.copy() == schema
+        assert str(view) == str(schema)
+
+
+class TestSchemaPipeline:
+    def test_preprocess_copy(self) -> None:
+        schema = LogSchema({"log": "test"})
+        is_byte, data = SchemaPipeline.preprocess(LogSchema, schema)
+
+        assert not is_byte
+        assert data == schema
+        assert data is not schema
+
+    def test_preprocess_on_write(self) -> None:
+        schema = LogSchema({"log": "test"})
+        is_byte, data = SchemaPipeline.preprocess(LogSchema, schema, copy_input="on_write")
+
+        assert not is_byte
+        assert isinstance(data, CopyOnWriteSchema)
+
+    def test_preprocess_bytes(self) -> None:
+        schema = LogSchema({"log": "test"})
+        is_byte, data = SchemaPipeline.preprocess(LogSchema, schema.serialize(), copy_input="on_write")
+
+        assert is_byte
+        assert isinstance(data, LogSchema)
+        assert data == schema
+
+
+class MockWriter(CoreComponent):
+    def __init__(self, config: CoreConfig) -> None:
+        super().__init__(
+            name="Writer", config=config, input_schema=LogSchema, output_schema=LogSchema
+        )
+
+    def run(self, input_, output_) -> bool:
+        output_["log"] = input_["log"]
+        input_["log"] = "changed"
+        return True
+
+
+class TestComponentCopyInput:
+    @pytest.mark.parametrize("copy_input", ["always", "on_write"])
+    def test_input_not_modified(self, copy_input) -> None:
+        component = MockWriter(config=CoreConfig(copy_input=copy_input))
+        schema = LogSchema({"log": "original"})
+
+        output_ = component.process(schema)
+
+        assert output_["log"] == "original"
+        assert schema["log"] == "original"
+
+    def test_kept_inputs_are_copied(self) -> None:
+        windowed = CoreComponent(
+            name="Windowed",
+            config=CoreConfig(copy_input="on_write"),
+            args_buffer=ArgsBuffer(BufferMode.WINDOW, size=2),
+            input_schema=LogSchema,
+        )
+        configuring = CoreComponent(
+            name="Configuring", config=CoreConfig(copy_input="on_write", data_use_configure=1)
+        )
+        schema = LogSchema({"log": "original"})
+
+        for component in [windowed, configuring]:
+            component.process(schema)
+        schema["log"] = "changed"
+
+        assert not isinstance(windowed.data_buffer.buffer[0], CopyOnWriteSchema)
+        assert windowed.data_buffer.buffer[0]["log"] == "original"
+        assert configuring.buffer_train.buffer[0]["log"] == "original"
+        assert configuring._copy_input() == "on_write"
+
+    def test_invalid_mode(self) -> None:
+        with pytest.raises(ValueError):
+            CoreConfig(copy_input="never")
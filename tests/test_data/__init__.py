@@ -16,3 +16,21 @@ DUMMY_YAML_PATH2 = str(Path(__file__).resolve().parent / "dummy2.yaml")
 TEST_TEMPLATES = str(Path(__file__).resolve().parent / "test_templates.txt")
 NAMED_TEMPLATES_TXT = str(Path(__file__).resolve().parent / "test_named_templates.txt")
 NAMED_TEMPLATES_CSV = str(Path(__file__).resolve().parent / "test_named_templates.csv")
+
+# MatcherParser over audit.log with the templates of AUDIT_TEMPLATES
+AUDIT_PARSER_CONFIG = {
+    "parsers": {
+        "MatcherParser": {
+            "method_type": "matcher_parser",
+            "auto_config": False,
+            "log_format": LOG_FORMAT,
+            "time_format": None,
+            "params": {
+                "remove_spaces": True,
+                "remove_punctuation": True,
+                "lowercase": True,
+                "path_templates": AUDIT_TEMPLATES,
+            },
+        }
+    }
+}
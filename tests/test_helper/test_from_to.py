@@ -1,4 +1,5 @@
-from detectmatelibrary.helper.from_to import From, To, FromTo
+from detectmatelibrary.helper.from_to import From, To, FromTo, BinaryFileWriter, iter_binary_file, \
+    NdjsonWriter, YamlStreamWriter, line_ranges
 from detectmatelibrary._testutils.dummy_detector import DummyDetector
 from detectmatelibrary._testutils.dummy_parser import DummyParser
 from tests.test_data import AUDIT_TEMPLATES, DUMMY_TXT_PATH, DUMMY_TXT_PATH2, DUMMY_JSON_PATH, \
@@ -8,6 +9,7 @@ import detectmateperformance as dmp
 import polars as pl
 import json
 import yaml
+import pytest
 import os
 
 
@@ -55,8 +57,7 @@ class TestCaseTo:
 
         assert To.binary_file(None, DUMMY_TXT_PATH) is None
 
-        with open(DUMMY_TXT_PATH, "r") as f:
-            assert len(f.readlines()) == 2
+        assert len(list(iter_binary_file(DUMMY_TXT_PATH))) == 2
 
     @remove_files
     def test_tobinary_as_list(self):
@@ -65,8 +66,7 @@ class TestCaseTo:
         logs = [log.serialize() for log in gen]
 
         assert To.binary_file(logs, binary_path) == logs
-        with open(binary_path, "r") as f:
-            assert len(f.readlines()) == 9
+        assert len(list(iter_binary_file(binary_path))) == 9
 
     @remove_files
     def test_tojson(self):
@@ -121,6 +121,117 @@ class TestCaseTo:
             assert len(yaml.safe_load(f)) == 9
 
 
+class TestCaseBinaryFormat:
+    @remove_files
+    def test_roundtrip_records(self):
+        logs = [schemas.LogSchema({"log": f"log {i}\nwith newline", "logID": str(i)}) for i in range(300)]
+        To.binary_file(logs, DUMMY_TXT_PATH)
+
+        loaded = list(From.binary_file(DummyParser(), DUMMY_TXT_PATH, do_process=False))
+        assert loaded == logs
+
+    @remove_files
+    def test_append_keeps_records(self):
+        log = schemas.LogSchema({"log": "first"})
+        To.binary_file(log, DUMMY_TXT_PATH)
+        To.binary_file([log, log.serialize()], DUMMY_TXT_PATH)
+
+        assert list(iter_binary_file(DUMMY_TXT_PATH)) == [log.serialize()] * 3
+
+    @remove_files
+    def test_zstd(self):
+        logs = [schemas.LogSchema({"log": f"log {i}"}) for i in range(50)]
+        with BinaryFileWriter(DUMMY_TXT_PATH, compression="zstd", block_size=64) as writer:
+            for log in logs:
+                writer.write(log)
+        # Appending keeps the compression of the file
+        To.binary_file(logs[0], DUMMY_TXT_PATH)
+
+        assert list(iter_binary_file(DUMMY_TXT_PATH)) == [log.serialize() for log in logs + logs[:1]]
+
+    @remove_files
+    def test_compression_conflict(self):
+        To.binary_file(schemas.LogSchema({"log": "plain"}), DUMMY_TXT_PATH)
+
+        with pytest.raises(ValueError):
+            To.binary_file(schemas.LogSchema({"log": "compressed"}), DUMMY_TXT_PATH, compression="zstd")
+
+    @remove_files
+    def test_writer_buffers_until_flush(self):
+        log = schemas.LogSchema({"log": "buffered"})
+        writer = BinaryFileWriter(DUMMY_TXT_PATH)
+        writer.write(log)
+        assert list(iter_binary_file(DUMMY_TXT_PATH)) == []
+
+        writer.flush()
+        assert list(iter_binary_file(DUMMY_TXT_PATH)) == [log.serialize()]
+        writer.close()
+
+    @remove_files
+    def test_legacy_file(self):
+        logs = [schemas.LogSchema({"log": f"log {i}"}) for i in range(3)]
+        with open(DUMMY_TXT_PATH, "w") as f:
+            f.writelines(str(log.serialize()) + "\n" for log in logs)
+
+        loaded = list(From.binary_file(DummyParser(), DUMMY_TXT_PATH, do_process=False))
+        assert loaded == logs
+        with pytest.raises(ValueError):
+            To.binary_file(logs[0], DUMMY_TXT_PATH)
+
+    @remove_files
+    def test_truncated_file(self):
+        To.binary_file(schemas.LogSchema({"log": "complete"}), DUMMY_TXT_PATH)
+        with open(DUMMY_TXT_PATH, "rb+") as f:
+            f.truncate(os.path.getsize(DUMMY_TXT_PATH) - 2)
+
+        with pytest.raises(ValueError):
+            list(iter_binary_file(DUMMY_TXT_PATH))
+
+
+class TestCaseStreamFormats:
+    @remove_files
+    def test_ndjson_roundtrip(self):
+        parser = DummyParser()
+        logs = list(From.log(parser, in_path=AUDIT_TEMPLATES, do_process=True))
+
+        assert To.ndjson(logs[0], DUMMY_JSON_PATH) == logs[0]
+        assert To.ndjson(logs[1:], DUMMY_JSON_PATH) == logs[1:]
+        assert To.ndjson(None, DUMMY_JSON_PATH) is None
+
+        with open(DUMMY_JSON_PATH, "r") as f:
+            assert len(f.readlines()) == len(logs)
+        loaded = list(From.ndjson(DummyDetector(), DUMMY_JSON_PATH, do_process=False))
+        assert loaded == logs
+
+    @remove_files
+    def test_yaml_stream_roundtrip(self):
+        parser = DummyParser()
+        logs = list(From.log(parser, in_path=AUDIT_TEMPLATES, do_process=True))
+
+        assert To.yaml_stream(logs[0], DUMMY_YAML_PATH) == logs[0]
+        assert To.yaml_stream(logs[1:], DUMMY_YAML_PATH) == logs[1:]
+        assert To.yaml_stream(None, DUMMY_YAML_PATH) is None
+
+        with open(DUMMY_YAML_PATH, "r") as f:
+            assert len(list(yaml.safe_load_all(f))) == len(logs)
+        loaded = list(From.yaml_stream(DummyDetector(), DUMMY_YAML_PATH, do_process=False))
+        assert loaded == logs
+
+    @remove_files
+    def test_writers_buffer_until_flush(self):
+        log = schemas.LogSchema({"log": "buffered", "logID": "0"})
+        for writer_class, path in ((NdjsonWriter, DUMMY_JSON_PATH), (YamlStreamWriter, DUMMY_YAML_PATH)):
+            with writer_class(path, flush_every=2) as writer:
+                writer.write(log)
+                assert os.path.getsize(path) == 0
+                writer.write(log)
+                assert os.path.getsize(path) > 0
+                writer.write(log)
+
+            reader = From.ndjson if writer_class is NdjsonWriter else From.yaml_stream
+            assert list(reader(DummyParser(), path, do_process=False)) == [log] * 3
+
+
 class TestCaseFrom:
     def test_fromlog_no_process(self):
         parser = DummyParser()
@@ -138,6 +249,30 @@ class TestCaseFrom:
         assert log.log == expected_log
         assert isinstance(log, schemas.ParserSchema)
 
+    def test_fromlog_workers(self):
+        expected = list(From.log(DummyParser(), in_path=AUDIT_TEMPLATES))
+        parsed = list(From.log(DummyParser(), in_path=AUDIT_TEMPLATES, workers=2, chunk_bytes=500))
+
+        assert len(parsed) == len(expected)
+        for log1, log2 in zip(parsed, expected):
+            for field in ["log", "logID", "parsedLogID", "EventID", "variables"]:
+                assert log1[field] == log2[field], field
+
+    def test_fromlog_workers_stateless_only(self):
+        with pytest.raises(ValueError):
+            next(From.log(DummyDetector(), in_path=AUDIT_TEMPLATES, workers=2))
+
+    @remove_files
+    def test_line_ranges(self):
+        with open(DUMMY_TXT_PATH, "w") as f:
+            f.write("a\nbb\n\nccc\nd")
+
+        ranges = line_ranges(DUMMY_TXT_PATH, chunk_bytes=2)
+        assert ranges == [(0, 2), (2, 5), (5, 10), (10, 11)]
+        logs = list(From.log(DummyParser(), DUMMY_TXT_PATH, workers=1, chunk_bytes=2))
+        assert [log["log"] for log in logs] == ["a", "bb", "", "ccc", "d"]
+        assert [log["logID"] for log in logs] == ["0", "1", "2", "3", "4"]
+
     @remove_files
     def test_frombinary(self):
         parser = DummyParser()
@@ -284,6 +419,33 @@ class TestCaseFrom:
         for field in ["log", "variables", "template", "EventID", "logFormatVariables"]:
             assert parsed1[field] == schema1[field], field
 
+    def test_frompolars_lazy_batches(self):
+        table = pl.LazyFrame({
+            "Type": [str(i % 3) for i in range(25)],
+            "Content": [f"log {i}" for i in range(25)],
+            "Templates": ["log <*>"] * 25,
+            "EventIDs": [0] * 25
+        })
+        parsed = list(From.polars(DummyDetector(), df=table, do_process=False, batch_size=10))
+
+        assert [log["logID"] for log in parsed] == [str(i) for i in range(25)]
+        assert [log["log"] for log in parsed] == [f"log {i}" for i in range(25)]
+        assert parsed[-1]["logFormatVariables"] == {"Type": "0"}
+
+    def test_frompolars_scan_parquet(self, tmp_path):
+        path = str(tmp_path / "logs.parquet")
+        pl.DataFrame({
+            "Content": [f"log {i}" for i in range(7)],
+            "Templates": ["log <*>"] * 7,
+            "EventIDs": list(range(7))
+        }).write_parquet(path)
+        gen = From.polars(DummyDetector(), df=pl.scan_parquet(path), do_process=False, batch_size=3)
+
+        parsed = list(gen)
+        assert [log["EventID"] for log in parsed] == list(range(7))
+        assert parsed[6]["logID"] == "6"
+        assert len(parsed[6]["logFormatVariables"]) == 0
+
 
 class TestCaseFromTo:
     @remove_files
@@ -294,9 +456,9 @@ class TestCaseFromTo:
         values = []
         for _ in range(5):
             values.append(next(gen))
+        gen.close()
 
-        with open(DUMMY_TXT_PATH) as f:
-            assert 5 == len(f.readlines())
+        assert 5 == len(list(iter_binary_file(DUMMY_TXT_PATH)))
 
     @remove_files
     def test_log2json(self):
@@ -322,6 +484,16 @@ class TestCaseFromTo:
         with open(DUMMY_YAML_PATH) as f:
             assert 5 == len(yaml.safe_load(f))
 
+    @remove_files
+    def test_log2stream_formats(self):
+        expected = list(From.log(DummyParser(), AUDIT_TEMPLATES))
+
+        assert list(FromTo.log2ndjson(DummyParser(), AUDIT_TEMPLATES, DUMMY_JSON_PATH)) == expected
+        assert list(FromTo.log2yaml_stream(DummyParser(), AUDIT_TEMPLATES, DUMMY_YAML_PATH)) == expected
+
+        assert list(From.ndjson(DummyDetector(), DUMMY_JSON_PATH, do_process=False)) == expected
+        assert list(From.yaml_stream(DummyDetector(), DUMMY_YAML_PATH, do_process=False)) == expected
+
     @remove_files
     def test_binary2binary(self):
         parser = DummyParser()
@@ -334,8 +506,7 @@ class TestCaseFromTo:
         for _ in gen:
             pass
 
-        with open(DUMMY_TXT_PATH2) as f:
-            assert 5 == len(f.readlines())
+        assert 5 == len(list(iter_binary_file(DUMMY_TXT_PATH2)))
 
     @remove_files
     def test_binary2json(self):
@@ -367,6 +538,21 @@ class TestCaseFromTo:
         with open(DUMMY_YAML_PATH) as f:
             assert 5 == len(yaml.safe_load(f))
 
+    @remove_files
+    def test_binary2stream_formats(self):
+        logs = list(From.log(DummyParser(), AUDIT_TEMPLATES, do_process=False))[:5]
+        To.binary_file(logs, DUMMY_TXT_PATH)
+
+        gen = FromTo.binary_file2ndjson(DummyParser(), DUMMY_TXT_PATH, DUMMY_JSON_PATH)
+        next(gen)
+        gen.close()
+        gen = FromTo.binary_file2yaml_stream(DummyParser(), DUMMY_TXT_PATH, DUMMY_YAML_PATH)
+        for _ in gen:
+            pass
+
+        assert len(list(From.ndjson(DummyDetector(), DUMMY_JSON_PATH, do_process=False))) == 1
+        assert len(list(From.yaml_stream(DummyDetector(), DUMMY_YAML_PATH, do_process=False))) == 5
+
     @remove_files
     def test_json2binary(self):
         parser = DummyParser()
@@ -379,8 +565,7 @@ class TestCaseFromTo:
         for _ in gen:
             pass
 
-        with open(DUMMY_TXT_PATH) as f:
-            assert 5 == len(f.readlines())
+        assert 5 == len(list(iter_binary_file(DUMMY_TXT_PATH)))
 
     @remove_files
     def test_json2json(self):
@@ -424,8 +609,7 @@ class TestCaseFromTo:
         for _ in gen:
             pass
 
-        with open(DUMMY_TXT_PATH) as f:
-            assert 5 == len(f.readlines())
+        assert 5 == len(list(iter_binary_file(DUMMY_TXT_PATH)))
 
     @remove_files
     def test_yaml2json(self):
@@ -471,8 +655,7 @@ class TestCaseFromTo:
         for _ in gen:
             pass
 
-        with open(DUMMY_TXT_PATH) as f:
-            assert 1 == len(f.readlines())
+        assert 1 == len(list(iter_binary_file(DUMMY_TXT_PATH)))
 
     @remove_files
     def test_polars2json(self):
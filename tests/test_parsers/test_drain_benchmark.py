@@ -0,0 +1,63 @@
+"""Throughput of the DrainParser against the MatcherParser with the
+templates of audit_templates.txt on audit.log.
+
+Run on demand with ``pytest tests/test_parsers/test_drain_benchmark.py
+--run-ignored -s``.
+"""
+from detectmatelibrary.parsers.template_matcher import MatcherParser
+from detectmatelibrary.parsers.drain import DrainParser
+from detectmatelibrary.helper.from_to import From
+from detectmatelibrary.utils.aux import time_test_mode
+from tests.test_data import AUDIT_LOG, AUDIT_TEMPLATES, LOG_FORMAT
+
+from time import perf_counter
+
+import pytest
+
+
+time_test_mode()
+
+
+def _config(name: str, method_type: str, **params) -> dict:
+    return {
+        "parsers": {
+            name: {
+                "method_type": method_type,
+                "auto_config": False,
+                "log_format": LOG_FORMAT,
+                "time_format": None,
+                "params": params,
+            }
+        }
+    }
+
+
+def _throughput(parser, logs: list) -> float:
+    start = perf_counter()
+    for log in logs:
+        parser.process(log)
+    return len(logs) / (perf_counter() - start)
+
+
+@pytest.mark.ignored
+def test_drain_throughput() -> None:
+    logs = list(From.log(None, in_path=AUDIT_LOG, do_process=False))  # type: ignore
+
+    matcher = MatcherParser(config=_config(
+        "MatcherParser", "matcher_parser", path_templates=AUDIT_TEMPLATES
+    ))
+    drain = DrainParser(config=_config("DrainParser", "drain_parser"))
+
+    matcher_rate = _throughput(matcher, logs)
+    drain_learning_rate = _throughput(drain, logs)
+    # the second pass only matches the clusters already learned
+    drain_rate = _throughput(drain, logs)
+
+    print(
+        f"\n{len(logs)} logs: MatcherParser {matcher_rate:.0f} logs/s, "
+        f"DrainParser learning {drain_learning_rate:.0f} logs/s "
+        f"({drain_learning_rate / matcher_rate:.2f}x), "
+        f"learned {drain_rate:.0f} logs/s ({drain_rate / matcher_rate:.2f}x), "
+        f"{len(drain.drain.clusters)} clusters"
+    )
+    assert len(drain.drain.clusters) > 0
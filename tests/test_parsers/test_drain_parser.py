@@ -0,0 +1,176 @@
+from detectmatelibrary.parsers.drain import Drain, DrainParser, DrainParserConfig, LogCluster, WILDCARD
+from detectmatelibrary.helper.from_to import From
+from detectmatelibrary.utils.aux import time_test_mode
+from detectmatelibrary import schemas
+from tests.test_data import AUDIT_LOG, LOG_FORMAT
+
+import pytest
+
+
+time_test_mode()
+
+
+def _config(**params) -> dict:
+    return {
+        "parsers": {
+            "DrainParser": {
+                "method_type": "drain_parser",
+                "auto_config": False,
+                "log_format": LOG_FORMAT,
+                "params": params,
+            }
+        }
+    }
+
+
+def parse(parser: DrainParser, log: str) -> schemas.ParserSchema:
+    return parser.process(schemas.LogSchema({"logID": "0", "log": log}))
+
+
+def audit_logs() -> list:
+    return list(From.log(None, in_path=AUDIT_LOG, do_process=False))  # type: ignore
+
+
+class TestDrain:
+    def test_merge_differing_tokens(self) -> None:
+        drain = Drain()
+        first, changed, _ = drain.add_log("login for user root".split())
+        assert changed and first.template == "login for user root"
+
+        second, changed, _ = drain.add_log("login for user alice".split())
+        assert second is first and changed
+        assert first.template == f"login for user {WILDCARD}"
+        assert first.size == 2
+
+        _, changed, _ = drain.add_log("login for user bob".split())
+        assert not changed
+
+    def test_similarity_threshold(self) -> None:
+        drain = Drain(similarity_threshold=0.8)
+        first, _, _ = drain.add_log("connection from a closed by b".split())
+        second, _, _ = drain.add_log("connection from c reset by d".split())
+        assert first is not second
+
+        drain = Drain(similarity_threshold=0.5)
+        first, _, _ = drain.add_log("connection from a closed by b".split())
+        second, _, _ = drain.add_log("connection from c reset by d".split())
+        assert first is second
+
+    def test_length_splits_clusters(self) -> None:
+        drain = Drain()
+        first, _, _ = drain.add_log("disk full".split())
+        second, _, _ = drain.add_log("disk full again".split())
+        assert first is not second
+
+    def test_digits_go_to_wildcard_child(self) -> None:
+        drain = Drain(depth=3)
+        first, _, _ = drain.add_log("42 requests served".split())
+        second, _, _ = drain.add_log("7 requests served".split())
+        assert first is second
+        assert set(drain.root[3].children) == {WILDCARD}
+
+    def test_max_children(self) -> None:
+        drain = Drain(depth=3, max_children=3)
+        for word in ["a", "b", "c", "d"]:
+            drain.add_log([word, "event"])
+        assert set(drain.root[2].children) == {"a", "b", WILDCARD}
+
+    def test_max_clusters(self) -> None:
+        drain = Drain(depth=3, similarity_threshold=1.0, max_clusters=2)
+        first, _, _ = drain.add_log("job a done".split())
+        second, _, _ = drain.add_log("job b done".split())
+        drain.add_log("job a done".split())
+
+        _, _, evicted = drain.add_log("job c done".split())
+        assert evicted is second
+        assert set(drain.clusters) == {first.cluster_id, 2}
+
+    def test_restore(self) -> None:
+        drain = Drain()
+        for log in ["login for user root", "login for user alice", "disk full on sda"]:
+            drain.add_log(log.split())
+
+        restored = Drain()
+        restored.restore({c.cluster_id: c.template for c in drain.clusters.values()}, drain.next_id)
+        cluster, changed, _ = restored.add_log("login for user bob".split())
+        assert cluster.cluster_id == 0 and not changed
+        assert restored.add_log("disk full on sdb".split())[0].cluster_id == 1
+        assert restored.add_log("new event here".split())[0].cluster_id == 2
+
+    def test_slots(self) -> None:
+        with pytest.raises(AttributeError):
+            LogCluster(0, ["a"]).other = 1  # type: ignore
+
+    def test_invalid_depth(self) -> None:
+        with pytest.raises(ValueError):
+            Drain(depth=2)
+
+
+class TestDrainParser:
+    def test_parse(self) -> None:
+        parser = DrainParser(config=DrainParserConfig())
+        parse(parser, "session opened for user root by uid 0")
+        output = parse(parser, "session opened for user alice by uid 1000")
+
+        assert output.EventID == 0
+        assert output.template == "session opened for user <*> by uid <*>"
+        assert output.variables == ["alice", "1000"]
+
+        output = parse(parser, "disk full")
+        assert output.EventID == 1
+        assert output.variables == []
+
+    def test_log_format(self) -> None:
+        parser = DrainParser(config=_config())
+        output = parser.process(audit_logs()[0])
+
+        assert output.logFormatVariables["Type"] == "USER_ACCT"
+        assert output.template == output.logFormatVariables["Content"]
+
+    def test_export_import_state(self) -> None:
+        logs = audit_logs()
+        parser = DrainParser(config=_config())
+        for log in logs[:1000]:
+            parser.process(log)
+
+        restored = DrainParser(config=_config())
+        restored.import_state(parser.export_state())
+        assert restored.persistency.get_event_templates() == parser.persistency.get_event_templates()
+
+        expected = [(p.EventID, p.template) for p in map(parser.process, logs[1000:])]
+        assert [(p.EventID, p.template) for p in map(restored.process, logs[1000:])] == expected
+
+    def test_evicted_ids_not_reused(self) -> None:
+        parser = DrainParser(config=_config(depth=3, max_clusters=1, similarity_threshold=1.0))
+        parse(parser, "type=X msg=audit(1:1): job a done")
+        parse(parser, "type=X msg=audit(1:1): job b done")
+        assert set(parser.persistency.get_event_templates()) == {1}
+
+        restored = DrainParser(config=_config(depth=3, max_clusters=1, similarity_threshold=1.0))
+        restored.import_state(parser.export_state())
+        assert parse(restored, "type=X msg=audit(1:1): disk full").EventID == 2
+
+    def test_restore_keeps_match_order(self) -> None:
+        config = _config(depth=3, max_clusters=2, similarity_threshold=1.0)
+        parser = DrainParser(config=config)
+        for content in ["job a done", "job b done", "job a done"]:
+            parse(parser, f"type=X msg=audit(1:1): {content}")
+        assert list(parser.persistency.get_event_templates()) == [1, 0]
+
+        restored = DrainParser(config=config)
+        restored.import_state(parser.export_state())
+        for content in ["job c done", "job a done", "job b done"]:
+            log = f"type=X msg=audit(1:1): {content}"
+            assert parse(restored, log).EventID == parse(parser, log).EventID
+
+    def test_persist_auto_load(self, tmp_path) -> None:
+        config = _config()
+        config["parsers"]["DrainParser"]["persist"] = {"path": str(tmp_path), "auto_load": True}
+
+        with DrainParser(config=config) as parser:
+            for log in audit_logs()[:100]:
+                parser.process(log)
+            templates = dict(parser.persistency.get_event_templates())
+
+        with DrainParser(config=config) as restored:
+            assert {c.cluster_id: c.template for c in restored.drain.clusters.values()} == templates
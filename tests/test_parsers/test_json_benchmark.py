@@ -0,0 +1,83 @@
+"""Throughput of JsonParser on nested JSON records built from audit.log,
+with the message matched by a MatcherParser directly against running it
+as a nested component.
+
+Run on demand with ``pytest tests/test_parsers/test_json_benchmark.py
+--run-ignored -s``.
+"""
+from detectmatelibrary.parsers.json_parser import JsonParser
+from detectmatelibrary.parsers.template_matcher import MatcherParser
+from detectmatelibrary.common.parser import CoreParser
+from detectmatelibrary.utils.log_format_utils import generate_logformat_regex
+from detectmatelibrary.utils.aux import time_test_mode
+from detectmatelibrary import schemas
+from tests.test_data import AUDIT_LOG, AUDIT_TEMPLATES, LOG_FORMAT
+
+from time import perf_counter
+import json
+
+import pytest
+
+
+time_test_mode()
+
+_CONFIG = {
+    "parsers": {
+        "JsonParser": {
+            "method_type": "json_parser",
+            "auto_config": False,
+            "params": {"timestamp_name": "time", "content_name": "message"},
+        },
+        "JsonMatcherParser": {
+            "method_type": "matcher_parser",
+            "auto_config": False,
+            "params": {"path_templates": AUDIT_TEMPLATES},
+        },
+    }
+}
+
+
+class _NestedMatcherParser(MatcherParser):
+    """The content parser run as a full component, as before."""
+    parse_content = CoreParser.parse_content
+
+
+def _records() -> list[schemas.LogSchema]:
+    _, regex = generate_logformat_regex(LOG_FORMAT)
+    records = []
+    with open(AUDIT_LOG) as f:
+        for i, line in enumerate(f):
+            if (match := regex.match(line.rstrip("\n"))) is None:
+                continue
+            document = {
+                "meta": {"time": match["Time"].split(".")[0], "host": f"host{i % 8}", "seq": i},
+                "audit": {"type": match["Type"], "message": match["Content"]},
+                "labels": {"env": "prod", "tags": ["audit", "linux"]},
+            }
+            records.append(schemas.LogSchema({"logID": str(i), "log": json.dumps(document)}))
+    return records
+
+
+def _run(parser: JsonParser, records: list[schemas.LogSchema]) -> tuple[list, float]:
+    start = perf_counter()
+    parsed = [parser.process(record) for record in records]
+    seconds = perf_counter() - start
+    return [(p["template"], list(p["variables"]), p["EventID"]) for p in parsed], seconds  # type: ignore
+
+
+@pytest.mark.ignored
+def test_direct_content_parser() -> None:
+    records = _records()
+
+    nested = JsonParser(config=_CONFIG)
+    nested.content_parser = _NestedMatcherParser(config=_CONFIG, name="JsonMatcherParser")
+    nested_parsed, nested_seconds = _run(nested, records)
+    direct_parsed, direct_seconds = _run(JsonParser(config=_CONFIG), records)
+
+    print(
+        f"\nnested: {nested_seconds / len(records) * 1e6:.1f} us/log, "
+        f"direct: {direct_seconds / len(records) * 1e6:.1f} us/log "
+        f"({nested_seconds / direct_seconds:.2f}x)"
+    )
+    assert direct_parsed == nested_parsed
+    assert sum(template != "<Not Found>" for template, _, _ in direct_parsed) > len(records) / 2
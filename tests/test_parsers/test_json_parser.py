@@ -2,8 +2,10 @@ import json
 from detectmatelibrary.parsers.json_parser import (
     JsonParser,
     JsonParserConfig,
-    flatten_dict
+    flatten_dict,
+    json_decoder,
 )
+from detectmatelibrary.utils.key_extractor import FieldPath, KeyExtractor
 import detectmatelibrary.schemas as schemas
 from tests.test_data import TEST_TEMPLATES
 
@@ -22,6 +24,31 @@ class TestFlattenDict:
         assert result == {"items.0.id": 1, "items.1.id": 2, "count": 2}
 
 
+class TestFieldPath:
+    """Tests for FieldPath and KeyExtractor with a given path."""
+
+    def test_get_nested_and_list(self):
+        obj = {"a": {"b": [{"c": 1}, {"c": 2}]}, "0": "zero"}
+        assert FieldPath("a.b.1.c").get(obj) == 2
+        assert FieldPath("0").get(obj) == "zero"
+        assert FieldPath("a.b.1.c").keys(obj) == ["a", "b", 1, "c"]
+        for missing in ["a.x", "a.b.2.c", "a.b.c", "0.1"]:
+            try:
+                FieldPath(missing).get(obj)
+                assert False, missing
+            except KeyError:
+                pass
+
+    def test_key_extractor_with_path(self):
+        obj = {"runtime": 5, "event": {"time": "t"}}
+        assert KeyExtractor("time").extract(obj) == 5
+        extractor = KeyExtractor("time", path="event.time")
+        assert extractor.extract(obj, delete=True) == "t"
+        assert obj == {"runtime": 5, "event": {}}
+        # never searched for
+        assert extractor.extract(obj) is None
+
+
 class TestJsonParserConfig:
     """Tests for JsonParserConfig."""
 
@@ -210,3 +237,47 @@ class TestJsonParser:
         assert "Time" in result.logFormatVariables
         assert "status" in result.logFormatVariables
         assert result.logFormatVariables["status"] == "ok"
+
+    def test_fields(self):
+        """Only the configured fields are kept, with their subtrees
+        flattened."""
+        config = JsonParserConfig(
+            fields=["request", "events.1", "status", "missing"], timestamp_path="meta.time"
+        )
+        parser = JsonParser(name="TestParser", config=config)
+
+        json_log = {
+            "meta": {"time": "2023-11-18 10:30:00", "time_zone": "UTC"},
+            "request": {"method": "GET", "headers": {"accept": "*/*"}},
+            "events": ["login", "update"],
+            "status": 200,
+            "other": {"a": 1},
+        }
+        output = schemas.ParserSchema()
+        parser.parse(schemas.LogSchema({"logID": "1", "log": json.dumps(json_log)}), output)
+
+        assert dict(output.logFormatVariables) == {
+            "request.method": "GET",
+            "request.headers.accept": "*/*",
+            "events.1": "update",
+            "status": "200",
+            "Time": "1700303400",
+        }
+
+    def test_fields_match_full_flattening(self):
+        json_log = {"time": "2023-11-18 10:30:00", "a": {"b": [1, {"c": True}]}, "d": None}
+        full, selected = schemas.ParserSchema(), schemas.ParserSchema()
+        JsonParser(config=JsonParserConfig()).parse(
+            schemas.LogSchema({"log": json.dumps(json_log)}), full
+        )
+        JsonParser(config=JsonParserConfig(fields=["a", "d"])).parse(
+            schemas.LogSchema({"log": json.dumps(json_log)}), selected
+        )
+        assert dict(full.logFormatVariables) == dict(selected.logFormatVariables)
+
+    def test_json_decoder(self):
+        assert json_decoder("json") is json.loads
+        loads = json_decoder("auto")
+        assert loads('{"a": [1, 2.5, null]}') == {"a": [1, 2.5, None]}
+        # beyond the 64 bit integers of the fast decoders
+        assert loads('{"a": 123456789012345678901234567890}') == {"a": 123456789012345678901234567890}
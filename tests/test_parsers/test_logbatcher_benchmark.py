@@ -0,0 +1,73 @@
+"""Throughput of the LogBatcherParser with a cold cache on audit.log,
+against a local stand-in for the LLM endpoint that answers after a fixed
+latency, and time of the DPP sampling of a large cluster.
+
+Run on demand with ``pytest tests/test_parsers/test_logbatcher_benchmark.py
+--run-ignored -s``.
+"""
+from detectmatelibrary.parsers.logbatcher import LogBatcherParser, LogBatcherParserConfig
+from detectmatelibrary.parsers.logbatcher.engine.cluster import Cluster
+from detectmatelibrary.parsers.logbatcher.engine.sample import dpp_sample
+from detectmatelibrary._testutils.openai_stub import OpenAIStub
+from detectmatelibrary.helper.from_to import From
+from detectmatelibrary.utils.aux import time_test_mode
+from tests.test_data import AUDIT_LOG
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from time import perf_counter
+
+import pytest
+
+
+time_test_mode()
+
+LATENCY = 0.2
+MODES = {
+    "sequential": {},
+    "buffered": {"buffer_size": 200},
+    "concurrent": {"max_concurrent_requests": 8},
+    "buffered and concurrent": {"buffer_size": 200, "max_concurrent_requests": 8},
+}
+
+
+@pytest.mark.ignored
+def test_cold_cache_throughput() -> None:
+    logs = list(From.log(None, in_path=AUDIT_LOG, do_process=False))  # type: ignore
+
+    rates = {}
+    for mode, params in MODES.items():
+        with OpenAIStub(latency=LATENCY) as stub:
+            config = LogBatcherParserConfig(api_key="stub", base_url=stub.base_url, **params)
+            with LogBatcherParser(config=config) as parser:
+                start = perf_counter()
+                if mode == "sequential":
+                    parsed = [parser.process(log) for log in logs]
+                else:
+                    parsed = parser.process_batch(logs)
+                rates[mode] = len(logs) / (perf_counter() - start)
+
+        print(
+            f"\n{mode}: {rates[mode]:.0f} logs/s ({rates[mode] / rates['sequential']:.2f}x), "
+            f"{stub.requests} requests, at most {stub.max_in_flight} at the same time"
+        )
+        assert len(parsed) == len(logs)
+
+
+@pytest.mark.ignored
+def test_dpp_batching() -> None:
+    logs = list(dict.fromkeys(open(AUDIT_LOG).read().splitlines()))
+
+    cluster = Cluster()
+    for i, log in enumerate(logs):
+        cluster.append_log(log, i)
+    start = perf_counter()
+    cluster.batching(10)
+    greedy = perf_counter() - start
+
+    start = perf_counter()
+    dpp_sample(cosine_similarity(TfidfVectorizer().fit_transform(logs).toarray()), 10)
+    determinants = perf_counter() - start
+
+    print(f"\nbatching {len(logs)} logs: {greedy:.3f}s greedy, {determinants:.3f}s with determinants")
+    assert len(cluster.batch_logs) == 10
@@ -4,14 +4,31 @@ These tests verify that LogBatcherParser correctly wraps LogBatcher into the
 CoreParser interface without requiring real API calls.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
+from time import perf_counter
 
+from scipy.sparse import csr_matrix
+from sklearn.metrics.pairwise import cosine_similarity
+import numpy as np
 import pytest
 
 import detectmatelibrary.schemas as schemas
 from detectmatelibrary.common.parser import CoreParser
 from detectmatelibrary.parsers.logbatcher import LogBatcherParser, LogBatcherParserConfig
+from detectmatelibrary.parsers.logbatcher._async_client import TokenBucket
+from detectmatelibrary.parsers.logbatcher.engine.matching import (
+    extract_variables, safe_search, template_regex
+)
+from detectmatelibrary.parsers.logbatcher.engine.sample import dpp_sample, greedy_dpp_sample
+from detectmatelibrary.parsers.logbatcher.engine.cluster import Cluster
+from detectmatelibrary.parsers.logbatcher.engine.parsing_cache import (
+    ParsingCache, standardize, standardize_multipass
+)
+from detectmatelibrary._testutils.openai_stub import OpenAIStub, stub_template
+from detectmatelibrary.helper.from_to import From
 from detectmatelibrary.utils.aux import time_test_mode
+from tests.test_data import AUDIT_LOG
 
 time_test_mode()
 
@@ -80,3 +97,248 @@ class TestLogBatcherParserParse:
         parser.process(log_schema2)
 
         assert parser._llm_parser.chat.call_count == llm_call_count
+
+
+class TestMatching:
+    def test_extract_variables(self):
+        assert extract_variables(LOG, EXPECTED_TEMPLATE) == ("192.168.1.1", "22")
+        assert extract_variables("Connection closed", EXPECTED_TEMPLATE) is None
+
+    def test_pattern_compiled_once(self):
+        assert template_regex(EXPECTED_TEMPLATE) is template_regex(EXPECTED_TEMPLATE)
+
+    def test_timeout(self):
+        assert safe_search(r"(a+)+$", "a" * 64 + "b", timeout=0.01) is None
+
+    def test_outside_main_thread(self):
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            assert list(pool.map(extract_variables, [LOG] * 2, [EXPECTED_TEMPLATE] * 2)) == [
+                ("192.168.1.1", "22")
+            ] * 2
+
+
+class TestParsingCache:
+    def test_standardize_single_pass(self):
+        for log in [LOG, "/var/log/a.b: 12 done", "a/b/c//d/", "x-1_2 /p ,", ""]:
+            assert standardize(log) == standardize_multipass(log)
+
+    def test_lru_eviction(self):
+        cache = ParsingCache(max_size=2)
+        for word in ["alpha", "beta", "gamma"]:
+            cache.add_templates(f"{word} <*>", refer_log=f"{word} 1")
+            assert cache.match_event(f"{word} 2")[0] == f"{word} <*>"
+
+        assert cache.size == 2
+        assert cache.eviction_num >= 1
+        # evicted entries are still found in the template tree
+        assert cache.match_event("alpha 7")[0] == "alpha <*>"
+
+    def test_hit_rate(self):
+        cache = ParsingCache()
+        cache.add_templates(EXPECTED_TEMPLATE, refer_log=LOG)
+        # the first log of a skeleton is matched in the tree, the next ones
+        # in the cache
+        for _ in range(3):
+            assert cache.match_event(LOG)[0] == EXPECTED_TEMPLATE
+
+        assert cache.hit_num == 2 and cache.miss_num == 1
+        assert cache.hit_rate == 2 / 3
+
+    def test_parser_stats(self):
+        parser = _make_parser()
+        for i in range(3):
+            parser.process(schemas.LogSchema({"logID": str(i), "log": LOG}))
+
+        stats = parser.cache_stats()
+        assert stats["hits"] >= 1 and stats["size"] >= 1
+        assert 0 < stats["hit_rate"] <= 1
+
+
+class TestSampling:
+    @pytest.mark.parametrize("seed", range(5))
+    def test_greedy_dpp_parity(self, seed):
+        features = np.random.default_rng(seed).random((60, 40))
+        features[features < 0.7] = 0
+        similarities = cosine_similarity(features)
+        # the diagonal is 1 up to rounding, dpp_sample breaks the tie on it
+        np.fill_diagonal(similarities, 1.)
+
+        expected = dpp_sample(similarities, 8)
+        assert greedy_dpp_sample(features, 8) == expected
+        assert greedy_dpp_sample(csr_matrix(features), 8) == expected
+
+    def test_greedy_dpp_small(self):
+        features = np.eye(3)
+        assert sorted(greedy_dpp_sample(features, 5)) == [0, 1, 2]
+        # duplicates add nothing once one of them is selected
+        assert sorted(greedy_dpp_sample(np.array([[1., 0.], [1., 0.], [0., 1.]]), 2)) == [0, 2]
+
+    def test_batching(self):
+        cluster = Cluster()
+        for i, log in enumerate(log["log"] for log in _audit_logs(200)):
+            cluster.append_log(log, i)
+        cluster.batching(10)
+
+        assert len(cluster.batch_logs) == 10
+        assert len(set(cluster.batch_logs)) == 10
+        assert cluster.sample_log == cluster.batch_logs[0]
+
+
+@pytest.fixture
+def openai_stub():
+    with OpenAIStub() as stub:
+        yield stub
+
+
+def _stub_parser(stub: OpenAIStub, **params) -> LogBatcherParser:
+    return LogBatcherParser(config=LogBatcherParserConfig(api_key="stub", base_url=stub.base_url, **params))
+
+
+def _audit_logs(n: int = 300) -> list:
+    return list(From.log(None, in_path=AUDIT_LOG, do_process=False))[:n]  # type: ignore
+
+
+class TestLogBatcherParserBuffered:
+    def test_local_endpoint(self, openai_stub):
+        parser = _stub_parser(openai_stub)
+        result = parser.process(schemas.LogSchema({"logID": "1", "log": LOG}))
+
+        assert openai_stub.requests == 1
+        assert result["template"] == stub_template(LOG).replace("{{variable}}", "<*>")
+
+    def test_one_request_per_cluster(self):
+        logs = _audit_logs()
+        with OpenAIStub() as stub:
+            parser = _stub_parser(stub)
+            expected = [parser.process(log) for log in logs]
+            unbuffered_requests = stub.requests
+        with OpenAIStub() as stub:
+            parsed = _stub_parser(stub, buffer_size=100).process_batch(logs)
+            buffered_requests = stub.requests
+
+        assert buffered_requests < unbuffered_requests
+        assert [p["template"] for p in parsed] == [p["template"] for p in expected]
+        assert [p["variables"] for p in parsed] == [p["variables"] for p in expected]
+
+    def test_input_order(self, openai_stub):
+        logs = _audit_logs()
+        parsed = _stub_parser(openai_stub, buffer_size=50).process_batch(logs)
+
+        assert [p["logID"] for p in parsed] == [log["logID"] for log in logs]
+        assert all(p["template"] and p["EventID"] >= 0 for p in parsed)
+
+    def test_buffer_timeout(self, openai_stub):
+        logs = _audit_logs(100)
+        parser = _stub_parser(openai_stub, buffer_size=100, buffer_timeout=0.)
+        parsed = parser.process_batch(logs)
+
+        # every miss is parsed as soon as it is buffered
+        assert len(parsed) == len(logs)
+        assert all(len(prompt) == 1 for prompt in openai_stub.prompts)
+        assert parser._pending is None
+
+
+class TestLogBatcherParserThreads:
+    def test_thread_pool(self, openai_stub):
+        logs = _audit_logs(100)
+        parser = _stub_parser(openai_stub)
+        expected = [p["template"] for p in map(_stub_parser(openai_stub).process, logs)]
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            parsed = list(pool.map(parser.process, logs))
+
+        assert [p["logID"] for p in parsed] == [log["logID"] for log in logs]
+        assert {p["template"] for p in parsed} == set(expected)
+
+
+class TestLogBatcherParserState:
+    def test_warm_restart_without_llm(self, openai_stub):
+        logs = _audit_logs(100)
+        parser = _stub_parser(openai_stub)
+        list(map(parser.process, logs))
+        state = parser.export_state()
+
+        # a few logs never fit the template they got, and are asked for again
+        start = openai_stub.requests
+        expected = [(p["EventID"], p["template"]) for p in map(parser.process, logs)]
+        warm_requests = openai_stub.requests - start
+
+        restored = _stub_parser(openai_stub)
+        restored.import_state(state)
+        start = openai_stub.requests
+        assert [(p["EventID"], p["template"]) for p in map(restored.process, logs)] == expected
+        assert openai_stub.requests - start == warm_requests
+
+    def test_export_to_path(self, tmp_path):
+        parser = _make_parser()
+        parser.process(schemas.LogSchema({"logID": "1", "log": LOG}))
+        assert parser.export_state(str(tmp_path)) is None
+
+        restored = _make_parser()
+        restored.import_state(str(tmp_path))
+        output = restored.process(schemas.LogSchema({"logID": "2", "log": LOG}))
+        assert output["template"] == EXPECTED_TEMPLATE
+        restored._llm_parser.chat.assert_not_called()
+
+    def test_persist_auto_load(self, openai_stub, tmp_path):
+        persist = {"path": str(tmp_path), "auto_load": True}
+        with _stub_parser(openai_stub, persist=persist) as parser:
+            list(map(parser.process, _audit_logs(50)))
+
+        with _stub_parser(openai_stub, persist=persist) as restored:
+            assert restored._cache.template_list == parser._cache.template_list
+            assert restored._cache.hashing_cache == parser._cache.hashing_cache
+
+    def test_save_after_new_templates(self, openai_stub, tmp_path):
+        persist = {"path": str(tmp_path), "events_until_save": 1}
+        with _stub_parser(openai_stub, persist=persist) as parser:
+            parser.process(_audit_logs(1)[0])
+            assert (tmp_path / parser.name / "parsing_cache.json").exists()
+
+
+class TestTokenBucket:
+    def test_rate(self):
+        now = [0.]
+        bucket = TokenBucket(rate=2., burst=2, clock=lambda: now[0])
+
+        assert [bucket.delay() for _ in range(4)] == [0., 0., 0.5, 1.]
+        now[0] = 10.
+        assert bucket.delay() == 0.
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0.)
+
+
+class TestLogBatcherParserConcurrent:
+    def test_concurrent_requests(self):
+        logs = _audit_logs()
+        with OpenAIStub(latency=0.05) as stub:
+            with _stub_parser(stub, buffer_size=50, max_concurrent_requests=4) as parser:
+                parsed = parser.process_batch(logs)
+
+        assert 1 < stub.max_in_flight <= 4
+        assert [p["logID"] for p in parsed] == [log["logID"] for log in logs]
+        assert all(p["template"] for p in parsed)
+        assert parser._client is None
+
+    def test_same_templates_as_sequential(self, openai_stub):
+        logs = _audit_logs(100)
+        parser = _stub_parser(openai_stub)
+        expected = {p["template"] for p in map(parser.process, logs)}
+
+        with _stub_parser(openai_stub, buffer_size=100, max_concurrent_requests=4) as parser:
+            assert {p["template"] for p in parser.process_batch(logs)} == expected
+
+    def test_request_timeout(self):
+        logs = _audit_logs(20)
+        with OpenAIStub(latency=1.) as stub:
+            with _stub_parser(stub, max_concurrent_requests=4, request_timeout=0.1) as parser:
+                start = perf_counter()
+                parsed = parser.process_batch(logs)
+                elapsed = perf_counter() - start
+
+        # the logs are parsed without the answers
+        assert len(parsed) == len(logs)
+        assert all(p["template"] for p in parsed)
+        assert elapsed < stub.requests * 1.
@@ -0,0 +1,96 @@
+"""Match rate and throughput of the MatcherParser matching engines on
+audit.log, with the templates of audit_templates.txt hidden among
+generated look-alike templates.
+
+Run on demand with ``pytest tests/test_parsers/test_matcher_benchmark.py
+--run-ignored -s``.
+"""
+from detectmatelibrary.parsers.template_matcher import MatcherParser
+from detectmatelibrary.helper.from_to import From
+from detectmatelibrary.utils.aux import time_test_mode
+from tests.test_data import AUDIT_LOG, AUDIT_TEMPLATES, LOG_FORMAT
+
+from time import perf_counter
+import random
+import gc
+
+import pytest
+
+
+time_test_mode()
+
+N_TEMPLATES = [0, 1000, 10000]
+REPEAT = 5
+
+
+def _look_alikes(templates: list[str], n: int) -> list[str]:
+    """Templates sharing most literals with the real ones, but with one
+    extra field that no log has."""
+    rng = random.Random(0)
+    generated = []
+    for i in range(n):
+        fields = rng.choice(templates).split(" ")
+        fields.insert(rng.randrange(1, len(fields) + 1), f"field{i}=<*>")
+        generated.append(" ".join(fields))
+    return generated
+
+
+def _config(path_templates: str, engine: str, cache_size: int) -> dict:
+    return {
+        "parsers": {
+            "MatcherParser": {
+                "method_type": "matcher_parser",
+                "auto_config": False,
+                "log_format": LOG_FORMAT,
+                "time_format": None,
+                "params": {
+                    "path_templates": path_templates,
+                    "matching_engine": engine,
+                    "match_cache_size": cache_size,
+                },
+            }
+        }
+    }
+
+
+def _run(path_templates: str, engine: str, logs: list, cache_size: int = 0) -> tuple[list, float]:
+    parser = MatcherParser(config=_config(path_templates, engine, cache_size))
+
+    gc.collect()
+    start = perf_counter()
+    parsed = [parser.process(log) for log in logs]
+    return [(p["template"], list(p["variables"])) for p in parsed], perf_counter() - start
+
+
+@pytest.mark.ignored
+@pytest.mark.parametrize("n_templates", N_TEMPLATES)
+def test_matching_engines(n_templates, tmp_path) -> None:
+    with open(AUDIT_TEMPLATES) as f:
+        templates = [line.strip() for line in f if line.strip()]
+    path = tmp_path / "templates.txt"
+    path.write_text("\n".join(_look_alikes(templates, n_templates) + templates) + "\n")
+    logs = list(From.log(None, in_path=AUDIT_LOG, do_process=False))  # type: ignore
+
+    sequential, sequential_time = _run(str(path), "sequential", logs)
+    # best of interleaved runs, so that both engines see the same load
+    automaton_time = cached_time = float("inf")
+    for _ in range(REPEAT):
+        automaton, run_time = _run(str(path), "automaton", logs)
+        automaton_time = min(automaton_time, run_time)
+        cached, run_time = _run(str(path), "automaton", logs, cache_size=10000)
+        cached_time = min(cached_time, run_time)
+
+    matched = sum(template != "<Not Found>" for template, _ in automaton) / len(logs)
+    print(
+        f"\n{n_templates + len(templates)} templates, match rate {matched:.1%}: "
+        f"sequential {len(logs) / sequential_time:.0f} logs/s, "
+        f"automaton {len(logs) / automaton_time:.0f} logs/s "
+        f"({sequential_time / automaton_time:.2f}x), "
+        f"automaton with cache {len(logs) / cached_time:.0f} logs/s "
+        f"({sequential_time / cached_time:.2f}x)"
+    )
+    assert automaton == sequential
+    assert cached == sequential
+    # a cache hit costs about one regex, so the cache must not slow matching
+    # down, with some slack for timing noise
+    assert cached_time <= automaton_time / 0.8
@@ -1,7 +1,15 @@
 import pytest
+import msgpack
+import os
 from detectmatelibrary.parsers.template_matcher import MatcherParser, MatcherParserConfig, \
     TemplatesNotFoundError
 from detectmatelibrary.parsers.template_matcher._parser import _compile_templates
+from detectmatelibrary.parsers.template_matcher._index_cache import index_path
+from detectmatelibrary.parsers.template_matcher import _index_cache
+from detectmatelibrary.parsers.template_matcher import _parser
+from detectmatelibrary.parsers.template_matcher._matcher_op import (
+    TemplateMatcher, TemplatesManager, MatchCache, skeleton, skeleton_literals, skeleton_safe
+)
 from detectmatelibrary.common._config._formats import EventsConfig
 from detectmatelibrary import schemas
 from tests.test_data import NAMED_TEMPLATES_TXT, NAMED_TEMPLATES_CSV, TEST_TEMPLATES
@@ -96,6 +104,148 @@ class TestMatcherParserBasic:
         # Still matches template even with preprocessing disabled
         assert output_data.template == test_template[0]
 
+    def test_parse_content_same_as_process(self):
+        parser = MatcherParser(
+            name="MatcherParser", config=MatcherParserConfig(path_templates=TEST_TEMPLATES)
+        )
+        for log in [test_log_match, test_log_no_match]:
+            output_data = parser.process(schemas.LogSchema({"log": log}))
+            assert parser.parse_content(log) == (
+                output_data.template, list(output_data.variables), output_data.EventID
+            )
+
+    def test_parse_content_with_log_format(self):
+        """A log_format still splits the content first."""
+        parser = MatcherParser(name="MatcherParser", config=MatcherParserConfig(
+            path_templates=TEST_TEMPLATES, log_format="[<Level>] <Content>"
+        ))
+        template, variables, event_id = parser.parse_content(f"[INFO] {test_log_match}")
+        assert template == test_template[0]
+        assert event_id == 0
+        assert len(variables) > 0
+
+
+class TestTemplateMatcher:
+    templates = ["user <*> logged in", "<*> failed", "user admin logged <*>", "session <*>"]
+
+    def test_candidates_share_prefix(self):
+        manager = TemplateMatcher(self.templates).manager
+
+        _, candidates = manager.candidate_indices("user admin logged in")
+        assert sorted(candidates) == [0, 1, 2]
+        _, candidates = manager.candidate_indices("session 42 closed")
+        assert sorted(candidates) == [1, 3]
+
+    def test_first_template_wins_then_most_matched(self):
+        matcher = TemplateMatcher(self.templates)
+
+        assert matcher("user admin logged in")["EventTemplate"] == "user <*> logged in"
+        assert matcher("user admin logged out")["EventTemplate"] == "user admin logged <*>"
+        _, candidates = matcher.manager.candidate_indices("user admin logged in")
+        assert candidates == [0, 2, 1]
+
+    def test_precompiled_pattern(self):
+        matcher = TemplateMatcher(self.templates)
+
+        assert matcher("user  bob   logged in")["Params"] == ("bob",)
+        assert matcher.manager.pattern(0) is matcher.manager.pattern(0)
+        assert TemplateMatcher.extract_parameters("session  7", "session <*>") == ("7",)
+
+    def test_automaton_candidates(self):
+        manager = TemplateMatcher(self.templates + ["<*>"], engine="automaton").manager
+
+        _, candidates = manager.candidate_indices("user admin logged in")
+        assert sorted(candidates) == [0, 2, 4]
+        _, candidates = manager.candidate_indices("login failed")
+        assert sorted(candidates) == [1, 4]
+
+    @pytest.mark.parametrize("log", [
+        "user admin logged in", "user admin logged out", "user bob logged in", "disk failed",
+        "session 1", "user bob logged", "nothing",
+    ])
+    def test_automaton_same_as_sequential(self, log):
+        sequential = TemplateMatcher(self.templates)
+        automaton = TemplateMatcher(self.templates, engine="automaton")
+
+        for _ in range(2):
+            assert automaton(log) == sequential(log)
+
+    def test_cache_hits(self):
+        matcher = TemplateMatcher(self.templates, cache_size=10)
+
+        assert matcher("session 1")["EventId"] == 3
+        assert matcher("session 2")["EventId"] == 3
+        assert matcher("session 3") == {"EventTemplate": "session <*>", "Params": ("3",), "EventId": 3}
+        assert (matcher.cache.hits, matcher.cache.misses) == (1, 2)
+        assert skeleton("session 0xdeadbeef01 of user42") == "session # of #"
+
+    def test_cache_skips_ambiguous_logs(self):
+        matcher = TemplateMatcher(self.templates, cache_size=10)
+
+        for _ in range(3):
+            matcher("user admin logged in")
+        assert matcher.cache.hits == 0
+        assert matcher("user admin logged out")["EventTemplate"] == "user admin logged <*>"
+
+    def test_cache_miss_after_failed_hit(self):
+        matcher = TemplateMatcher(["v 1 <*>", "v <*> a"], cache_size=10)
+
+        for _ in range(2):
+            assert matcher("v 1 b")["EventId"] == 0
+        assert matcher("v 2 b")["EventId"] == -1
+        assert matcher("v 2 a")["EventId"] == 1
+        assert (matcher.cache.hits, len(matcher.cache)) == (1, 1)
+
+    def test_cache_same_as_uncached(self):
+        # "v 1 <*>" only matches some of the logs of the skeleton "v # b"
+        templates = ["v 1 <*>", "v <*>"]
+        cached = TemplateMatcher(templates, cache_size=10)
+        uncached = TemplateMatcher(templates)
+
+        for log in ["v 1 a"] * 3 + ["v 2 b"] * 2 + ["v 1 b", "v 3 b"]:
+            assert cached(log) == uncached(log)
+        assert cached("v 1 b")["EventId"] == 0
+        assert cached.cache.hits == 3
+        assert skeleton_safe("v <*>") and not skeleton_safe("v 1 <*>")
+        assert not skeleton_safe("id<*>") and skeleton_safe("<*> failed")
+
+    def test_cache_competitors(self):
+        # only the unsafe templates whose literals fit the skeleton compete
+        templates = ["v <*>", "v 1 <*>", "w 2 <*>", "v x<*> b"]
+        matcher = TemplateMatcher(templates, cache_size=10)
+        uncached = TemplateMatcher(templates)
+
+        assert skeleton_literals("v 1 <*>") == ["v # "]
+        assert skeleton_literals("v x<*> b") == ["v ", " b"]
+        assert matcher.manager.skeleton_competitors("v # b") == (1, 3)
+        for log in ["v 2 b"] * 2 + ["v 1 b", "v x1 b"]:
+            assert matcher(log) == uncached(log)
+        assert matcher.cache.competitors("v # b") == (1, 3)
+        assert matcher.cache.hits == 2
+
+    def test_cache_evictions_and_invalidation(self):
+        cache = MatchCache(max_size=2)
+        for key in ["a", "b", "a", "c"]:
+            cache.put(key, 0)
+        assert cache.get("b") is None and cache.get("a") == 0
+        assert (cache.evictions, len(cache)) == (1, 2)
+
+        matcher = TemplateMatcher(self.templates, cache_size=10)
+        matcher("session 1")
+        matcher.set_templates(["<*> failed", "session <*>"])
+        assert len(matcher.cache) == 0
+        assert matcher("session 1")["EventId"] == 1
+
+    def test_engine_config(self):
+        config = MatcherParserConfig(path_templates=TEST_TEMPLATES, matching_engine="automaton")
+        parser = MatcherParser(name="MatcherParser", config=config)
+        output_data = schemas.ParserSchema()
+        parser.parse(schemas.LogSchema({"log": test_log_match}), output_data)
+
+        assert output_data.template == test_template[0]
+        with pytest.raises(ValueError):
+            MatcherParserConfig(matching_engine="unknown")
+
 
 class TestCompileTemplates:
     def test_named_wildcards_compiled_to_anon(self):
@@ -239,3 +389,71 @@ class TestNamedEventIdCsv:
 
         assert 0 in compiled.events
         assert compiled.events[0].variables[0].name == "process_id"
+
+
+class TestTemplateIndex:
+    @pytest.fixture
+    def templates_path(self, tmp_path):
+        path = tmp_path / "templates.txt"
+        path.write_text(open(TEST_TEMPLATES).read())
+        return str(path)
+
+    def parse(self, parser, log):
+        output_data = schemas.ParserSchema()
+        parser.parse(schemas.LogSchema({"log": log}), output_data)
+        return output_data
+
+    def test_index_is_reused(self, templates_path, monkeypatch):
+        config = MatcherParserConfig(path_templates=templates_path, template_index=True)
+        MatcherParser(name="MatcherParser", config=config)
+        assert os.path.exists(index_path(templates_path))
+
+        def fail(path):
+            raise AssertionError("templates file read again")
+
+        monkeypatch.setattr(_parser, "load_templates", fail)
+        parser = MatcherParser(name="MatcherParser", config=config)
+        assert self.parse(parser, test_log_match).template == test_template[0]
+
+    def test_changed_templates_rebuild_index(self, templates_path):
+        config = MatcherParserConfig(path_templates=templates_path, template_index=True)
+        MatcherParser(name="MatcherParser", config=config)
+
+        with open(templates_path, "w") as f:
+            f.write("this is <*> matching\n")
+        parser = MatcherParser(name="MatcherParser", config=config)
+        assert self.parse(parser, test_log_no_match).template == "this is <*> matching"
+
+    @pytest.mark.parametrize("engine", ["sequential", "automaton"])
+    def test_index_round_trip(self, engine):
+        raw, labels = _parser.load_templates(NAMED_TEMPLATES_CSV)
+        compiled, metadata = _compile_templates(raw, labels)
+        manager = TemplatesManager(compiled, metadata, engine=engine)
+        restored = TemplatesManager.from_state(msgpack.unpackb(msgpack.packb(manager.to_state())))
+
+        assert restored.to_state() == manager.to_state()
+        assert restored._rank == manager._rank
+        assert restored._idx_to_var_map == manager._idx_to_var_map
+        for log in [test_log_match, test_log_no_match, *raw]:
+            assert restored.candidate_indices(log) == manager.candidate_indices(log)
+
+    def test_index_is_not_pickled(self, templates_path):
+        config = MatcherParserConfig(path_templates=templates_path, template_index=True)
+        MatcherParser(name="MatcherParser", config=config)
+        with open(index_path(templates_path), "rb") as f:
+            data = f.read()
+        assert b"TemplatesManager" not in data
+        state = msgpack.unpackb(data[_index_cache._HEADER_SIZE:])
+        assert [t[0] for t in state["templates"]] == _parser.load_templates(templates_path)[0]
+
+    def test_invalid_index_is_ignored(self, templates_path):
+        with open(index_path(templates_path), "wb") as f:
+            f.write(b"not an index")
+        config = MatcherParserConfig(
+            path_templates=templates_path, template_index=True, matching_engine="automaton"
+        )
+
+        parser = MatcherParser(name="MatcherParser", config=config)
+        assert self.parse(parser, test_log_match).template == test_template[0]
+        parser = MatcherParser(name="MatcherParser", config=config)
+        assert self.parse(parser, test_log_match).template == test_template[0]
@@ -0,0 +1,104 @@
+from detectmatelibrary.helper.async_pipeline import AsyncPipeline, AsyncStage
+from detectmatelibrary._testutils.dummy_detector import DummyDetector
+from detectmatelibrary._testutils.dummy_parser import DummyParser
+from detectmatelibrary.helper.from_to import From
+from detectmatelibrary.utils.aux import time_test_mode
+from tests.test_data import AUDIT_TEMPLATES
+
+from time import sleep
+import asyncio
+import pytest
+
+
+time_test_mode()
+
+
+class SlowParser(DummyParser):
+    def parse(self, input_, output_):
+        sleep(0.005)
+        super().parse(input_, output_)
+
+
+class FailingDetector(DummyDetector):
+    def detect(self, input_, output_):
+        raise RuntimeError("broken detector")
+
+
+def logs(n: int = 9) -> list:
+    return list(From.log(None, in_path=AUDIT_TEMPLATES, do_process=False))[:n]  # type: ignore
+
+
+async def collect(pipeline: AsyncPipeline, source) -> list:
+    return [output async for output in pipeline.run(source)]
+
+
+def sequential(source: list) -> list:
+    parser, detector = DummyParser(), DummyDetector()
+    return [
+        alert for log in source if (alert := detector.process(parser.process(log))) is not None
+    ]
+
+
+class TestAsyncPipeline:
+    @pytest.mark.parametrize("executor", ["inline", "thread", "process"])
+    def test_matches_sequential(self, executor) -> None:
+        pipeline = AsyncPipeline([
+            AsyncStage(DummyParser(), executor=executor), AsyncStage(DummyDetector(), executor=executor)
+        ])
+
+        assert asyncio.run(collect(pipeline, logs())) == sequential(logs())
+
+    def test_async_source(self) -> None:
+        async def source():
+            for log in logs():
+                await asyncio.sleep(0)
+                yield log
+
+        pipeline = AsyncPipeline([AsyncStage(DummyParser()), AsyncStage(DummyDetector())])
+        assert asyncio.run(collect(pipeline, source())) == sequential(logs())
+
+    def test_fan_out(self) -> None:
+        pipeline = AsyncPipeline([
+            AsyncStage(DummyParser()),
+            [AsyncStage(DummyDetector(name="Detector1")), AsyncStage(DummyDetector(name="Detector2"))],
+        ])
+
+        alerts = asyncio.run(collect(pipeline, logs()))
+        assert sorted(alert["detectorID"] for alert in alerts) == ["Detector1"] * 4 + ["Detector2"] * 4
+
+    def test_backpressure(self) -> None:
+        read = []
+
+        def source():
+            for log in logs() * 10:
+                read.append(log)
+                yield log
+
+        async def first_output(pipeline):
+            async for _ in pipeline.run(source()):
+                return len(read)
+
+        pipeline = AsyncPipeline([AsyncStage(SlowParser(), queue_size=2)], queue_size=2)
+        n_read = asyncio.run(first_output(pipeline))
+
+        # Parser queue + sink queue + the record in process
+        assert n_read <= 2 + 2 + 2
+        assert pipeline.metrics()["DummyParser"].max_queue_depth <= 2
+
+    def test_metrics(self) -> None:
+        pipeline = AsyncPipeline([AsyncStage(SlowParser()), AsyncStage(DummyDetector())])
+        asyncio.run(collect(pipeline, logs()))
+
+        metrics = pipeline.metrics()
+        assert metrics["DummyParser"].processed == 9
+        assert metrics["DummyParser"].outputs == 9
+        assert metrics["DummyParser"].mean_latency >= 0.005
+        assert metrics["DummyDetector"].processed == 9
+        assert metrics["DummyDetector"].outputs == 4
+        assert metrics["DummyDetector"].queue_depth == 0
+
+    def test_error(self) -> None:
+        pipeline = AsyncPipeline([AsyncStage(DummyParser()), AsyncStage(FailingDetector())])
+
+        with pytest.raises(RuntimeError, match="broken detector"):
+            asyncio.run(collect(pipeline, logs()))
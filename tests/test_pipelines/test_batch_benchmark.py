@@ -0,0 +1,56 @@
+"""Throughput of process against process_batch for MatcherParser ->
+NewValueDetector on audit.log.
+
+Run on demand with ``pytest tests/test_pipelines/test_batch_benchmark.py
+--run-ignored -s``.
+"""
+from detectmatelibrary.detectors.new_value_detector import NewValueDetector
+from detectmatelibrary.parsers.template_matcher import MatcherParser
+from detectmatelibrary.helper.from_to import From
+from detectmatelibrary.utils.aux import time_test_mode
+from tests.test_data import AUDIT_LOG, AUDIT_PARSER_CONFIG
+
+from time import perf_counter
+
+import pytest
+
+
+time_test_mode()
+
+BATCH_SIZE = 256
+
+
+def _per_record(logs: list) -> tuple[list, float]:
+    parser, detector = MatcherParser(config=AUDIT_PARSER_CONFIG), NewValueDetector()
+
+    start = perf_counter()
+    alerts = []
+    for log in logs:
+        if (parsed := parser.process(log)) is not None:
+            if (alert := detector.process(parsed)) is not None:
+                alerts.append(alert)
+    return alerts, perf_counter() - start
+
+
+def _batched(logs: list) -> tuple[list, float]:
+    parser, detector = MatcherParser(config=AUDIT_PARSER_CONFIG), NewValueDetector()
+
+    start = perf_counter()
+    alerts = []
+    for i in range(0, len(logs), BATCH_SIZE):
+        alerts.extend(detector.process_batch(parser.process_batch(logs[i:i + BATCH_SIZE])))
+    return alerts, perf_counter() - start
+
+
+@pytest.mark.ignored
+def test_process_batch_throughput() -> None:
+    logs = list(From.log(None, in_path=AUDIT_LOG, do_process=False))  # type: ignore
+
+    alerts, per_record = _per_record(logs)
+    batch_alerts, batched = _batched(logs)
+
+    print(
+        f"\nprocess: {len(logs) / per_record:.0f} logs/s, "
+        f"process_batch: {len(logs) / batched:.0f} logs/s ({per_record / batched:.2f}x)"
+    )
+    assert batch_alerts == alerts
@@ -0,0 +1,43 @@
+"""Detector throughput of PipelineRunner with a growing number of detector
+workers, MatcherParser -> NewValueDetector + NewEventDetector on audit.log.
+
+Run on demand with ``pytest tests/test_pipelines/test_pipeline_benchmark.py
+--run-ignored -s``. Scaling is bounded by the cores of the host.
+"""
+from detectmatelibrary.helper.pipeline import PipelineRunner
+from detectmatelibrary.helper.from_to import From
+from detectmatelibrary.utils.aux import time_test_mode
+from tests.test_data import AUDIT_LOG
+from tests.test_pipelines.test_pipeline_runner import config
+
+from time import perf_counter
+import os
+
+import pytest
+
+
+time_test_mode()
+
+REPEAT = 10
+
+
+@pytest.mark.ignored
+def test_pipeline_runner_scaling() -> None:
+    logs = [log.log for log in From.log(None, in_path=AUDIT_LOG, do_process=False)] * REPEAT  # type: ignore
+    print(f"\n{len(logs)} logs, {os.cpu_count()} cores")
+
+    baseline, expected = None, None
+    for workers in (1, 2, 4, 8):
+        runner = PipelineRunner(
+            config, parser="MatcherParser", workers=workers, parser_workers=workers, batch_size=1024
+        )
+        start = perf_counter()
+        alerts = list(runner.run(logs))
+        elapsed = perf_counter() - start
+
+        baseline = baseline or elapsed
+        expected = expected or alerts
+        print(
+            f"workers={workers}: {len(logs) / elapsed:.0f} logs/s ({baseline / elapsed:.2f}x)"
+        )
+        assert alerts == expected
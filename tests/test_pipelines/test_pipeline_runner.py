@@ -0,0 +1,164 @@
+from detectmatelibrary.alert_aggregation.basic_concat import BasicConcatAggregation
+from detectmatelibrary.detectors.new_event_detector import NewEventDetector
+from detectmatelibrary.detectors.new_value_detector import NewValueDetector
+from detectmatelibrary.helper.pipeline import PipelineRunner, PipelineWorkerError, library_component, shard_of
+from detectmatelibrary.parsers.template_matcher import MatcherParser
+from detectmatelibrary.common.detector import CoreDetector, CoreDetectorConfig
+from detectmatelibrary.helper.from_to import From
+from detectmatelibrary.utils.aux import time_test_mode
+from tests.test_data import AUDIT_LOG, AUDIT_PARSER_CONFIG, LOG_FORMAT
+
+from pydantic import ValidationError
+from pathlib import Path
+import pytest
+
+
+time_test_mode()
+
+config = {
+    **AUDIT_PARSER_CONFIG,
+    "detectors": {
+        "NewValueDetector": {
+            "method_type": "new_value_detector",
+            "auto_config": True,
+            "data_use_configure": 200,
+            "data_use_training": 200,
+        },
+        "NewEventDetector": {
+            "method_type": "new_event_detector",
+            "auto_config": True,
+            "data_use_configure": 200,
+            "data_use_training": 200,
+        },
+    },
+    "alert_aggregators": {
+        "BasicConcatAggregator": {
+            "method_type": "basic_concat_aggregator",
+            "auto_config": False,
+            "buffer_size": 2,
+            "params": {},
+        }
+    },
+}
+
+
+@pytest.fixture(scope="module")
+def sequential_alerts() -> list:
+    parser = MatcherParser(config=config)
+    detectors = [
+        NewValueDetector(name="NewValueDetector", config=config),
+        NewEventDetector(name="NewEventDetector", config=config),
+    ]
+    alerts = []
+    for parsed in From.log(parser, AUDIT_LOG):
+        for detector in detectors:
+            if (alert := detector.process(parsed)) is not None:
+                alerts.append(alert)
+    return alerts
+
+
+class FailingDetectorConfig(CoreDetectorConfig):
+    method_type: str = "failing_detector"
+
+
+class FailingDetector(CoreDetector):
+    def __init__(self, name, config):
+        super().__init__(name=name, config=FailingDetectorConfig.from_dict(config, name))
+
+    def detect(self, input_, output_):
+        raise RuntimeError("broken detector")
+
+
+class TestPipelineRunner:
+    def test_single_process_matches_sequential(self, sequential_alerts) -> None:
+        runner = PipelineRunner(config, parser="MatcherParser", workers=1, shard_key=None)
+
+        assert list(runner.run_file(AUDIT_LOG)) == sequential_alerts
+
+    def test_sharded_matches_sequential(self, sequential_alerts) -> None:
+        runner = PipelineRunner(
+            config, parser="MatcherParser", workers=3, parser_workers=2, batch_size=100
+        )
+
+        assert list(runner.run_file(AUDIT_LOG)) == sequential_alerts
+
+    def test_stateful_parser_workers(self) -> None:
+        drain_config = {
+            **config,
+            "parsers": {
+                "DrainParser": {
+                    "method_type": "drain_parser", "auto_config": False, "log_format": LOG_FORMAT
+                }
+            },
+        }
+        PipelineRunner(drain_config, parser="DrainParser", workers=2)
+
+        with pytest.raises(ValueError, match="only stateless parsers"):
+            PipelineRunner(drain_config, parser="DrainParser", workers=2, parser_workers=2)
+
+    def test_alert_ids_are_unique(self) -> None:
+        runner = PipelineRunner(config, parser="MatcherParser", workers=2, batch_size=64)
+
+        alert_ids = [alert["alertID"] for alert in runner.run_file(AUDIT_LOG)]
+        assert len(alert_ids) == len(set(alert_ids)) > 0
+
+    def test_aggregator(self, sequential_alerts) -> None:
+        runner = PipelineRunner(
+            config, parser="MatcherParser", aggregator="BasicConcatAggregator", workers=2
+        )
+        aggregator = BasicConcatAggregation(name="BasicConcatAggregator", config=config)
+        expected = [
+            aggregated for alert in sequential_alerts
+            if (aggregated := aggregator.process(alert)) is not None
+        ]
+
+        assert list(runner.run_file(AUDIT_LOG)) == expected
+
+    def test_pipeline_section(self) -> None:
+        runner = PipelineRunner({
+            **config, "pipeline": {"parser": "MatcherParser", "detectors": ["NewEventDetector"], "workers": 2}
+        }, workers=3)
+
+        assert runner.settings.detectors == ["NewEventDetector"]
+        assert runner.settings.workers == 3
+        assert runner.settings.warmup == 400
+        with pytest.raises(ValidationError):
+            PipelineRunner(config, parser="MatcherParser", unknown=1)
+
+    def test_worker_error(self) -> None:
+        failing_config = {
+            **config, "detectors": {"Failing": {"method_type": "failing_detector", "auto_config": False}}
+        }
+        runner = PipelineRunner(
+            failing_config,
+            components={"failing_detector": FailingDetector},
+            parser="MatcherParser",
+            workers=2,
+        )
+
+        with pytest.raises(PipelineWorkerError, match="broken detector"):
+            list(runner.run_file(AUDIT_LOG))
+
+    def test_unknown_method_type(self) -> None:
+        bad_config = {**config, "detectors": {"Unknown": {"method_type": "unknown_detector"}}}
+        runner = PipelineRunner(bad_config, parser="MatcherParser", workers=1)
+
+        with pytest.raises(PipelineWorkerError, match="unknown_detector"):
+            list(runner.run_file(AUDIT_LOG))
+
+    def test_default_config(self) -> None:
+        path = Path(__file__).resolve().parents[2] / "config" / "pipeline_config_default.yaml"
+        runner = PipelineRunner(str(path), workers=2)
+
+        assert runner.settings.parser == "MatcherParser"
+        assert runner.settings.detectors == ["NewValueDetector", "NewEventDetector"]
+        assert runner.settings.workers == 2
+
+    def test_library_components(self) -> None:
+        assert library_component("new_value_detector") is NewValueDetector
+        assert library_component("basic_concat_aggregator") is BasicConcatAggregation
+        assert library_component("unknown_detector") is None
+
+    def test_shard_of_is_stable(self) -> None:
+        assert shard_of(7, 4) == 3
+        assert shard_of("ssh", 4) == shard_of("ssh", 4) < 4
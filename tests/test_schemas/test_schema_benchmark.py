@@ -0,0 +1,57 @@
+"""Micro-benchmark of the per-record cost of eager and lazy schemas.
+
+Run on demand with ``pytest tests/test_schemas/test_schema_benchmark.py
+--run-ignored -s``.
+"""
+from detectmatelibrary.schemas import LogSchema, ParserSchema, DetectorSchema
+
+from timeit import timeit
+
+import pytest
+
+
+N_RECORDS = 20_000
+
+
+def _log_record(lazy: bool) -> bytes:
+    schema = LogSchema(lazy=lazy)
+    schema["logID"] = "1"
+    schema["log"] = "type=SYSCALL msg=audit(1642723741.072:375): arch=c000003e"
+    schema["logSource"] = "audit"
+    schema["hostname"] = "host"
+    return schema.copy().serialize()
+
+
+def _parser_record(lazy: bool) -> bytes:
+    schema = ParserSchema(lazy=lazy)
+    schema["EventID"] = 3
+    schema["template"] = "arch=<*> syscall=<*>"
+    schema["variables"] = ["c000003e", "59"]
+    schema["logFormatVariables"].update({"Time": "1642723741", "Type": "SYSCALL"})
+    schema["logID"] = "1"
+    schema["log"] = "type=SYSCALL msg=audit(1642723741.072:375): arch=c000003e syscall=59"
+    return schema.copy().serialize()
+
+
+def _detector_record(lazy: bool) -> bytes:
+    schema = DetectorSchema(lazy=lazy)
+    schema["detectorID"] = "NewValueDetector"
+    schema["logIDs"] = ["1"]
+    schema["extractedTimestamps"] = [1642723741]
+    schema["score"] = 1.0
+    schema["alertsObtain"].update({"var_0": "Unknown value: 'c000003e'"})
+    return schema.copy().serialize()
+
+
+@pytest.mark.ignored
+@pytest.mark.parametrize("make_record", [_log_record, _parser_record, _detector_record])
+def test_per_record_cost(make_record) -> None:
+    eager = timeit(lambda: make_record(False), number=N_RECORDS) / N_RECORDS
+    lazy = timeit(lambda: make_record(True), number=N_RECORDS) / N_RECORDS
+
+    print(
+        f"\n{make_record.__name__}: eager {eager * 1e6:.2f} us/record, "
+        f"lazy {lazy * 1e6:.2f} us/record ({eager / lazy:.1f}x)"
+    )
+    assert make_record(False) != b""
+    assert lazy < eager
@@ -163,3 +163,94 @@ class TestBaseSchema:
             "receivedTimestamp": detector_schema.receivedTimestamp,
             "alertsObtain": detector_schema.alertsObtain,
         }
+
+
+class TestLazySchema:
+    def test_init_with_kwargs(self):
+        parser_schema = ParserSchema(
+            {"log": "test log", "variables": ["a", "b"], "logFormatVariables": {"Time": "0"}},
+            lazy=True,
+        )
+
+        assert parser_schema.is_lazy
+        assert parser_schema.log == "test log"
+        assert parser_schema["variables"] == ["a", "b"]
+        assert parser_schema["logFormatVariables"] == {"Time": "0"}
+        assert parser_schema.get_schema().__version__ == "1.0.0"
+
+    def test_change_values_write_through(self):
+        parser_schema = ParserSchema(lazy=True)
+
+        parser_schema["template"] = "test <*>"
+        parser_schema.EventID = 2
+        parser_schema["variables"] = ["x", "y"]
+        parser_schema["variables"].append("z")
+        parser_schema["logFormatVariables"].update({"Time": "1"})
+
+        message = parser_schema.get_schema()
+        assert message.template == "test <*>"
+        assert message.EventID == 2
+        assert message.variables == ["x", "y", "z"]
+        assert message.logFormatVariables == {"Time": "1"}
+
+    def test_reassign_same_container(self):
+        parser_schema = ParserSchema({"variables": ["a"]}, lazy=True)
+        parser_schema["variables"] = parser_schema["variables"]
+
+        assert parser_schema["variables"] == ["a"]
+
+    def test_assign_none_clears(self):
+        log_schema = LogSchema({"log": "Test log"}, lazy=True)
+        log_schema["log"] = None
+
+        assert log_schema["log"] == ""
+        assert not log_schema.get_schema().HasField("log")
+
+    def test_field_not_found(self):
+        log_schema = LogSchema(lazy=True)
+
+        with pytest.raises(FieldNotFound):
+            log_schema["unknown"] = "Test log"
+        with pytest.raises(FieldNotFound):
+            log_schema["unknown"]
+        with pytest.raises(AttributeError):
+            log_schema.unknown
+
+    def test_copy_is_independent(self):
+        parser_schema = ParserSchema({"variables": ["a"]}, lazy=True)
+        parser_copy = parser_schema.copy()
+        parser_copy["variables"].append("b")
+
+        assert isinstance(parser_copy, ParserSchema)
+        assert parser_copy.is_lazy
+        assert parser_schema["variables"] == ["a"]
+        assert parser_copy["variables"] == ["a", "b"]
+
+    def test_serialize_deserialize(self):
+        detector_schema = DetectorSchema({"logIDs": ["1", "2"], "alertsObtain": {"a": "b"}}, lazy=True)
+        serialized = detector_schema.serialize()
+
+        new_detector_schema = DetectorSchema(lazy=True)
+        new_detector_schema.deserialize(serialized)
+        assert new_detector_schema == detector_schema
+
+        eager_detector_schema = DetectorSchema()
+        eager_detector_schema.deserialize(serialized)
+        assert eager_detector_schema == detector_schema
+
+    def test_eq_with_eager(self):
+        log_schema1 = LogSchema({"log": "Test log"})
+        log_schema2 = LogSchema({"log": "Test log"}, lazy=True)
+        log_schema3 = LogSchema({"log": "Different log"}, lazy=True)
+
+        assert log_schema1 == log_schema2
+        assert log_schema2 == log_schema1
+        assert log_schema1 != log_schema3
+
+    def test_as_dict_materializes(self):
+        parser_schema = ParserSchema({"variables": ["a"], "logFormatVariables": {"Time": "0"}}, lazy=True)
+        as_dict = parser_schema.as_dict()
+
+        assert as_dict == ParserSchema({"variables": ["a"], "logFormatVariables": {"Time": "0"}}).as_dict()
+        assert isinstance(as_dict["variables"], list)
+        assert isinstance(as_dict["logFormatVariables"], dict)
@@ -0,0 +1,50 @@
+from detectmatelibrary.schemas import ParserSchema, DetectorSchema, to_table, from_table
+
+import polars as pl
+import pyarrow as pa
+import pytest
+
+
+def parsed(i: int) -> ParserSchema:
+    return ParserSchema({
+        "EventID": i,
+        "template": f"template {i}",
+        "variables": ["a", str(i)],
+        "logFormatVariables": {"Time": str(i), "Type": "USER"},
+        "receivedTimestamp": 10 + i,
+    })
+
+
+class TestSchemaTable:
+    def test_columns(self) -> None:
+        table = to_table([parsed(i) for i in range(3)])
+
+        assert table.num_rows == 3
+        assert table.schema.field("EventID").type == pa.int32()
+        assert table.schema.field("variables").type == pa.list_(pa.string())
+        assert isinstance(table.schema.field("logFormatVariables").type, pa.MapType)
+        assert table.column("variables").to_pylist()[2] == ["a", "2"]
+
+    def test_roundtrip(self) -> None:
+        schemas = [parsed(i) for i in range(3)] + [ParserSchema({"EventID": 7}, lazy=True)]
+
+        assert from_table(to_table(schemas), ParserSchema) == schemas
+
+    def test_detector_schema(self) -> None:
+        alerts = [DetectorSchema({"score": 0.5, "alertsObtain": {"a": "b"}, "extractedTimestamps": [1, 2]})]
+
+        assert from_table(to_table(alerts), DetectorSchema) == alerts
+
+    def test_selected_columns(self) -> None:
+        table = to_table([parsed(1)], columns=["EventID", "logFormatVariables"])
+
+        assert table.column_names == ["EventID", "logFormatVariables"]
+
+    def test_polars(self) -> None:
+        frame = pl.from_arrow(to_table([parsed(i) for i in range(3)]))
+
+        assert frame["EventID"].to_list() == [0, 1, 2]
+
+    def test_empty(self) -> None:
+        with pytest.raises(ValueError):
+            to_table([])
@@ -1,6 +1,8 @@
 from datetime import datetime, timezone
 
-from detectmatelibrary.utils.time_format_handler import TimeFormatHandler
+import numpy as np
+
+from detectmatelibrary.utils.time_format_handler import TimeFormatHandler, compile_time_format
 
 tfh = TimeFormatHandler()
 
@@ -36,6 +38,12 @@ def test_epoch_seconds_and_millis():
     assert tfh.parse_timestamp(s_millis) == "1600000000"
 
 
+def test_audit_epoch():
+    handler = TimeFormatHandler()
+    assert handler.parse_timestamp("1642726457.339:397") == "1642726457"
+    assert handler.parse_seconds("1642726457.339") == 1642726457
+
+
 def test_syslog_without_year_assumes_current_year():
     # Expect that a string like 'Nov 11 12:13:14' is parsed with current year
     s = "Nov 11 12:13:14"
@@ -43,3 +51,60 @@ def test_syslog_without_year_assumes_current_year():
     dt = datetime.strptime(f"{year} {s}", "%Y %b %d %H:%M:%S")
     dt = dt.replace(tzinfo=timezone.utc)
     assert tfh.parse_timestamp(s) == str(int(dt.timestamp()))
+
+
+def test_compiled_format_matches_strptime():
+    cases = [
+        ("%Y-%m-%d %H:%M:%S.%f", "1969-12-31 23:59:59.500"),
+        ("%d/%b/%Y:%H:%M:%S %z", "10/oct/2000:13:55:36 +0530"),
+        ("%Y/%m/%d %H:%M:%S", "2024/2/29 1:2:3"),
+        ("%Y-%m-%dT%H:%M:%SZ", "2023-01-02T03:04:05Z"),
+    ]
+    for fmt, s in cases:
+        compiled = compile_time_format(fmt)
+        assert compiled is not None
+        assert compiled(s) == int(tfh._to_unix(datetime.strptime(s, fmt)))
+    date = compile_time_format("%Y-%m-%d")
+    assert date is not None and date("2023-02-30") is None
+    apache = compile_time_format("%d/%b/%Y:%H:%M:%S %z")
+    assert apache is not None and apache("10/Oct/2000:13:55:36 +2400") is None
+    # directives without a compiled parser fall back to strptime
+    assert compile_time_format("%A, %B %d, %Y %H:%M:%S") is None
+    s = "Wednesday, March 4, 2026 14:18:00"
+    dt = datetime.strptime(s, "%A, %B %d, %Y %H:%M:%S").replace(tzinfo=timezone.utc)
+    assert TimeFormatHandler().parse_timestamp(s) == str(int(dt.timestamp()))
+
+
+def test_unparseable_shape_is_cached():
+    handler = TimeFormatHandler()
+    assert handler.parse_timestamp("1642726457/339/397") == "0"
+    assert "1111111111/111/111" in handler._unparseable
+    assert handler.parse_timestamp("1642726999/001/398") == "0"
+    # a valid string of the shape of an out of range one is still parsed
+    assert handler.parse_timestamp("2023-13-01 00:00:00") == "0"
+    assert handler.parse_timestamp("2023-12-01 00:00:00") != "0"
+    handler.clear_cache()
+    assert not handler._unparseable
+
+
+def test_shape_probe_keeps_format_cache():
+    handler = TimeFormatHandler()
+    handler.parse_timestamp("10/Oct/2000:13:55:36 -0700")
+    # out of range, but a string of its shape with valid values parses
+    assert handler.parse_timestamp("45/Oct/2000:13:55:36") == "0"
+    assert handler._format_cache == {"last_format": "%d/%b/%Y:%H:%M:%S %z"}
+
+
+def test_format_cache_per_source():
+    handler = TimeFormatHandler()
+    handler.parse_timestamp("10/Oct/2000:13:55:36 -0700", source="apache")
+    handler.parse_timestamp("Nov 11 12:13:14", source="syslog")
+    assert handler._format_cache == {"apache": "%d/%b/%Y:%H:%M:%S %z", "syslog": "%b %d %H:%M:%S"}
+
+
+def test_parse_timestamps_array():
+    handler = TimeFormatHandler()
+    column = ["10/Oct/2000:13:55:36 -0700", "1600000000", "nonsense", "10/Oct/2000:13:55:36 -0700"]
+    seconds = handler.parse_timestamps(column)
+    assert seconds.dtype == np.int64
+    assert seconds.tolist() == [int(tfh.parse_timestamp(s)) for s in column]